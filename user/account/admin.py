@@ -1,6 +1,7 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from .models import UserInfo, UserEmail, EmailLog, UserGroup
+from .models import UserInfo, UserEmail, EmailLog, EmailOutbox, SMTPCircuitState, UserGroup
+from .utils.circuit_breaker import SMTPCircuitBreaker
 
 # 1. UserEmail 모델을 UserInfo 관리자 페이지에 인라인으로 표시하기 위한 클래스
 class UserEmailInline(admin.StackedInline):
@@ -181,7 +182,39 @@ class EmailLogAdmin(admin.ModelAdmin):
         'created_at'
     )
 
+    # 행이 많아도 목록이 느려지지 않도록 필터 결과의 전체 건수(COUNT) 조회를 생략합니다.
+    # (기본 정렬 -created_at 과 log_type 필터는 EmailLog.Meta.indexes 를 사용)
+    show_full_result_count = False
+    list_per_page = 50
+
     # 긴 오류 메시지를 Admin 목록에서 짧게 보여주기 위한 함수
     def error_message_summary(self, obj):
         return obj.error_message[:100] + '...' if obj.error_message and len(obj.error_message) > 100 else obj.error_message
-    error_message_summary.short_description = '오류 요약'
\ No newline at end of file
+    error_message_summary.short_description = '오류 요약'
+
+
+@admin.register(SMTPCircuitState)
+class SMTPCircuitStateAdmin(admin.ModelAdmin):
+    list_display = ('host', 'state', 'failure_count', 'trip_count', 'opened_at', 'open_until', 'updated_at')
+    list_filter = ('state',)
+    search_fields = ('host', 'last_error')
+    # 상태는 브레이커(utils/circuit_breaker.py)만 기록하므로 모든 필드를 읽기 전용으로 둡니다.
+    readonly_fields = (
+        'host', 'state', 'failure_count', 'trip_count', 'opened_at', 'open_until', 'last_error', 'updated_at'
+    )
+    actions = ['close_circuit']
+
+    @admin.action(description='선택한 호스트의 브레이커 닫기 (즉시 전송 재개)')
+    def close_circuit(self, request, queryset):
+        for circuit in queryset:
+            SMTPCircuitBreaker(circuit.host).reset()
+        self.message_user(request, f'{queryset.count()}개 호스트의 브레이커를 닫았습니다.')
+
+
+@admin.register(EmailOutbox)
+class EmailOutboxAdmin(admin.ModelAdmin):
+    list_display = ('email', 'kind', 'created_at', 'relayed_at')
+    list_filter = ('kind', 'relayed_at')
+    search_fields = ('email',)
+    # 인증 코드는 목록에 표시하지 않고, 모든 필드를 읽기 전용으로 둡니다.
+    readonly_fields = ('email', 'code', 'kind', 'created_at', 'relayed_at')
@@ -5,6 +5,29 @@ from django.utils.functional import cached_property
 import ssl
 import smtplib
 
+from .utils.email_delivery import guard_sync_smtp
+from .utils.smtp_pool import get_smtp_pool
+
+
+def build_ssl_context(certfile=None, keyfile=None):
+    """
+    SMTP 연결에 사용하는 SSL Context (CustomEmailBackend / utils/async_smtp.py 공용)
+    """
+    # 기본 context 생성
+    context = ssl.create_default_context(
+        purpose=ssl.Purpose.SERVER_AUTH,
+        cafile=certfile
+    )
+
+    # 🔑 TLS 1.2 이상을 강제하여 Handshake Failure 오류 해결
+    context.minimum_version = ssl.TLSVersion.TLSv1_2
+
+    if certfile and keyfile:
+        context.load_cert_chain(certfile, keyfile)
+
+    return context
+
+
 class CustomEmailBackend(EmailBackend):
 
     # local_hostname 오류 방지용 __init__ 유지
@@ -19,19 +42,12 @@ class CustomEmailBackend(EmailBackend):
     # 💡 Handshake Failure 해결: SSL Context를 Django의 캐시 속성으로 재정의
     @cached_property
     def ssl_context(self):
-        # 기본 context 생성
-        context = ssl.create_default_context(
-            purpose=ssl.Purpose.SERVER_AUTH,
-            cafile=self.ssl_certfile
-        )
-
-        # 🔑 TLS 1.2 이상을 강제하여 Handshake Failure 오류 해결
-        context.minimum_version = ssl.TLSVersion.TLSv1_2
+        return build_ssl_context(self.ssl_certfile, self.ssl_keyfile)
 
-        if self.ssl_certfile and self.ssl_keyfile:
-            context.load_cert_chain(self.ssl_certfile, self.ssl_keyfile)
-
-        return context
+    def send_messages(self, email_messages):
+        # 웹 요청 안에서 호출되면 DEBUG 에서는 예외, 운영에서는 경고 (utils/email_delivery.py)
+        guard_sync_smtp(type(self).__name__)
+        return super().send_messages(email_messages)
 
     # open 메서드는 이제 재정의된 ssl_context 속성을 활용합니다.
     def open(self):
@@ -83,4 +99,110 @@ class CustomEmailBackend(EmailBackend):
         except Exception as e:
             print(f"{e}")
             if not self.fail_silently:
-                raise
\ No newline at end of file
+                raise
+
+class PooledEmailBackend(CustomEmailBackend):
+    """
+    CustomEmailBackend 와 같은 방식(TLS 1.2+)으로 연결하지만, 전송 후 QUIT 하지 않고
+    워커 프로세스의 연결 풀(utils/smtp_pool.py)에 반납해 다음 전송에서 재사용합니다.
+
+    - 꺼낼 때: 유휴 시간이 길면 버리고(recycle), 잠시 쉬었던 연결은 NOOP 으로 상태 확인
+    - DATA 전에(MAIL / RCPT) 연결이 끊어져 있으면: 연결을 버리고 새로 연결해 한 번 더 전송
+    - DATA 이후의 끊김 / 타임아웃: 서버가 이미 받았을 수 있으므로 다시 보내지 않고 오류로 처리 (재시도 백오프)
+    - 반납할 때: 최대 사용 시간이 지났거나 풀이 가득 차면 QUIT
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._entry = None
+
+    @property
+    def pool_key(self):
+        return (self.host, self.port, self.username, bool(self.use_tls), bool(self.use_ssl))
+
+    def open(self):
+        if self.connection:
+            return False
+
+        entry = get_smtp_pool().acquire(self.pool_key)
+        if entry is not None:
+            self._entry = entry
+            self.connection = entry.smtp
+            # send_messages() 가 끝나면 close() 로 풀에 반납되도록 True 를 반환합니다.
+            return True
+
+        return self.open_new()
+
+    def open_new(self):
+        """풀을 거치지 않고 새로 연결합니다."""
+        opened = super().open()
+        if self.connection is not None:
+            self._entry = get_smtp_pool().register(self.connection)
+        return opened
+
+    def close(self):
+        if self.connection is None:
+            return
+
+        entry, self._entry = self._entry, None
+        self.connection = None
+        if entry is not None:
+            get_smtp_pool().release(self.pool_key, entry)
+
+    def discard(self):
+        entry, self._entry = self._entry, None
+        self.connection = None
+        if entry is not None:
+            get_smtp_pool().discard(entry)
+
+    @staticmethod
+    def _track_data(connection):
+        """connection.data() 가 호출되었는지 기록할 목록을 반환합니다. (sendmail 은 MAIL / RCPT 다음에 호출)"""
+        started = []
+        data = connection.data
+
+        def tracked(msg):
+            started.append(True)
+            return data(msg)
+
+        connection.data = tracked
+        return started
+
+    def _send(self, email_message):
+        fail_silently, self.fail_silently = self.fail_silently, False
+        connection = self.connection
+        data_started = self._track_data(connection)
+        try:
+            return super()._send(email_message)
+        except smtplib.SMTPServerDisconnected as e:
+            # 풀에 있던 연결이 이미 끊어져 있었으면 MAIL / RCPT 에서 끊김이 드러납니다.
+            error = e if data_started else None
+        except OSError as e:
+            # 타임아웃 / 연결 오류는 본문을 보낸 뒤일 수 있으므로 다시 보내지 않습니다. (중복 인증 메일 방지)
+            error = e
+        except smtplib.SMTPException:
+            if fail_silently:
+                return False
+            raise
+        finally:
+            self.fail_silently = fail_silently
+            vars(connection).pop('data', None)
+
+        # 연결 상태를 알 수 없으므로 풀에 돌려놓지 않습니다.
+        self.discard()
+        if error is not None:
+            if fail_silently:
+                return False
+            raise error
+
+        print("SMTP 연결이 끊어져 재연결 후 다시 전송합니다.")
+        self.open_new()
+        if self.connection is None:
+            if fail_silently:
+                return False
+            raise smtplib.SMTPServerDisconnected('SMTP 재연결에 실패했습니다.')
+        try:
+            return super()._send(email_message)
+        except (smtplib.SMTPServerDisconnected, OSError):
+            self.discard()
+            raise
@@ -0,0 +1,46 @@
+# account/hashers.py
+
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+# PBKDF2-SHA256 반복 횟수 프로필
+# - high   : Django 5.2 기본값과 동일
+# - medium : OWASP 권장 최소값 (PBKDF2-HMAC-SHA256, 2023)
+# - low    : 저사양 서버 / 부하 테스트용
+PASSWORD_HASH_PROFILES = {
+    'low': 320_000,
+    'medium': 600_000,
+    'high': 1_000_000,
+}
+DEFAULT_PASSWORD_HASH_PROFILE = 'high'
+
+
+def get_password_hash_iterations():
+    """
+    settings.PASSWORD_HASH_ITERATIONS 가 있으면 그 값을, 없으면
+    settings.PASSWORD_HASH_PROFILE 에 해당하는 반복 횟수를 반환합니다.
+    """
+    iterations = getattr(settings, 'PASSWORD_HASH_ITERATIONS', None)
+    if iterations:
+        return int(iterations)
+
+    profile = getattr(settings, 'PASSWORD_HASH_PROFILE', DEFAULT_PASSWORD_HASH_PROFILE)
+    try:
+        return PASSWORD_HASH_PROFILES[profile]
+    except KeyError:
+        raise ValueError(f"지원하지 않는 PASSWORD_HASH_PROFILE 입니다: {profile}")
+
+
+class ProfiledPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    반복 횟수를 설정(프로필)에서 가져오는 PBKDF2-SHA256 해셔.
+
+    algorithm 이름은 Django 기본 해셔와 같은 'pbkdf2_sha256' 이므로 기존 해시를 그대로 검증합니다.
+    저장된 해시의 반복 횟수가 현재 설정과 다르면 must_update() 가 True 가 되어,
+    로그인 성공 시 check_password() 의 setter 를 통해 새 해시로 한 번만 저장됩니다.
+    (반복 횟수가 같으면 추가 저장은 발생하지 않습니다.)
+    """
+
+    @property
+    def iterations(self):
+        return get_password_hash_iterations()
@@ -0,0 +1,227 @@
+# account/management/commands/bench_account_flow.py
+
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from django.core.management.base import BaseCommand
+from django.db import connection, connections
+from django.test import Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from account.models import UserInfo
+from account.utils.bench import bench_database, local_json_server, summarize, write_json
+from account.utils.verification_store import PURPOSE_AUTH, EmailVerification
+from approval.models import RequestType
+from log_events.metrics import measure_request
+from oas.device.utils.crypto import encrypt_qr_data_cryptography
+from oas.device.utils.remote_manager import Bootup
+from user.celery import app as celery_app
+
+# 실행 순서대로의 단계 (URL name)
+STEPS = (
+    'user-register',
+    'token_obtain_pair',
+    'email-auth-send',
+    'email-auth-confirm',
+    'device-auth',
+    'create-approval-request',
+)
+
+
+class VirtualUser:
+    """벤치마크 중 한 명의 사용자가 단계를 거치며 쌓는 상태"""
+
+    def __init__(self, email, password, device_id):
+        self.email = email
+        self.password = password
+        self.device_id = device_id
+        self.access = None
+        self.auth_code = None
+
+    @property
+    def auth_header(self):
+        return {'HTTP_AUTHORIZATION': f'Bearer {self.access}'} if self.access else {}
+
+
+class Command(BaseCommand):
+    """
+    실제 URL 라우트를 순서대로 호출하는 계정 흐름 전체 부하 벤치마크입니다.
+
+        user-register -> token_obtain_pair -> email-auth-send -> email-auth-confirm
+        -> device-auth -> create-approval-request
+
+    - 테스트 DB(SQLite 또는 로컬 MySQL, settings.DATABASES 기준)를 새로 만들어 사용합니다.
+      SQLite 는 쓰기 잠금이 테이블 단위라 동시성 2 이상에서 'database table is locked' 가 500 으로 집계됩니다.
+      동시성 비교는 로컬 MySQL 에서 실행하세요.
+    - 이메일은 locmem 백엔드, Celery 는 eager 모드로 실행합니다.
+    - 캐시(인증 상태 저장소 / 계정 잠금 / 사용자 캐시)는 locmem 으로 바꿔 Redis 없이 실행합니다.
+      settings.CACHES(Redis)로 측정하려면 --shared-cache 를 줍니다.
+    - 외부 Bootup API 는 로컬 HTTP 서버로 대체합니다.
+
+    단계별 / 동시성별 requests/sec, p50/p95/p99 지연 시간, 요청당 쿼리 수를 출력하고 JSON 으로 저장합니다.
+
+    사용 예: python manage.py bench_account_flow --concurrency 1 4 16 --users 32 --hash-profile low --output flow.json
+    """
+    help = '계정 흐름 전체 부하 벤치마크 (회원가입 ~ 승인 요청)'
+
+    PASSWORD = 'bench-password!1'
+    MASTER_EMAIL = 'bench-master@oasiss.co.kr'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16])
+        parser.add_argument('--users', type=int, default=32, help='동시성 단계별 가상 사용자 수')
+        parser.add_argument(
+            '--hash-profile', choices=['low', 'medium', 'high'],
+            help='비밀번호 해시 비용 프로필 (기본: settings.PASSWORD_HASH_PROFILE)'
+        )
+        parser.add_argument(
+            '--shared-cache', action='store_true',
+            help='locmem 대신 settings.CACHES(Redis 등)를 그대로 사용'
+        )
+        parser.add_argument('--output', help='결과를 저장할 JSON 파일 경로')
+
+    def handle(self, *args, **options):
+        overrides = {}
+        if options['hash_profile']:
+            overrides = {'PASSWORD_HASH_PROFILE': options['hash_profile'], 'PASSWORD_HASH_ITERATIONS': None}
+        if not options['shared_cache']:
+            overrides['CACHES'] = {
+                'default': {
+                    'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                    'LOCATION': 'bench-account-flow',
+                },
+            }
+
+        results = []
+        # eager 모드에서도 apply_async() 가 producer / result backend 를 준비하므로 메모리 구현으로 바꿔 둡니다.
+        # (settings 의 CELERY_ namespace 키가 우선하므로 같은 이름으로 덮어씁니다.)
+        celery_conf = {
+            'CELERY_TASK_ALWAYS_EAGER': True,
+            'CELERY_BROKER_URL': 'memory://',
+            'CELERY_RESULT_BACKEND': 'cache+memory://',
+        }
+        previous_conf = {key: celery_app.conf.get(key) for key in celery_conf}
+        celery_app.conf.update(celery_conf)
+
+        try:
+            with override_settings(**overrides), bench_database(), \
+                    local_json_server({'status': True, 'site_name': 'bench'}) as bootup_url, \
+                    mock.patch.object(Bootup, 'BASE_URL', bootup_url), \
+                    mock.patch.object(Bootup, 'REMOTE_BACKEND_KEY', Bootup.REMOTE_BACKEND_KEY or 'bench'):
+
+                UserInfo.objects.create_user(
+                    email=self.MASTER_EMAIL, nick_name='master', password=self.PASSWORD, family_level='master'
+                )
+
+                for level, concurrency in enumerate(options['concurrency']):
+                    users = [
+                        VirtualUser(f'bench{level}-{i}@oasiss.co.kr', self.PASSWORD, f'bench-dev-{level}-{i}')
+                        for i in range(options['users'])
+                    ]
+                    for step in STEPS:
+                        results.append(self.run_step(step, users, concurrency))
+
+                database = connection.vendor
+        finally:
+            celery_app.conf.update(previous_conf)
+
+        self.stdout.write(
+            f"{'step':<24} {'conc':>5} {'rps':>8} {'p50(ms)':>9} {'p95(ms)':>9} {'p99(ms)':>9} {'q/req':>6}  status"
+        )
+        for r in results:
+            self.stdout.write(
+                f"{r['step']:<24} {r['concurrency']:>5} {r['rps']:>8} {r['p50_ms']:>9} {r['p95_ms']:>9} "
+                f"{r['p99_ms']:>9} {r['queries_per_request']:>6}  {r['status']}"
+            )
+
+        if options['output']:
+            write_json(options['output'], {
+                'benchmark': 'account_flow',
+                'database': database,
+                'hash_profile': options['hash_profile'],
+                'users': options['users'],
+                'results': results,
+            })
+
+    # ------------------------------------------------------------------
+    # 단계 실행
+    # ------------------------------------------------------------------
+    def run_step(self, step, users, concurrency):
+        self.prepare(step, users)
+
+        url = reverse(step)
+        send = getattr(self, 'send_' + step.replace('-', '_'))
+        local = threading.local()
+
+        def call(user):
+            client = getattr(local, 'client', None)
+            if client is None:
+                client = local.client = Client(raise_request_exception=False)
+            started = time.perf_counter()
+            with measure_request(step, record=False) as measurement:
+                response = send(client, url, user)
+            latency = time.perf_counter() - started
+            self.after(step, user, response)
+            return latency, response.status_code, measurement.queries
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            outcomes = list(executor.map(call, users))
+        elapsed = time.perf_counter() - started
+        connections.close_all()
+
+        latencies = [latency for latency, _, _ in outcomes]
+        queries = [count for _, _, count in outcomes]
+        return summarize(
+            latencies, elapsed,
+            step=step,
+            concurrency=concurrency,
+            queries_per_request=round(sum(queries) / len(queries), 2) if queries else 0,
+            status=dict(Counter(code for _, code, _ in outcomes)),
+        )
+
+    def prepare(self, step, users):
+        """측정 시간에 포함되지 않는 사전 작업 (메일로 받은 인증 코드 조회 등)"""
+        if step == 'email-auth-confirm':
+            user_ids = dict(
+                UserInfo.objects.filter(email__in=[u.email for u in users]).values_list('email', 'pk')
+            )
+            for user in users:
+                user.auth_code = EmailVerification(user_ids.get(user.email), PURPOSE_AUTH).peek_code()
+
+    @staticmethod
+    def after(step, user, response):
+        if step == 'token_obtain_pair' and response.status_code == 200:
+            user.access = response.json()['access']
+
+    def send_user_register(self, client, url, user):
+        return client.post(url, {
+            'email': user.email, 'nick_name': 'bench',
+            'password1': user.password, 'password2': user.password,
+        }, content_type='application/json')
+
+    def send_token_obtain_pair(self, client, url, user):
+        return client.post(url, {'email': user.email, 'password': user.password}, content_type='application/json')
+
+    def send_email_auth_send(self, client, url, user):
+        return client.post(url, {}, content_type='application/json', **user.auth_header)
+
+    def send_email_auth_confirm(self, client, url, user):
+        return client.post(url, {'auth_code': user.auth_code}, content_type='application/json', **user.auth_header)
+
+    def send_device_auth(self, client, url, user):
+        qr_data = encrypt_qr_data_cryptography({
+            'site': '0001', 'dong': '0101', 'ho': '0101', 'id': '01',
+            'deviceId': user.device_id,
+            'time': timezone.now().strftime('%Y.%m.%d.%H.%M'),
+        })
+        return client.post(url, {'data': qr_data}, content_type='application/json', **user.auth_header)
+
+    def send_create_approval_request(self, client, url, user):
+        return client.post(url, {
+            'master_email': self.MASTER_EMAIL, 'request_type': RequestType.GROUP_JOIN,
+        }, content_type='application/json', **user.auth_header)
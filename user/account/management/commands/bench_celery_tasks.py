@@ -0,0 +1,186 @@
+# account/management/commands/bench_celery_tasks.py
+
+import io
+import json
+import uuid
+from collections import Counter
+from contextlib import redirect_stdout
+
+from celery import Celery, current_app
+from celery.app.trace import build_tracer
+from celery.backends.cache import CacheBackend
+from celery.signals import before_task_publish
+from django.core import mail
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+
+from account.tasks import send_auth_email_task
+from account.utils.bench import write_json
+
+# Redis 전송(kombu redis transport)에서 메시지 1개를 워커가 받아 처리할 때의 왕복 수
+#   BRPOP 1 + unacked 기록(ZADD/HSET 파이프라인) 1 + ack(HDEL/ZREM 파이프라인) 1
+# (acks_late 는 ack 시점만 바꾸므로 왕복 수는 같습니다.)
+ROUND_TRIPS_PER_DELIVERY = 3
+
+SCENARIO_BEFORE = 'before'  # 기본 큐(celery) 하나, 결과 저장
+SCENARIO_AFTER = 'after'    # settings.CELERY_TASK_ROUTES / 작업별 ignore_result
+
+
+def counting_backend(base):
+    """결과 백엔드의 get / set 호출 수와 저장한 바이트 수를 세는 하위 클래스"""
+
+    class CountingBackend(base):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.calls = Counter()
+            self.stored_bytes = 0
+            self.keys = set()
+
+        def get(self, key):
+            self.calls['get'] += 1
+            return super().get(key)
+
+        def set(self, key, value, **kwargs):
+            self.calls['set'] += 1
+            self.keys.add(key)
+            self.stored_bytes += len(key) + len(value)
+            return super().set(key, value, **kwargs)
+
+    return CountingBackend
+
+
+class Command(BaseCommand):
+    """
+    인증 메일 작업(send_auth_email_task) --emails 건을 큐 구성 / 결과 처리 방식별로 실행하며 비교합니다.
+
+        before : 모든 작업이 기본 큐(celery)로 가고, 결과를 결과 백엔드에 저장 (변경 전)
+        after  : CELERY_TASK_ROUTES 로 email 큐, ignore_result=True (현재 설정)
+
+    발행(publish)은 memory:// 브로커로 실제로 보내 메시지 수 / 크기를 세고, 워커와 같은 tracer(build_tracer)로
+    실행해 결과 백엔드 get / set 호출 수와 저장한 키 / 바이트를 셉니다.
+
+        broker round trips : 발행 수 + 처리한 메시지 수 * ROUND_TRIPS_PER_DELIVERY (Redis 전송 기준)
+        backend round trips: 결과 백엔드 get + set 호출 수 (Redis 결과 백엔드는 결과 1건마다 GET 1 + SETEX/PUBLISH 1)
+        result keys / bytes: 결과 만료(CELERY_RESULT_EXPIRES) 전까지 Redis 에 남는 키 수와 키 + 값 바이트
+                             (Redis 자체의 키당 오버헤드는 포함하지 않은 하한)
+
+    --redis-url 을 주면(redis 패키지 필요) 결과를 실제 Redis 에 저장하고 INFO used_memory 증가량도 보고합니다.
+
+    사용 예: python manage.py bench_celery_tasks --emails 10000
+    """
+    help = 'Celery 큐 구성 / ignore_result 전후 브로커 왕복 수와 결과 저장량 비교'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--emails', type=int, default=10000, help='실행할 인증 메일 작업 수')
+        parser.add_argument('--redis-url', help='결과를 저장할 Redis 주소 (예: redis://127.0.0.1:6379/15)')
+        parser.add_argument('--output', help='결과를 저장할 JSON 파일 경로')
+
+    def handle(self, *args, **options):
+        app = current_app
+        results = []
+        with override_settings(
+            EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend', EMAIL_RATE_LIMIT={'ENABLED': False},
+        ):
+            for scenario in (SCENARIO_BEFORE, SCENARIO_AFTER):
+                backend = self.backend(app, options['redis_url'])
+                results.append(self.run(app, scenario, backend, options['emails']))
+                mail.outbox = []
+
+        self.stdout.write(
+            f"{'scenario':<8} {'emails':>7} {'queues':<16} {'published':>9} {'broker rt':>10} "
+            f"{'backend rt':>11} {'result keys':>12} {'result bytes':>13} {'redis mem':>10}"
+        )
+        for r in results:
+            queues = ','.join(f'{q}:{n}' for q, n in r['queues'].items())
+            redis_memory = '-' if r['redis_memory_bytes'] is None else r['redis_memory_bytes']
+            self.stdout.write(
+                f"{r['scenario']:<8} {r['emails']:>7} {queues:<16} {r['published']:>9} {r['broker_round_trips']:>10} "
+                f"{r['backend_round_trips']:>11} {r['result_keys']:>12} {r['result_bytes']:>13} {redis_memory:>10}"
+            )
+
+        if options['output']:
+            write_json(options['output'], {'benchmark': 'celery_tasks', 'results': results})
+
+    def backend(self, app, redis_url):
+        if not redis_url:
+            return counting_backend(CacheBackend)(app=app, backend='memory')
+        try:
+            from celery.backends.redis import RedisBackend
+            import redis  # noqa: F401
+        except ImportError:
+            raise CommandError('--redis-url 을 사용하려면 redis 패키지가 필요합니다.')
+        return counting_backend(RedisBackend)(app=app, url=redis_url)
+
+    @staticmethod
+    def redis_memory(backend):
+        if not hasattr(backend.client, 'info'):
+            return None
+        return backend.client.info('memory')['used_memory']
+
+    @staticmethod
+    def publisher(app, scenario):
+        """발행 전용 Celery 앱 (memory:// 브로커). before 는 기본 설정, after 는 현재 큐 / 라우팅 설정을 사용합니다."""
+        publisher = Celery(f'bench-{scenario}', broker='memory://', set_as_current=False)
+        publisher.conf.update(task_serializer=app.conf.task_serializer, accept_content=app.conf.accept_content)
+        if scenario == SCENARIO_AFTER:
+            publisher.conf.update(
+                task_default_queue=app.conf.task_default_queue, task_queues=app.conf.task_queues,
+                task_routes=app.conf.task_routes,
+            )
+        return publisher
+
+    def run(self, app, scenario, backend, count):
+        task = send_auth_email_task
+        ignore_result = task.ignore_result
+        if scenario == SCENARIO_BEFORE:
+            # 변경 전: 결과 저장
+            task.ignore_result = False
+        publisher = self.publisher(app, scenario)
+
+        published = []
+
+        def on_publish(sender=None, body=None, routing_key=None, headers=None, **kwargs):
+            published.append((routing_key, len(json.dumps(body)) + len(json.dumps(headers))))
+
+        memory_before = self.redis_memory(backend)
+        before_task_publish.connect(on_publish, weak=False)
+        task.backend = backend
+        try:
+            tracer = build_tracer(task.name, task, app=app, eager=False)
+            with publisher.connection_for_write() as connection, redirect_stdout(io.StringIO()):
+                for i in range(count):
+                    task_id = str(uuid.uuid4())
+                    args = (f'bench{i}@oasiss.co.kr', f'{i % 1000000:06d}')
+                    publisher.send_task(task.name, args, task_id=task_id, ignore_result=task.ignore_result)
+                    # 워커가 받은 것처럼 같은 작업을 tracer 로 실행합니다. (결과 저장 포함)
+                    tracer(task_id, args, {}, {'id': task_id, 'delivery_info': {'is_eager': False}})
+                    self.drain(connection, published[-1][0])
+        finally:
+            task.backend = None
+            task.ignore_result = ignore_result
+            before_task_publish.disconnect(on_publish)
+
+        memory_after = self.redis_memory(backend)
+        for key in backend.keys:
+            backend.delete(key)
+
+        return {
+            'scenario': scenario,
+            'emails': count,
+            'queues': dict(Counter(routing_key for routing_key, _ in published)),
+            'published': len(published),
+            'message_bytes': sum(size for _, size in published),
+            'broker_round_trips': len(published) + count * ROUND_TRIPS_PER_DELIVERY,
+            'backend_round_trips': sum(backend.calls.values()),
+            'backend_calls': dict(backend.calls),
+            'result_keys': len(backend.keys),
+            'result_bytes': backend.stored_bytes,
+            'redis_memory_bytes': None if memory_before is None else memory_after - memory_before,
+        }
+
+    @staticmethod
+    def drain(connection, queue):
+        """memory:// 브로커에 쌓인 메시지를 비웁니다."""
+        channel = connection.default_channel
+        while channel.basic_get(queue, no_ack=True) is not None:
+            pass
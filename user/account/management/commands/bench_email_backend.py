@@ -0,0 +1,168 @@
+# account/management/commands/bench_email_backend.py
+
+import time
+
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+
+from account.utils.async_smtp import AsyncDeliveryEngine
+from account.utils.bench import percentile, write_json
+from account.utils.email_dispatcher import build_auth_email, send_batch
+from account.utils.email_templates import KIND_VERIFY
+from account.utils.smtp_pool import get_smtp_pool, reset_smtp_pool
+from account.utils.smtp_sink import SMTPSink
+
+# 비교할 이메일 백엔드 (이름 -> import 경로)
+BACKENDS = {
+    'smtp': 'django.core.mail.backends.smtp.EmailBackend',
+    'custom': 'account.email_backend.CustomEmailBackend',
+    'pooled': 'account.email_backend.PooledEmailBackend',
+}
+# 메일 묶음 단위로 측정하는 방식
+BATCHED = 'batched'       # utils/email_dispatcher.send_batch (pooled 연결 하나로 --batch-size 통씩, flush 작업의 'smtp' 엔진)
+ASYNC_ENGINE = 'async'    # utils/async_smtp.py (--concurrency 개 연결에서 동시에, flush 작업의 'async' 엔진)
+CASES = [*BACKENDS, BATCHED, ASYNC_ENGINE]
+
+
+class Command(BaseCommand):
+    """
+    로컬 SMTP sink(account/utils/smtp_sink.py)에 인증 메일을 보내며 전송 방식별로 비교합니다.
+
+        msgs/sec     : 초당 전송 수
+        p50 / p99    : 메일 1통 전송 시간 (batched 는 묶음 시간 / 묶음 크기)
+        cpu us/msg   : 메일 1통당 보내는 쪽 스레드 CPU 시간 (sink 스레드 제외)
+        connections  : 새로 맺은 SMTP 연결 수
+        delivered / failed
+
+    모든 방식이 같은 인증 메일(build_auth_email, 텍스트 + HTML)을 보냅니다.
+    smtp / custom / pooled 는 send_auth_email_task 처럼 메일 1통마다 get_connection() -> send_messages() 를 호출합니다.
+    sink 에 지연(--connect-latency / --command-latency / --data-latency)과 실패(--failure-rate / --disconnect-rate)를
+    넣으면 실제 공급자에 가까운 조건에서 비교할 수 있습니다. (sink 는 TLS / AUTH 가 없으므로 그 비용은 제외됩니다.)
+    발송 한도(EMAIL_RATE_LIMIT)는 측정 중에는 끕니다.
+
+    사용 예: python manage.py bench_email_backend --messages 500 --command-latency 0.002 --failure-rate 0.01
+    """
+    help = '이메일 전송 방식별 처리량 / CPU 벤치마크 (로컬 SMTP sink)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--backends', nargs='+', choices=CASES, default=CASES)
+        parser.add_argument('--messages', type=int, default=200, help='방식별 전송 메일 수')
+        parser.add_argument('--batch-size', type=int, default=50, help='batched 묶음 크기')
+        parser.add_argument('--concurrency', type=int, default=20, help='async 엔진 동시 연결 수')
+        parser.add_argument('--connect-latency', type=float, default=0.0, help='sink 220 인사 지연 (초)')
+        parser.add_argument('--command-latency', type=float, default=0.0, help='sink 명령 응답 지연 (초)')
+        parser.add_argument('--data-latency', type=float, default=0.0, help='sink DATA 처리 지연 (초)')
+        parser.add_argument('--failure-rate', type=float, default=0.0, help='sink DATA 451 응답 확률')
+        parser.add_argument('--disconnect-rate', type=float, default=0.0, help='sink MAIL 에서 연결을 끊을 확률')
+        parser.add_argument('--seed', type=int, default=1, help='실패 주입 난수 seed')
+        parser.add_argument('--output', help='결과를 저장할 JSON 파일 경로')
+
+    def handle(self, *args, **options):
+        results = []
+        sink = SMTPSink(
+            connect_latency=options['connect_latency'], command_latency=options['command_latency'],
+            data_latency=options['data_latency'], failure_rate=options['failure_rate'],
+            disconnect_rate=options['disconnect_rate'], seed=options['seed'],
+        )
+
+        with sink, override_settings(
+            EMAIL_HOST=sink.host, EMAIL_PORT=sink.port, EMAIL_USE_TLS=False, EMAIL_USE_SSL=False,
+            EMAIL_HOST_USER='', EMAIL_HOST_PASSWORD='', EMAIL_RATE_LIMIT={'ENABLED': False},
+        ):
+            for name in options['backends']:
+                if name == ASYNC_ENGINE:
+                    run = lambda items: self.send_async(items, options['concurrency'])
+                    label = f'{ASYNC_ENGINE}x{options["concurrency"]}'
+                elif name == BATCHED:
+                    run = lambda items: self.send_batched(items, options['batch_size'])
+                    label = f'{BATCHED}x{options["batch_size"]}'
+                else:
+                    run = lambda items, backend=BACKENDS[name]: self.send_one_by_one(items, backend)
+                    label = name
+                results.append(self.measure(label, sink, options['messages'], run))
+
+        self.stdout.write(
+            f"{'backend':<12} {'msgs/sec':>9} {'p50(ms)':>8} {'p99(ms)':>8} {'cpu us/msg':>11} "
+            f"{'connections':>12} {'delivered':>10} {'failed':>7}"
+        )
+        for r in results:
+            self.stdout.write(
+                f"{r['backend']:<12} {r['msgs_per_sec']:>9} {r['p50_ms']:>8} {r['p99_ms']:>8} "
+                f"{r['cpu_us_per_msg']:>11} {r['connections']:>12} {r['delivered']:>10} {r['failed']:>7}"
+            )
+
+        if options['output']:
+            write_json(options['output'], {
+                'benchmark': 'email_backend',
+                'sink': {name: options[name] for name in (
+                    'connect_latency', 'command_latency', 'data_latency', 'failure_rate', 'disconnect_rate',
+                )},
+                'results': results,
+            })
+
+    @staticmethod
+    def items(count):
+        return [
+            {'email': f'bench{i}@oasiss.co.kr', 'code': f'{i:06d}', 'kind': KIND_VERIFY, 'attempt': 1}
+            for i in range(count)
+        ]
+
+    def measure(self, label, sink, count, run):
+        reset_smtp_pool()
+        connections_before = sink.connection_count
+        messages_before = sink.message_count
+        items = self.items(count)
+
+        started = time.perf_counter()
+        cpu_started = time.thread_time()
+        latencies, failed = run(items)
+        cpu = time.thread_time() - cpu_started
+        elapsed = time.perf_counter() - started
+
+        stats = dict(get_smtp_pool().stats)
+        reset_smtp_pool()
+
+        return {
+            'backend': label,
+            'messages': count,
+            'msgs_per_sec': round(count / elapsed, 2) if elapsed > 0 else 0.0,
+            'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+            'p99_ms': round(percentile(latencies, 99) * 1000, 3),
+            'cpu_us_per_msg': round(cpu / count * 1e6, 1) if count else 0.0,
+            'connections': sink.connection_count - connections_before,
+            'delivered': sink.message_count - messages_before,
+            'failed': failed,
+            'pool': stats if label == 'pooled' else None,
+        }
+
+    def send_one_by_one(self, items, backend):
+        latencies = []
+        failed = 0
+        for item in items:
+            message = build_auth_email(item['email'], item['code'], item['kind'], get_connection(backend))
+            sent_at = time.perf_counter()
+            try:
+                if not message.send():
+                    failed += 1
+            except Exception:
+                failed += 1
+            latencies.append(time.perf_counter() - sent_at)
+        return latencies, failed
+
+    def send_batched(self, items, batch_size):
+        latencies = []
+        failed = 0
+        for start in range(0, len(items), batch_size):
+            batch = items[start:start + batch_size]
+            sent_at = time.perf_counter()
+            result = send_batch(batch, connection=get_connection(BACKENDS['pooled']))
+            elapsed = time.perf_counter() - sent_at
+            latencies.extend([elapsed / len(batch)] * len(batch))
+            failed += len(result.failed)
+        return latencies, failed
+
+    def send_async(self, items, concurrency):
+        engine = AsyncDeliveryEngine(concurrency=concurrency)
+        result = engine.deliver(items)
+        return engine.latencies, len(result.failed)
@@ -0,0 +1,163 @@
+# account/management/commands/bench_email_rate_limit.py
+
+import heapq
+import random
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+
+from account.utils.bench import percentile, write_json
+from account.utils.rate_limiter import LIMIT_RECIPIENT, EmailRateLimiter
+
+# 벤치마크 전용 로컬 메모리 캐시 (운영 Redis 의 버킷을 건드리지 않습니다.)
+BENCH_CACHE = 'email_rate_bench'
+
+
+class VirtualClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+class Command(BaseCommand):
+    """
+    발송 한도(utils/rate_limiter.py) 시뮬레이션 벤치마크
+
+    가상 시계로 --seconds 동안 메일 요청을 포아송 분포로 발생시키고(한도의 --loads 배),
+    limiter 결정대로 처리합니다. (허용: delay 뒤 발송, 계정 한도: retry_after 뒤 다시 요청, 수신자 한도: 거부)
+    부하가 한도를 넘어도 발송률이 한도(--rate)에 머무르고, 어떤 --window 구간에서도
+    burst + rate * window 통을 넘지 않는지 확인합니다.
+
+    마지막으로 acquire() 1회의 실제 비용(캐시 왕복 포함)을 측정합니다.
+
+    사용 예: python manage.py bench_email_rate_limit --rate 10 --burst 20 --loads 0.5 1 2 5
+    """
+    help = '이메일 발송 토큰 버킷 시뮬레이션 벤치마크'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rate', type=float, default=10.0, help='계정 버킷 초당 발송 수')
+        parser.add_argument('--burst', type=int, default=20, help='계정 버킷 최대 연속 발송 수')
+        parser.add_argument('--recipient-rate', type=float, default=10 / 3600, help='수신자 버킷 초당 발송 수')
+        parser.add_argument('--recipient-burst', type=int, default=6, help='수신자 버킷 최대 연속 발송 수')
+        parser.add_argument('--max-wait', type=float, default=5.0, help='워커 안에서 기다릴 최대 시간 (초)')
+        parser.add_argument('--loads', type=float, nargs='+', default=[0.5, 1.0, 2.0, 5.0],
+                            help='요청률 (계정 한도의 배수)')
+        parser.add_argument('--seconds', type=float, default=300.0, help='시뮬레이션 시간 (가상 초)')
+        parser.add_argument('--window', type=float, default=1.0, help='최대 발송 수를 확인할 구간 (초)')
+        parser.add_argument('--recipients', type=int, default=5000, help='수신자 주소 수')
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument('--output', help='결과를 저장할 JSON 파일 경로')
+
+    def handle(self, *args, **options):
+        caches = dict(settings.CACHES)
+        caches[BENCH_CACHE] = {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': BENCH_CACHE}
+
+        with override_settings(CACHES=caches):
+            results = [self.simulate(load, options) for load in options['loads']]
+            acquire_us = self.measure_acquire(options)
+
+        self.stdout.write(
+            f"{'load':>5} {'offered/s':>10} {'sent/s':>8} {'ceiling':>8} {'max/window':>11} {'bound':>6} "
+            f"{'deferred':>9} {'rejected':>9} {'p50 wait':>9} {'p99 wait':>9}"
+        )
+        for r in results:
+            self.stdout.write(
+                f"{r['load']:>5} {r['offered_per_sec']:>10} {r['sent_per_sec']:>8} {r['ceiling_per_sec']:>8} "
+                f"{r['max_per_window']:>11} {r['window_bound']:>6} {r['deferred']:>9} {r['rejected']:>9} "
+                f"{r['p50_wait_s']:>9} {r['p99_wait_s']:>9}"
+            )
+        self.stdout.write(f"acquire(): {acquire_us} us/call (locmem)")
+
+        if options['output']:
+            write_json(options['output'], {
+                'benchmark': 'email_rate_limit', 'results': results, 'acquire_us_per_call': acquire_us,
+            })
+
+    def limiter(self, options, clock, account):
+        return EmailRateLimiter(
+            account=account, alias=BENCH_CACHE, clock=clock,
+            ENABLED=True, GLOBAL_RATE=options['rate'], GLOBAL_BURST=options['burst'],
+            RECIPIENT_RATE=options['recipient_rate'], RECIPIENT_BURST=options['recipient_burst'],
+            MAX_WAIT=options['max_wait'],
+        )
+
+    def simulate(self, load, options):
+        rng = random.Random(options['seed'])
+        clock = VirtualClock()
+        limiter = self.limiter(options, clock, account=f'sim-{load}')
+        start = clock.now
+        end = start + options['seconds']
+        offered_rate = options['rate'] * load
+
+        # (시각, 순번, 수신자, 처음 요청 시각)
+        events = []
+        t = start
+        seq = 0
+        while True:
+            t += rng.expovariate(offered_rate)
+            if t >= end:
+                break
+            recipient = f'user{rng.randrange(options["recipients"])}@oasiss.co.kr'
+            events.append((t, seq, recipient, t))
+            seq += 1
+        offered = len(events)
+        heapq.heapify(events)
+
+        sent_at = []
+        waits = []
+        deferred = rejected = 0
+        while events:
+            t, _, recipient, requested = heapq.heappop(events)
+            if t >= end:
+                break
+            clock.now = t
+            decision = limiter.acquire(recipient)
+            if decision.allowed:
+                sent_at.append(t + decision.delay)
+                waits.append(t + decision.delay - requested)
+            elif decision.reason == LIMIT_RECIPIENT:
+                rejected += 1
+            else:
+                deferred += 1
+                seq += 1
+                heapq.heappush(events, (t + decision.retry_after, seq, recipient, requested))
+
+        sent_at.sort()
+        window = options['window']
+        max_per_window = 0
+        lo = 0
+        for hi, sent in enumerate(sent_at):
+            while sent_at[lo] <= sent - window:
+                lo += 1
+            max_per_window = max(max_per_window, hi - lo + 1)
+
+        # 처음 burst 를 뺀 정상 상태 발송률
+        steady_from = start + options['burst'] / options['rate']
+        steady = [s for s in sent_at if steady_from <= s < end]
+        steady_seconds = max(end - steady_from, 1e-9)
+
+        return {
+            'load': load,
+            'offered': offered,
+            'offered_per_sec': round(offered / options['seconds'], 2),
+            'sent': len(sent_at),
+            'sent_per_sec': round(len(steady) / steady_seconds, 2),
+            'ceiling_per_sec': options['rate'],
+            'max_per_window': max_per_window,
+            'window_bound': int(options['burst'] + options['rate'] * window),
+            'deferred': deferred,
+            'rejected': rejected,
+            'p50_wait_s': round(percentile(waits, 50), 3),
+            'p99_wait_s': round(percentile(waits, 99), 3),
+        }
+
+    def measure_acquire(self, options, number=5000):
+        limiter = self.limiter(dict(options, rate=1e9, burst=10 ** 9), time.time, account='acquire')
+        started = time.perf_counter()
+        for i in range(number):
+            limiter.acquire(f'user{i}@oasiss.co.kr')
+        return round((time.perf_counter() - started) / number * 1e6, 2)
@@ -0,0 +1,61 @@
+# account/management/commands/bench_email_templates.py
+
+import timeit
+
+from django.core.management.base import BaseCommand
+
+from account.utils.bench import write_json
+from account.utils.email_dispatcher import build_auth_email
+from account.utils.email_templates import CODE_EMAIL_HTML, KIND_VERIFY, render
+
+# 기존 방식: 호출마다 서식 문자열을 해석 (send_auth_email_task 에 있던 인라인 템플릿)
+LEGACY_HTML = CODE_EMAIL_HTML.replace('{title}', '이메일 인증')
+
+
+def legacy_render(code):
+    subject = "회원가입 이메일 인증 코드"
+    message = f"인증 코드는 {code} 입니다. 5분 내에 입력해 주세요."
+    html_message = LEGACY_HTML.format(code=code)
+    return subject, message, html_message
+
+
+class Command(BaseCommand):
+    """
+    인증 메일 렌더링 비용을 단계별로 측정합니다. (호출 1회당 마이크로초)
+
+        legacy   : 기존 인라인 템플릿 str.format()
+        compiled : utils/email_templates.py 레지스트리 (미리 컴파일된 조각 이어 붙이기)
+        message  : build_auth_email() - EmailMultiAlternatives 생성까지
+        mime     : message().as_bytes() - SMTP 로 보낼 MIME 바이트까지
+
+    사용 예: python manage.py bench_email_templates --number 20000 --output templates.json
+    """
+    help = '이메일 템플릿 렌더링 비용 마이크로 벤치마크'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--number', type=int, default=20000, help='측정 1회당 호출 수')
+        parser.add_argument('--repeat', type=int, default=5, help='측정 반복 횟수 (최솟값 사용)')
+        parser.add_argument('--output', help='결과를 저장할 JSON 파일 경로')
+
+    def handle(self, *args, **options):
+        code = '123456'
+        cases = {
+            'legacy': lambda: legacy_render(code),
+            'compiled': lambda: render(KIND_VERIFY, code=code),
+            'message': lambda: build_auth_email('bench@oasiss.co.kr', code),
+            'mime': lambda: build_auth_email('bench@oasiss.co.kr', code).message().as_bytes(linesep='\r\n'),
+        }
+
+        results = []
+        for name, func in cases.items():
+            # message / mime 은 훨씬 느리므로 호출 수를 줄입니다.
+            number = options['number'] if name in ('legacy', 'compiled') else max(options['number'] // 20, 1)
+            best = min(timeit.repeat(func, number=number, repeat=options['repeat']))
+            results.append({'case': name, 'number': number, 'us_per_call': round(best / number * 1e6, 3)})
+
+        self.stdout.write(f"{'case':<10} {'us/call':>10}")
+        for r in results:
+            self.stdout.write(f"{r['case']:<10} {r['us_per_call']:>10}")
+
+        if options['output']:
+            write_json(options['output'], {'benchmark': 'email_templates', 'results': results})
@@ -0,0 +1,72 @@
+# account/management/commands/bench_jwt_claims.py
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken, AccessToken
+
+from account.models import UserInfo, UserEmail
+from account.utils.claims import CLAIMS_PROFILES
+from account.utils.login_pipeline import LoginSnapshot
+from approval.models import ApprovalRequest, ApprovalStatus, RequestType
+
+
+class Command(BaseCommand):
+    """
+    PENDING 승인 요청 수에 따른 Authorization 헤더 크기와 JWT 디코드(검증) 시간을 측정합니다.
+    DB 를 사용하지 않고 저장되지 않은 모델 인스턴스로 실제 Serializer 출력과 동일한 클레임을 만듭니다.
+
+    사용 예: python manage.py bench_jwt_claims --pending 0 10 50 200 --iterations 2000
+    """
+    help = 'JWT 클레임 프로필별 헤더 크기 / 디코드 시간 벤치마크'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pending', type=int, nargs='+', default=[0, 10, 50, 200],
+                            help='마스터에게 쌓인 PENDING 요청 수 목록')
+        parser.add_argument('--iterations', type=int, default=2000,
+                            help='디코드 반복 횟수')
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+
+        self.stdout.write(f"{'profile':<8} {'pending':>7} {'header(B)':>10} {'decode(us)':>11}")
+        for pending in options['pending']:
+            for profile in CLAIMS_PROFILES:
+                header = self.build_header(pending, profile)
+                raw = header.split(' ', 1)[1]
+
+                started = time.perf_counter()
+                for _ in range(iterations):
+                    AccessToken(raw)
+                elapsed = time.perf_counter() - started
+
+                self.stdout.write(
+                    f"{profile:<8} {pending:>7} {len(header):>10} {elapsed / iterations * 1e6:>11.1f}"
+                )
+
+    def build_header(self, pending, profile):
+        master = UserInfo(id=1, email='master@oasiss.co.kr', nick_name='master',
+                          family_level='master', family_group_id='fam_1')
+        # 저장되지 않은 인스턴스: email_info 캐시를 채워 DB 조회를 막습니다.
+        master.email_info = UserEmail(email_auth=True)
+
+        now = timezone.now()
+        pending_requests = [
+            ApprovalRequest(
+                id=i + 1,
+                requestee_id=i + 2,
+                approver_id=master.id,
+                request_type=RequestType.GROUP_JOIN,
+                details={'nick_name': f'member{i}', 'email': f'member{i}@oasiss.co.kr'},
+                status=ApprovalStatus.PENDING,
+                requested_at=now,
+            )
+            for i in range(pending)
+        ]
+
+        snapshot = LoginSnapshot(master, pending_requests)
+        token = RefreshToken.for_user(master)
+        snapshot.apply_claims(token, profile)
+
+        return f"Bearer {token.access_token}"
@@ -0,0 +1,102 @@
+# account/management/commands/bench_login_load.py
+
+import asyncio
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.test import AsyncClient, Client
+from django.urls import reverse
+
+from account.models import UserInfo
+from account.utils.bench import bench_database, summarize, write_json
+from account.utils.hashing_pool import get_hashing_pool
+
+
+class Command(BaseCommand):
+    """
+    동시 로그인 부하에서 동기 로그인(token_obtain_pair)과
+    비동기 로그인(token_obtain_pair_async, 프로세스 풀 해시) 의 p50/p99 를 비교합니다.
+    테스트 DB 를 새로 만들어 사용하므로 운영 데이터에는 영향이 없습니다.
+
+    사용 예: python manage.py bench_login_load --concurrency 1 8 32 --requests 64 --output login.json
+    """
+    help = '로그인 동시 부하 벤치마크 (sync vs async)'
+
+    EMAIL = 'bench@oasiss.co.kr'
+    PASSWORD = 'bench-password!1'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8, 32])
+        parser.add_argument('--requests', type=int, default=64, help='동시성 단계별 요청 수')
+        parser.add_argument('--mode', choices=['sync', 'async', 'both'], default='both')
+        parser.add_argument('--output', help='결과를 저장할 JSON 파일 경로')
+
+    def handle(self, *args, **options):
+        results = []
+
+        with bench_database():
+            UserInfo.objects.create_user(email=self.EMAIL, nick_name='bench', password=self.PASSWORD)
+            body = {'email': self.EMAIL, 'password': self.PASSWORD}
+
+            for concurrency in options['concurrency']:
+                if options['mode'] in ('sync', 'both'):
+                    results.append(self.run_sync(body, concurrency, options['requests']))
+                if options['mode'] in ('async', 'both'):
+                    results.append(asyncio.run(self.run_async(body, concurrency, options['requests'])))
+
+            get_hashing_pool().shutdown()
+
+        self.stdout.write(f"{'mode':<6} {'conc':>5} {'rps':>8} {'p50(ms)':>9} {'p99(ms)':>9}  status")
+        for r in results:
+            self.stdout.write(
+                f"{r['mode']:<6} {r['concurrency']:>5} {r['rps']:>8} {r['p50_ms']:>9} {r['p99_ms']:>9}  {r['status']}"
+            )
+
+        if options['output']:
+            write_json(options['output'], {'benchmark': 'login_load', 'results': results})
+
+    def run_sync(self, body, concurrency, total):
+        url = reverse('token_obtain_pair')
+        local = threading.local()
+
+        def login(_):
+            client = getattr(local, 'client', None)
+            if client is None:
+                client = local.client = Client()
+            started = time.perf_counter()
+            response = client.post(url, body, content_type='application/json')
+            return time.perf_counter() - started, response.status_code
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            outcomes = list(executor.map(login, range(total)))
+        elapsed = time.perf_counter() - started
+        connections.close_all()
+
+        return self.summarize('sync', concurrency, outcomes, elapsed)
+
+    async def run_async(self, body, concurrency, total):
+        url = reverse('token_obtain_pair_async')
+        client = AsyncClient()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def login():
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.post(url, body, content_type='application/json')
+                return time.perf_counter() - started, response.status_code
+
+        started = time.perf_counter()
+        outcomes = await asyncio.gather(*(login() for _ in range(total)))
+        elapsed = time.perf_counter() - started
+
+        return self.summarize('async', concurrency, outcomes, elapsed)
+
+    def summarize(self, mode, concurrency, outcomes, elapsed):
+        latencies = [latency for latency, _ in outcomes]
+        status = dict(Counter(code for _, code in outcomes))
+        return summarize(latencies, elapsed, mode=mode, concurrency=concurrency, status=status)
@@ -0,0 +1,106 @@
+# account/management/commands/bench_password_hashers.py
+
+import time
+
+from django.contrib.auth.hashers import check_password, make_password
+from django.core.management.base import BaseCommand
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from account.hashers import PASSWORD_HASH_PROFILES
+from account.models import UserInfo
+from account.utils.bench import bench_database, percentile, write_json
+
+
+class Command(BaseCommand):
+    """
+    PBKDF2 반복 횟수별 해시 생성/검증 시간과 실제 로그인(token_obtain_pair) 지연 시간을 측정합니다.
+    --budget-ms 를 주면 로그인 p99 가 예산 이내인 가장 높은 반복 횟수를 추천합니다.
+
+    사용 예: python manage.py bench_password_hashers --samples 20 --budget-ms 300
+    """
+    help = '비밀번호 해셔 비용(반복 횟수)별 로그인 지연 시간 벤치마크'
+
+    PASSWORD = 'bench-password!1'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, nargs='+',
+                            default=sorted(PASSWORD_HASH_PROFILES.values()),
+                            help='측정할 PBKDF2 반복 횟수 목록 (기본: 프로필 값)')
+        parser.add_argument('--samples', type=int, default=20, help='반복 횟수별 측정 횟수')
+        parser.add_argument('--budget-ms', type=float, help='로그인 p99 예산 (ms)')
+        parser.add_argument('--output', help='결과를 저장할 JSON 파일 경로')
+
+    def handle(self, *args, **options):
+        samples = options['samples']
+        results = []
+
+        with bench_database():
+            for iterations in options['iterations']:
+                with override_settings(PASSWORD_HASH_ITERATIONS=iterations):
+                    results.append(self.measure(iterations, samples))
+
+        self.stdout.write(
+            f"{'iterations':>10} {'hash p50':>9} {'verify p50':>11} {'login p50':>10} {'login p99':>10}  (ms)"
+        )
+        for r in results:
+            self.stdout.write(
+                f"{r['iterations']:>10} {r['hash_p50_ms']:>9} {r['verify_p50_ms']:>11} "
+                f"{r['login_p50_ms']:>10} {r['login_p99_ms']:>10}"
+            )
+
+        if options['budget_ms']:
+            within = [r for r in results if r['login_p99_ms'] <= options['budget_ms']]
+            if within:
+                best = max(within, key=lambda r: r['iterations'])
+                self.stdout.write(
+                    f"p99 {options['budget_ms']}ms 이내 최대 반복 횟수: {best['iterations']} "
+                    f"(PASSWORD_HASH_ITERATIONS = {best['iterations']})"
+                )
+            else:
+                self.stdout.write(f"p99 {options['budget_ms']}ms 를 만족하는 반복 횟수가 없습니다.")
+
+        if options['output']:
+            write_json(options['output'], {'benchmark': 'password_hashers', 'results': results})
+
+    def measure(self, iterations, samples):
+        # 1. 해시 생성 / 검증
+        hash_times, verify_times = [], []
+        encoded = None
+        for _ in range(samples):
+            started = time.perf_counter()
+            encoded = make_password(self.PASSWORD)
+            hash_times.append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            check_password(self.PASSWORD, encoded)
+            verify_times.append(time.perf_counter() - started)
+
+        # 2. 실제 로그인 (해당 반복 횟수로 저장된 사용자)
+        email = f'bench{iterations}@oasiss.co.kr'
+        UserInfo.objects.create_user_with_hash(email=email, nick_name='bench', password_hash=encoded)
+        client = Client()
+        url = reverse('token_obtain_pair')
+        login_times = []
+        for _ in range(samples):
+            started = time.perf_counter()
+            response = client.post(url, {'email': email, 'password': self.PASSWORD},
+                                   content_type='application/json')
+            login_times.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                raise RuntimeError(f"로그인 실패: {response.status_code} {response.content[:200]}")
+
+        # 반복 횟수가 같으므로 재해싱(추가 저장)이 없어야 합니다.
+        rehashed = UserInfo.objects.get(email=email).password != encoded
+
+        def ms(values, pct):
+            return round(percentile(values, pct) * 1000, 2)
+
+        return {
+            'iterations': iterations,
+            'hash_p50_ms': ms(hash_times, 50),
+            'verify_p50_ms': ms(verify_times, 50),
+            'login_p50_ms': ms(login_times, 50),
+            'login_p99_ms': ms(login_times, 99),
+            'rehashed': rehashed,
+        }
@@ -0,0 +1,114 @@
+# account/management/commands/bench_user_save.py
+
+import time
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models.signals import post_save
+
+from account.models import UserEmail, UserInfo
+from account.utils.bench import bench_database, summarize, write_json
+
+MODE_SIGNAL = 'signal'      # 변경 전: UserInfo 저장 -> post_save 시그널에서 UserEmail 생성
+MODE_EXPLICIT = 'explicit'  # 현재: UserInfoManager 가 한 트랜잭션에서 함께 생성, 시그널 없음
+
+
+def legacy_create_user_email(sender, instance, created, **kwargs):
+    """제거된 account.signals.create_or_update_user_email 과 같은 동작 (비교용)"""
+    if created:
+        UserEmail.objects.create(user=instance)
+
+
+class Command(BaseCommand):
+    """
+    회원가입(UserInfo + UserEmail 생성)과 기존 사용자 저장(UserInfo.save) 처리량을
+    UserEmail 생성 방식별로 비교합니다. (테스트 DB 사용)
+
+        signal   : 변경 전. user.save() 후 post_save 시그널이 UserEmail 을 INSERT (트랜잭션 밖, 두 번의 커밋)
+        explicit : 현재. create_user_with_hash() 가 한 트랜잭션에서 두 행을 INSERT, UserInfo 저장 시 시그널 없음
+
+    비밀번호 해시 비용을 빼기 위해 미리 계산한 해시로 가입합니다. 저장은 잠금 처리처럼 update_fields 한 개만 저장합니다.
+
+    사용 예: python manage.py bench_user_save --users 2000
+    """
+    help = '회원가입 / UserInfo 저장 처리량 벤치마크 (UserEmail 시그널 제거 전후)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000, help='방식별 가입 / 저장 횟수')
+        parser.add_argument('--output', help='결과를 저장할 JSON 파일 경로')
+
+    def handle(self, *args, **options):
+        count = options['users']
+        password_hash = make_password('bench-password!1')
+        results = []
+
+        with bench_database():
+            for mode in (MODE_SIGNAL, MODE_EXPLICIT):
+                if mode == MODE_SIGNAL:
+                    post_save.connect(legacy_create_user_email, sender=UserInfo, dispatch_uid='bench_legacy_user_email')
+                try:
+                    users = self.register(mode, count, password_hash, results)
+                    self.save(mode, users, results)
+                finally:
+                    post_save.disconnect(sender=UserInfo, dispatch_uid='bench_legacy_user_email')
+
+        self.stdout.write(
+            f"{'mode':<9} {'operation':<9} {'ops/sec':>9} {'p50(ms)':>8} {'p99(ms)':>8} {'queries/op':>11}"
+        )
+        for r in results:
+            self.stdout.write(
+                f"{r['mode']:<9} {r['operation']:<9} {r['rps']:>9} {r['p50_ms']:>8} {r['p99_ms']:>8} "
+                f"{r['queries_per_op']:>11}"
+            )
+
+        if options['output']:
+            write_json(options['output'], {'benchmark': 'user_save', 'results': results})
+
+    def measure(self, mode, operation, calls, results):
+        latencies = []
+        queries = 0
+
+        # connection.queries 는 최근 9000개만 보관하므로 실행 횟수를 직접 셉니다. (sqlite 는 atomic() 의 BEGIN 도 포함)
+        def count(execute, sql, params, many, context):
+            nonlocal queries
+            queries += 1
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(count):
+            started = time.perf_counter()
+            for call in calls:
+                call_started = time.perf_counter()
+                call()
+                latencies.append(time.perf_counter() - call_started)
+            elapsed = time.perf_counter() - started
+        results.append(summarize(
+            latencies, elapsed, mode=mode, operation=operation,
+            queries_per_op=round(queries / len(latencies), 2) if latencies else 0.0,
+        ))
+
+    def register(self, mode, count, password_hash, results):
+        users = []
+
+        def legacy(i):
+            # 변경 전 create_user_with_hash(): save() 한 번, UserEmail 은 시그널이 생성
+            user = UserInfo(email=f'{mode}{i}@oasiss.co.kr', nick_name=f'{mode}{i}', password=password_hash)
+            user.save()
+            users.append(user)
+
+        def explicit(i):
+            users.append(UserInfo.objects.create_user_with_hash(
+                email=f'{mode}{i}@oasiss.co.kr', nick_name=f'{mode}{i}', password_hash=password_hash,
+            ))
+
+        register = legacy if mode == MODE_SIGNAL else explicit
+        self.measure(mode, 'register', [lambda i=i: register(i) for i in range(count)], results)
+        assert UserEmail.objects.filter(user__in=users).count() == len(users)
+        return users
+
+    def save(self, mode, users, results):
+        def save(user):
+            user.decryption_fail_count += 1
+            user.save(update_fields=['decryption_fail_count'])
+
+        self.measure(mode, 'save', [lambda user=user: save(user) for user in users], results)
@@ -0,0 +1,51 @@
+# account/management/commands/provision_users.py
+
+from django.core.management.base import BaseCommand, CommandError
+
+from account.utils.bench import write_json
+from account.utils.provisioning import FORMAT_CSV, FORMAT_JSONL, provision_users, read_rows
+
+
+class Command(BaseCommand):
+    """
+    CSV / JSONL 파일의 사용자를 일괄 생성합니다. (utils/provisioning.py)
+
+    컬럼: email, nick_name (필수), password, family_level, oas_group_id, family_group_id
+    password 가 없으면 로그인할 수 없는 비밀번호로 만듭니다. (비밀번호 재설정 후 사용)
+    이미 가입된 email / 파일 안에서 중복된 email / 잘못된 행은 건너뛰고 줄 번호와 사유를 출력합니다.
+
+    사용 예: python manage.py provision_users residents.csv --chunk-size 500 --hash-workers 4
+    """
+    help = 'CSV / JSONL 파일로 사용자 일괄 생성 (bulk_create + 해시 프로세스 풀)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='입력 파일 (.csv 또는 .jsonl)')
+        parser.add_argument('--format', choices=[FORMAT_CSV, FORMAT_JSONL], help='입력 형식 (기본: 확장자로 판단)')
+        parser.add_argument('--chunk-size', type=int, help='트랜잭션 1개에 저장할 행 수')
+        parser.add_argument('--hash-workers', type=int, help='비밀번호 해시 프로세스 수 (0: 현재 프로세스)')
+        parser.add_argument('--dry-run', action='store_true', help='검증만 하고 저장하지 않음')
+        parser.add_argument('--output', help='결과를 저장할 JSON 파일 경로')
+
+    def handle(self, *args, **options):
+        try:
+            rows = read_rows(options['path'], options['format'])
+            result = provision_users(
+                rows, chunk_size=options['chunk_size'], hash_workers=options['hash_workers'],
+                dry_run=options['dry_run'],
+            )
+        except OSError as e:
+            raise CommandError(f'입력 파일을 읽을 수 없습니다: {e}')
+
+        for line, email, reason in result.skipped:
+            self.stdout.write(f'  {line}번째 줄 건너뜀 ({email}): {reason}')
+
+        summary = result.as_dict()
+        self.stdout.write(
+            f"{'(dry-run) ' if options['dry_run'] else ''}"
+            f"행 {summary['rows']}, 생성 {summary['created']}, 건너뜀 {summary['skipped']}, "
+            f"청크 {summary['chunks']}, {summary['elapsed_s']}초 "
+            f"(해시 {summary['hash_s']}초, 저장 {summary['write_s']}초), {summary['rows_per_sec']} rows/sec"
+        )
+
+        if options['output']:
+            write_json(options['output'], dict(summary, benchmark='provision_users'))
@@ -1,4 +1,5 @@
 from django.contrib.auth.models import BaseUserManager
+from django.db import transaction
 
 # UserInfo 모델을 생성하고 관리하는 커스텀 매니저
 class UserInfoManager(BaseUserManager):
@@ -6,13 +7,41 @@ class UserInfoManager(BaseUserManager):
     AbstractBaseUser를 사용할 때 필수적으로 정의해야 하는 커스텀 매니저입니다.
     사용자(UserInfo)와 슈퍼유저(create_superuser)를 생성하는 메서드를 포함합니다.
     """
+    @classmethod
+    def email_key(cls, email):
+        """대소문자 구분 없이 비교하기 위한 email 값 (UserInfo.email_normalized)"""
+        return cls.normalize_email((email or '').strip()).lower() or None
+
     def create_user(self, email, password=None, **extra_fields):
         if not email:
             raise ValueError('The Email must be set')
         email = self.normalize_email(email)
         user = self.model(email=email, **extra_fields)
         user.set_password(password)
-        user.save(using=self._db)
+        return self._save_with_email_info(user)
+
+    def create_user_with_hash(self, email, password_hash, **extra_fields):
+        """
+        이미 계산된 비밀번호 해시로 사용자를 생성합니다.
+        (해시 계산을 요청 스레드 밖, 예: 프로세스 풀에서 처리한 경우)
+        """
+        if not email:
+            raise ValueError('The Email must be set')
+        email = self.normalize_email(email)
+        user = self.model(email=email, password=password_hash, **extra_fields)
+        return self._save_with_email_info(user)
+
+    def _save_with_email_info(self, user):
+        """
+        UserInfo 와 UserEmail 을 한 트랜잭션에서 저장합니다. (post_save 시그널로 만들지 않음)
+        이 경로를 거치지 않고 만든 사용자(관리자 페이지 등)는 UserLoader.email_info() 가 처음 접근할 때 만듭니다.
+        """
+        from .models import UserEmail
+
+        with transaction.atomic(using=self._db):
+            user.save(using=self._db)
+            # user.email_info 캐시도 함께 채워집니다.
+            UserEmail.objects.using(self._db).create(user=user)
         return user
 
     def create_superuser(self, email, password=None, **extra_fields):
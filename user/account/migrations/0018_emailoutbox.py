@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-17 15:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0017_remove_usergroup_email_remove_usergroup_family_level_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmailOutbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('email', models.EmailField(max_length=254, verbose_name='대상 이메일')),
+                ('code', models.CharField(max_length=10, verbose_name='인증 코드')),
+                ('kind', models.CharField(default='verify', max_length=20, verbose_name='메일 종류 (verify/change)')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='요청 시간')),
+                ('relayed_at', models.DateTimeField(blank=True, db_index=True, null=True, verbose_name='전달 시간')),
+            ],
+            options={
+                'verbose_name': '이메일 아웃박스',
+                'verbose_name_plural': '이메일 아웃박스',
+                'db_table': 'email_outbox',
+                'ordering': ['id'],
+            },
+        ),
+    ]
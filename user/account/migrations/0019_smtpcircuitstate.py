@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-17 16:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0018_emailoutbox'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SMTPCircuitState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('host', models.CharField(max_length=255, unique=True, verbose_name='SMTP 호스트')),
+                ('state', models.CharField(choices=[('closed', '정상 (CLOSED)'), ('open', '차단 (OPEN)'), ('half_open', '시험 전송 (HALF_OPEN)')], default='closed', max_length=20, verbose_name='상태')),
+                ('failure_count', models.IntegerField(default=0, verbose_name='차단 시 연속 실패 횟수')),
+                ('trip_count', models.IntegerField(default=0, verbose_name='누적 차단 횟수')),
+                ('opened_at', models.DateTimeField(blank=True, null=True, verbose_name='마지막 차단 시간')),
+                ('open_until', models.DateTimeField(blank=True, null=True, verbose_name='차단 마감 시간')),
+                ('last_error', models.TextField(blank=True, default='', verbose_name='마지막 오류')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='변경 시간')),
+            ],
+            options={
+                'verbose_name': 'SMTP 서킷 브레이커',
+                'verbose_name_plural': 'SMTP 서킷 브레이커',
+                'db_table': 'smtp_circuit_state',
+                'ordering': ['host'],
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-17 16:36
+
+from django.db import migrations, models
+from django.db.models.functions import Lower
+
+
+def fill_email_normalized(apps, schema_editor):
+    # 기존 사용자: UPDATE 한 번으로 채웁니다. (이후에는 UserInfo.save() 가 채움)
+    UserInfo = apps.get_model('account', 'UserInfo')
+    UserInfo.objects.using(schema_editor.connection.alias).update(email_normalized=Lower('email'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0020_emaillog_indexes'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userinfo',
+            name='email_normalized',
+            field=models.CharField(editable=False, max_length=254, null=True, verbose_name='이메일 (소문자)'),
+        ),
+        migrations.RunPython(fill_email_normalized, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='userinfo',
+            index=models.Index(fields=['email_normalized'], name='user_info_email_norm_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userinfo',
+            index=models.Index(fields=['new_email'], name='user_info_new_email_idx'),
+        ),
+    ]
@@ -112,6 +112,13 @@ class UserInfo(AbstractBaseUser, PermissionsMixin):
         null=True,     # 이메일 변경 요청이 없을 때는 None
         blank=True
     )
+    # 👇 대소문자 구분 없는 email 비교용 (email.lower(), save() 에서 자동으로 채움 / utils/email_availability.py)
+    email_normalized = models.CharField(
+        verbose_name='이메일 (소문자)',
+        max_length=254,
+        null=True,
+        editable=False,
+    )
 
     # 비밀번호는 AbstractBaseUser에 의해 기본적으로 처리됩니다.
 
@@ -211,10 +218,23 @@ class UserInfo(AbstractBaseUser, PermissionsMixin):
         verbose_name = '사용자 정보'
         verbose_name_plural = '사용자 정보'
         db_table = 'user_info' # 데이터베이스 테이블명을 user_info로 설정
+        indexes = [
+            # 이메일 사용 가능 여부 확인 (utils/email_availability.py): 두 조건을 OR 로 묶어 인덱스 두 개로 조회
+            models.Index(fields=['email_normalized'], name='user_info_email_norm_idx'),
+            models.Index(fields=['new_email'], name='user_info_new_email_idx'),
+        ]
 
     def __str__(self):
         return self.email
 
+    def save(self, *args, **kwargs):
+        # email 을 바꿀 때 email_normalized 도 함께 저장합니다. (update_fields 로 email 만 저장하는 경우 포함)
+        self.email_normalized = UserInfo.objects.email_key(self.email)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'email' in update_fields and 'email_normalized' not in update_fields:
+            kwargs['update_fields'] = [*update_fields, 'email_normalized']
+        super().save(*args, **kwargs)
+
     # 이메일 전송 관련 편의 메서드 (선택 사항)
     def get_full_name(self):
         # 전체 이름을 반환합니다. 닉네임이 있다면 닉네임, 없다면 이메일을 반환
@@ -341,6 +361,114 @@ class EmailLog(models.Model):
         verbose_name = "이메일 로그"
         verbose_name_plural = "이메일 로그"
         ordering = ['-created_at']
+        indexes = [
+            # 관리자 목록 기본 정렬(-created_at) / 보관 기간 정리(created_at < 기준)
+            models.Index(fields=['-created_at'], name='email_log_created_idx'),
+            # 주소별 이력 조회
+            models.Index(fields=['email', 'created_at'], name='email_log_email_created_idx'),
+            # 관리자 log_type 필터 + 정렬
+            models.Index(fields=['log_type', 'created_at'], name='email_log_type_created_idx'),
+        ]
+
+    def __str__(self):
+        return f'[{self.log_type}] {self.email} - {self.created_at.strftime("%Y-%m-%d %H:%M:%S")}'
+
+class SMTPCircuitState(models.Model):
+    """
+    SMTP 호스트별 서킷 브레이커 상태 (utils/circuit_breaker.py)
+
+    전송 판단은 공유 캐시로 하고, 이 행은 상태가 바뀔 때만 기록되는 관리자 확인용 사본입니다.
+    """
+    STATE_CHOICES = (
+        ('closed', '정상 (CLOSED)'),
+        ('open', '차단 (OPEN)'),
+        ('half_open', '시험 전송 (HALF_OPEN)'),
+    )
+
+    host = models.CharField(
+        max_length=255,
+        unique=True,
+        verbose_name="SMTP 호스트"
+    )
+    state = models.CharField(
+        max_length=20,
+        choices=STATE_CHOICES,
+        default='closed',
+        verbose_name="상태"
+    )
+    failure_count = models.IntegerField(
+        default=0,
+        verbose_name="차단 시 연속 실패 횟수"
+    )
+    trip_count = models.IntegerField(
+        default=0,
+        verbose_name="누적 차단 횟수"
+    )
+    opened_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="마지막 차단 시간"
+    )
+    open_until = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="차단 마감 시간"
+    )
+    last_error = models.TextField(
+        blank=True,
+        default='',
+        verbose_name="마지막 오류"
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name="변경 시간"
+    )
+
+    class Meta:
+        verbose_name = "SMTP 서킷 브레이커"
+        verbose_name_plural = "SMTP 서킷 브레이커"
+        db_table = 'smtp_circuit_state'
+        ordering = ['host']
+
+    def __str__(self):
+        return f'[{self.state}] {self.host}'
+
+class EmailOutbox(models.Model):
+    """
+    인증 메일 전송 요청 (트랜잭션 아웃박스)
+
+    요청 트랜잭션 안에서 사용자 정보 변경과 함께 저장되고, 커밋된 행만
+    relay_email_outbox_task 가 모아서 일괄 전송 대기열로 넘깁니다.
+    (롤백되면 행도 사라지므로 메일이 나가지 않습니다.)
+    """
+    email = models.EmailField(
+        verbose_name="대상 이메일"
+    )
+    code = models.CharField(
+        max_length=10,
+        verbose_name="인증 코드"
+    )
+    kind = models.CharField(
+        max_length=20,
+        default='verify',
+        verbose_name="메일 종류 (verify/change)"
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name="요청 시간"
+    )
+    relayed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        db_index=True,
+        verbose_name="전달 시간"
+    )
+
+    class Meta:
+        verbose_name = "이메일 아웃박스"
+        verbose_name_plural = "이메일 아웃박스"
+        db_table = 'email_outbox'
+        ordering = ['id']
 
     def __str__(self):
-        return f'[{self.log_type}] {self.email} - {self.created_at.strftime("%Y-%m-%d %H:%M:%S")}'
\ No newline at end of file
+        return f'[{self.kind}] {self.email} - {"전달됨" if self.relayed_at else "대기"}'
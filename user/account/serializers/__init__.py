@@ -4,7 +4,8 @@
 from .auth_serializers import (
     UserRegistrationSerializer,
     UserLoginSerializer,
-    CustomTokenObtainPairSerializer
+    CustomTokenObtainPairSerializer,
+    CachedTokenRefreshSerializer
 )
 
 # email_serializers.py 에서 필요한 클래스들을 가져옵니다.
@@ -20,6 +21,7 @@ __all__ = [
     'UserRegistrationSerializer',
     'UserLoginSerializer',
     'CustomTokenObtainPairSerializer',
+    'CachedTokenRefreshSerializer',
     'EmailAuthSendSerializer',
     'EmailAuthConfirmSerializer',
     'EmailChangeRequestSerializer',
@@ -4,16 +4,22 @@ from rest_framework import serializers
 from django.contrib.auth.password_validation import validate_password
 from django.core import exceptions
 from django.utils.translation import gettext_lazy as _
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
-from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from django.contrib.auth.models import update_last_login
 
 from django.utils import timezone
 from datetime import timedelta
 from django.db import transaction
 
 from ..models import UserInfo
-from approval.models import ApprovalRequest, ApprovalStatus
-from approval.serializers import ApprovalRequestSerializer
+from ..utils.login_pipeline import LoginSnapshot
+from ..utils.claims import CLAIMS_PROFILE_FULL, get_claims_profile
+from ..utils.claim_snapshot import ClaimSnapshotCache
+from ..utils.email_availability import AVAILABLE, MESSAGES as EMAIL_MESSAGES, check_email
+from ..utils.lockout import decryption_lockout
+from log_events.metrics import measure_phase
 
 # ----------------------------------------------------------------------
 # 1. 사용자 등록 Serializer
@@ -35,6 +41,15 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         model = UserInfo
         fields = ('email', 'nick_name', 'password1', 'password2')
         read_only_fields = ('is_active', 'is_staff', 'is_superuser')
+        # email 중복은 validate_email 에서 확인합니다. (기본 UniqueValidator 쿼리 대신)
+        extra_kwargs = {'email': {'validators': []}}
+
+    def validate_email(self, value):
+        # 다른 사용자가 사용 중(대소문자 구분 없음)이거나 변경 요청 중인 email 은 가입할 수 없습니다.
+        reason = check_email(value)
+        if reason != AVAILABLE:
+            raise serializers.ValidationError(EMAIL_MESSAGES[reason])
+        return value
 
     def validate(self, data):
         if data['password1'] != data['password2']:
@@ -50,6 +65,16 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         return data
 
     def create(self, validated_data):
+        # UserInfo 와 UserEmail 을 한 트랜잭션에서 함께 저장합니다. (managers.UserInfoManager._save_with_email_info)
+        # 비동기 회원가입 View 에서는 프로세스 풀에서 미리 계산한 해시를 save(password_hash=...) 로 전달합니다.
+        password_hash = validated_data.get('password_hash')
+        if password_hash:
+            return UserInfo.objects.create_user_with_hash(
+                email=validated_data['email'],
+                nick_name=validated_data['nick_name'],
+                password_hash=password_hash
+            )
+
         user = UserInfo.objects.create_user(
             email=validated_data['email'],
             nick_name=validated_data['nick_name'],
@@ -83,132 +108,177 @@ class UserLoginSerializer(serializers.Serializer):
 #     "password" : "ghkdxoghks!@"
 # }
 UNLOCK_DELAY = timedelta(minutes=15)
+INVALID_CREDENTIALS_DETAIL = "제공된 인증 정보가 유효하지 않습니다. 이메일 또는 비밀번호를 확인해 주세요."
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """
+    로그인(토큰 발급) Serializer.
+
+    사용자 / email_info / PENDING 승인 요청을 LoginSnapshot 으로 한 번만 조회하고,
+    토큰 클레임과 응답 본문 모두 같은 스냅샷을 사용합니다.
+    토큰에 들어가는 클레임은 settings.JWT_CLAIMS_PROFILE 을 따르고, 응답 본문은 항상 전체 목록을 포함합니다.
+    (simplejwt 기본 authenticate() 를 거치지 않으므로 사용자 재조회가 발생하지 않습니다.)
+    """
+
     @classmethod
-    def get_token(cls, user):
+    def get_token(cls, user, snapshot=None):
         token = super().get_token(user)
-        token['user_id'] = user.id
-        token['nick_name'] = user.nick_name
-        #token['oas_auth'] = False
 
-        if hasattr(user, 'email_info'):
-             token['email_auth'] = user.email_info.email_auth
-        else:
-             token['email_auth'] = False
+        # 스냅샷 없이 호출된 경우(외부 호출 등)에만 새로 조회합니다.
+        if snapshot is None:
+            snapshot = LoginSnapshot(user)
 
-        token['family_group_id'] = user.family_group_id
-        token['family_level'] = user.family_level
+        snapshot.apply_claims(token, get_claims_profile())
 
-        # approval(승인 요청)
-        # 1. PENDING 요청 목록 조회
-        pending_requests = ApprovalRequest.objects.filter(
-            approver=user,
-            status=ApprovalStatus.PENDING
-        ).order_by('requested_at')
+        return token
 
-        # 2. 요청 존재 여부 확인
-        has_pending_requests = pending_requests.exists()
+    @measure_phase('serializer')
+    def validate(self, attrs):
+        # 1. 🔍 사용자 조회 및 🛡️ 잠금 확인
+        user = self.load_login_user(attrs)
+
+        # 2. 🔑 비밀번호 검증
+        self.verify_password(user, attrs['password'])
+
+        # 3. 토큰 발급 및 응답 구성
+        return self.build_response(user)
+
+    # ------------------------------------------------------------------
+    # 아래 단계들은 비동기 로그인 View(AsyncTokenObtainPairView)에서도 개별적으로 사용합니다.
+    # (비밀번호 해시 비교만 프로세스 풀에서 실행)
+    # ------------------------------------------------------------------
+    def load_login_user(self, attrs):
+        """이메일로 사용자 + email_info 를 한 번에 가져오고, 계정 잠금 상태를 확인합니다."""
+        # 사용자 객체를 가져오지 못하면 기본 인증 실패로 처리합니다.
+        email = attrs.get(UserInfo.USERNAME_FIELD)
+        try:
+            user = LoginSnapshot.load_user(email)
+        except UserInfo.DoesNotExist:
+            # 존재하지 않는 이메일일 경우, 보안을 위해 일반 인증 실패 메시지 반환
+            raise serializers.ValidationError({"detail": INVALID_CREDENTIALS_DETAIL})
 
-        # 3. 요청 목록 직렬화
-        # 토큰 페이로드 크기를 줄이기 위해, 필요하다면 경량 Serializer를 정의하여 사용하세요.
-        # 여기서는 ApprovalRequestSerializer를 사용한다고 가정합니다.
+        self.check_account_lock(user)
 
-        # list를 넣기 때문에 many=True로 설정
-        serializer = ApprovalRequestSerializer(pending_requests, many=True)
+        return user
 
-        # 4. 토큰 페이로드에 추가
-        # 'family_auth_approval' 대신 의미가 더 명확한 키를 사용하는 것이 좋습니다.
-        # 예: 'pending_approvals' 또는 'approvals_as_master'
+    def check_account_lock(self, user):
+        """잠긴 계정이면 15분 경과 여부에 따라 잠금 해제하거나 ValidationError 를 발생시킵니다."""
+        if user.is_active:
+            return
+
+        # 계정이 잠겨 있는 경우 (is_active=False)
+        last_fail_time = user.last_fail_time
+        current_time = timezone.now()
+
+        if last_fail_time and (current_time >= last_fail_time + UNLOCK_DELAY):
+            # 15분 경과: 계정 잠금 해제 및 카운트 초기화
+            with transaction.atomic():
+                user.is_active = True
+                user.decryption_fail_count = 0
+                user.last_fail_time = None
+                user.save(update_fields=['is_active', 'decryption_fail_count', 'last_fail_time'])
+            # 캐시의 실패 카운터도 초기화
+            decryption_lockout().reset(user)
+            # 계정 잠금 해제 후, 이제 비밀번호 인증 단계로 넘어갑니다.
+            return
+
+        # 15분 미경과: 잠금 상태 유지 및 에러 발생 -> 토큰 발급 차단
+        remaining_time = (last_fail_time + UNLOCK_DELAY) - current_time if last_fail_time else UNLOCK_DELAY
+
+        # 명확한 계정 잠금 메시지 반환
+        raise serializers.ValidationError({
+            "detail": f"해당 계정은 잠겨 있습니다. 잠금 해제까지 약 {int(remaining_time.total_seconds() // 60) + 1}분 남았습니다."
+        })
+
+    def verify_password(self, user, password):
+        """
+        simplejwt 의 authenticate() 대신 이미 조회한 user 로 비밀번호를 확인합니다.
+        (해시 알고리즘 변경 등으로 재해싱이 필요한 경우에만 password 컬럼이 저장됩니다.)
+        """
+        self.accept_password(user, user.check_password(password))
+
+    def accept_password(self, user, password_ok):
+        """비밀번호 비교 결과를 받아 로그인 가능 여부를 최종 확인합니다."""
+        if not password_ok or not api_settings.USER_AUTHENTICATION_RULE(user):
+            raise serializers.ValidationError({"detail": INVALID_CREDENTIALS_DETAIL})
+
+        self.user = user
+
+    def build_response(self, user):
+        """스냅샷 하나로 토큰과 응답 본문을 함께 구성합니다."""
+        snapshot = LoginSnapshot(user)
+        refresh = self.get_token(user, snapshot)
+
+        data = {
+            'refresh': str(refresh),
+            'access': str(refresh.access_token),
+        }
+
+        if api_settings.UPDATE_LAST_LOGIN:
+            update_last_login(None, user)
+
+        snapshot.apply_claims(data)
+
+        # 직후의 토큰 재발급(api/token/refresh/)이 DB 를 조회하지 않도록 스냅샷을 저장해 둡니다.
+        ClaimSnapshotCache.set(snapshot)
 
-        token['approval_status'] = has_pending_requests
-        token['approval_list'] = serializer.data
+        return data
 
-        return token
 
+# ----------------------------------------------------------------------
+# 3. 토큰 재발급 Serializer
+# ----------------------------------------------------------------------
+class CachedTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    기본 TokenRefreshSerializer 는 이전 refresh 토큰의 클레임을 그대로 복사하므로
+    email_auth / family_level / 승인 요청 정보가 갱신되지 않습니다.
+
+    이 Serializer 는 ClaimSnapshotCache 의 최신 클레임으로 access / refresh 토큰을 다시 채우며,
+    스냅샷이 캐시에 있으면 DB 를 조회하지 않습니다. (simplejwt 기본 동작의 사용자 조회도 생략)
+    """
+
+    @measure_phase('serializer')
     def validate(self, attrs):
-        # 1. 🔍 이메일을 이용해 사용자 객체를 먼저 가져옵니다.
-        #    사용자 객체를 가져오지 못하면 기본 인증 실패로 처리합니다.
-        email = attrs.get(UserInfo.USERNAME_FIELD)
+        refresh = self.token_class(attrs['refresh'])
+
+        user_id = refresh.payload.get(api_settings.USER_ID_CLAIM, None)
         try:
-            user = UserInfo.objects.get(**{UserInfo.USERNAME_FIELD: email})
+            snapshot = ClaimSnapshotCache.get(user_id)
         except UserInfo.DoesNotExist:
-            # 존재하지 않는 이메일일 경우, 보안을 위해 일반 인증 실패 메시지 반환
-            raise serializers.ValidationError({
-                "detail": "제공된 인증 정보가 유효하지 않습니다. 이메일 또는 비밀번호를 확인해 주세요."
-            })
-
-        # --- 🛡️ 2. is_active 확인 및 잠금 해제/차단 로직 ---
-        if not user.is_active:
-            # 계정이 잠겨 있는 경우 (is_active=False)
-            last_fail_time = user.last_fail_time
-            current_time = timezone.now()
-
-            if last_fail_time and (current_time >= last_fail_time + UNLOCK_DELAY):
-                # 15분 경과: 계정 잠금 해제 및 카운트 초기화
-                with transaction.atomic():
-                    user.is_active = True
-                    user.decryption_fail_count = 0
-                    user.last_fail_time = None
-                    user.save(update_fields=['is_active', 'decryption_fail_count', 'last_fail_time'])
-                    # 계정 잠금 해제 후, 이제 비밀번호 인증 단계로 넘어갑니다.
-            else:
-                # 15분 미경과: 잠금 상태 유지 및 에러 발생 -> 토큰 발급 차단
-                remaining_time = (last_fail_time + UNLOCK_DELAY) - current_time if last_fail_time else UNLOCK_DELAY
-
-                # 명확한 계정 잠금 메시지 반환
-                raise serializers.ValidationError({
-                    "detail": f"해당 계정은 잠겨 있습니다. 잠금 해제까지 약 {int(remaining_time.total_seconds() // 60) + 1}분 남았습니다."
-                })
-        # --- 🛡️ 3. 잠금 해제 로직 종료 ---
-
-        # 4. 🔑 비밀번호 검증 및 토큰 발급 준비 (is_active가 True로 확인/전환된 상태)
-        #    이제 super().validate가 실행되어 비밀번호가 맞는지 확인합니다.
-        try:
-            # super().validate가 성공적으로 실행되면 self.user에 user 객체가 할당됩니다.
-            data = super().validate(attrs)
-        except AuthenticationFailed:
-            # 비밀번호가 틀린 경우에만 이곳으로 옵니다.
-            raise serializers.ValidationError({
-                "detail": "제공된 인증 정보가 유효하지 않습니다. 이메일 또는 비밀번호를 확인해 주세요."
-            })
-
-
-        user = self.user
-        data['user_id'] = user.id
-        data['nick_name'] = user.nick_name
-        #data['oas_auth'] = False
-
-        if hasattr(user, 'email_info'):
-             data['email_auth'] = user.email_info.email_auth
-        else:
-             data['email_auth'] = False
-        data['family_group_id'] = user.family_group_id
-        data['family_level'] = user.family_level
-        # approval(승인 요청)
-        # approval(승인 요청)
-        # 1. PENDING 요청 목록 조회
-        pending_requests = ApprovalRequest.objects.filter(
-            approver=user,
-            status=ApprovalStatus.PENDING
-        ).order_by('requested_at')
-
-        # 2. 요청 존재 여부 확인
-        has_pending_requests = pending_requests.exists()
-
-        # 3. 요청 목록 직렬화
-        # 토큰 페이로드 크기를 줄이기 위해, 필요하다면 경량 Serializer를 정의하여 사용하세요.
-        # 여기서는 ApprovalRequestSerializer를 사용한다고 가정합니다.
-
-        # list를 넣기 때문에 many=True로 설정
-        serializer = ApprovalRequestSerializer(pending_requests, many=True)
-
-        # 4. 토큰 페이로드에 추가
-        # 'family_auth_approval' 대신 의미가 더 명확한 키를 사용하는 것이 좋습니다.
-        # 예: 'pending_approvals' 또는 'approvals_as_master'
-
-        data['approval_status'] = has_pending_requests
-        data['approval_list'] = serializer.data
-
-
-
-        return data
\ No newline at end of file
+            snapshot = None
+
+        if snapshot is None or not snapshot['is_active']:
+            raise AuthenticationFailed(
+                self.error_messages['no_active_account'],
+                'no_active_account',
+            )
+
+        self.apply_snapshot(refresh, snapshot, get_claims_profile())
+
+        # access 토큰은 refresh 토큰의 클레임을 복사해서 만들어집니다.
+        data = {'access': str(refresh.access_token)}
+
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION:
+                try:
+                    refresh.blacklist()
+                except AttributeError:
+                    # blacklist 앱이 설치되지 않은 경우
+                    pass
+
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            refresh.outstand()
+
+            data['refresh'] = str(refresh)
+
+        return data
+
+    @staticmethod
+    def apply_snapshot(token, snapshot, profile):
+        for name, value in snapshot['claims'].items():
+            token[name] = value
+
+        # compact 프로필이면 이전(full) 토큰에 남아 있던 approval_list 도 제거합니다.
+        if profile != CLAIMS_PROFILE_FULL:
+            token.payload.pop('approval_list', None)
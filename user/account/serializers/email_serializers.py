@@ -2,17 +2,22 @@ from rest_framework import serializers
 from rest_framework.exceptions import ValidationError as DRFValidationError
 from django.utils.translation import gettext_lazy as _
 from django.utils import timezone
-from datetime import timedelta
 from django.db import transaction
 import random
-from ..tasks import send_auth_email_task # Celery Task import
+from ..utils.email_templates import KIND_CHANGE
+from ..utils.email_availability import AVAILABLE, MESSAGES as EMAIL_MESSAGES, check_email
+from ..utils.email_delivery import send_email
 
 # .models는 상위 디렉토리의 models.py를 참조하도록 수정 필요
 # 앱 구조에 따라 .models를 사용하거나, 절대 경로 import를 사용해야 합니다.
 from ..models import UserInfo, UserEmail # 🚨 앱 구조에 따라 수정해야 할 수 있음!
+from ..utils.user_loader import UserLoader
+from ..utils.verification_store import (
+    CODE_MISSING, CODE_MISMATCH, PURPOSE_AUTH, PURPOSE_CHANGE, EmailVerification,
+)
 
 
-MAX_ATTEMPTS = 3 # 최대 요청 횟수 (4회 초과 시 잠금)
+MAX_ATTEMPTS = 3 # 최대 요청 횟수 (4회 초과 시 잠금, VERIFICATION_STORE 의 MAX_ATTEMPTS 와 같은 값)
 LOCK_DURATION = 5 # 잠금 시간 (분)
 
 def generate_verification_code():
@@ -32,7 +37,7 @@ class EmailAuthSendSerializer(serializers.Serializer):
         if not request:
             raise DRFValidationError("요청 객체를 context에서 찾을 수 없습니다. View 설정을 확인하세요.")
 
-        user = request.user
+        user = UserLoader.for_request(request)
 
         # 1. 사용자 객체 인증 여부 확인
         if not user.is_authenticated:
@@ -41,69 +46,22 @@ class EmailAuthSendSerializer(serializers.Serializer):
                 code='not_authenticated'
             )
 
-        # 2. UserEmail 객체 조회
-        try:
-            email_info = user.email_info
-        except Exception:
-            raise DRFValidationError(
-                {"detail": "계정에 연결된 인증 정보가 누락되었습니다. 관리자에게 문의해 주세요."},
-                code='missing_email_info'
-            )
+        # 2. UserEmail 객체 조회 (UserLoader 로 사용자와 함께 조회됨, 없으면 생성)
+        email_info = UserLoader.email_info(user)
 
-        # 버그성 이슈 처리 (버그 수정은 별도로 고려해야 하나, 현재 로직은 유지)
-        # 예외 상황 발생
-        # 이슈. email_auth_lock 값이 있으나 email_lock_time 없는 경우 발생
-        #      위 같은 상황이면 계속 해서 잠김 상태로 가게 됨.
-        # TODO.  email_auth_lock, email_lock_time 둘 중에 하나만 있는경우 처리 방안은?
-        #        email_auth_lock True email_lock_time None 경우는 email_auth_lock 해제 하고 처음 부터 하게함
-        #        email_auth_lock False email_lock_time 있는 경우는 email_lock_time 초기화
-        if email_info.email_refresh_count > 3 and email_info.email_auth_lock is True and email_info.email_lock_time is None :
-             print("버그 이슈 email_refresh_count > 3 , email_auth_lock is True,email_lock_time is None ")
-             self.context['email_info'] = email_info
-             return data
-
-        if email_info.email_refresh_count > 3 and email_info.email_auth_lock is False and email_info.email_lock_time is not None :
-             print("버그 이슈 email_refresh_count > 3, email_auth_lock is False,email_lock_time is not None ")
-             self.context['email_info'] = email_info
-             return data
-
-        if email_info.email_refresh_count > 3 and email_info.email_auth_lock is False and email_info.email_lock_time is None :
-             print("버그 이슈 email_refresh_count > 3, email_auth_lock is False,email_lock_time is None ")
-             self.context['email_info'] = email_info
-             return data
-
-
-        # **A. 현재 잠금 상태인지 확인**
-        if email_info.email_auth_lock:
-            # 잠금 해제 조건: 5분이 경과했는지 확인
-            print("email_info.email_auth_lock.")
-            if email_info.email_lock_time and (timezone.now() - email_info.email_lock_time) > timedelta(minutes=5):
-                # 5분 경과: 잠금 해제 가능 상태. View에서 DB 수정 처리
-                print("유효성 검사 통과")
-                self.context['email_info'] = email_info
-                return data
-            else:
-                # 5분 미경과: 여전히 잠금 상태, 오류 발생
-                raise DRFValidationError(
-                    {
-                        "detail": "이메일 재전송 요청 횟수가 초과되어 계정이 잠겼습니다. 5분 후에 다시 시도해 주세요.",
-                        "lock_time": email_info.email_lock_time
-                    },
-                    code='lock_required'
-                )
-
-        # **B. 잠금 필요 조건 검사 (카운트 4회 초과)**
-        if email_info.email_refresh_count > 3:
-            # 잠금 상태로 전환해야 함. View에서 DB 수정 처리
-            print("잠금 상태")
+        # 잠금 상태 확인 (재전송 횟수 / 잠금은 utils/verification_store.py 에 보관, 5분 후 자동 해제)
+        verification = EmailVerification(user.pk, PURPOSE_AUTH)
+        locked_at = verification.locked_at()
+        if locked_at is not None:
             raise DRFValidationError(
                 {
                     "detail": "이메일 재전송 요청 횟수가 초과되어 계정이 잠겼습니다. 5분 후에 다시 시도해 주세요.",
-                    "lock_time": email_info.email_lock_time
+                    "lock_time": locked_at
                 },
                 code='lock_required'
             )
 
+        self.context['verification'] = verification
         self.context['email_info'] = email_info
 
         return data
@@ -122,26 +80,20 @@ class EmailAuthConfirmSerializer(serializers.Serializer):
 
     # ... (기존의 validate 로직은 그대로 유지) ...
     def validate(self, data):
-        user = self.context['request'].user
+        user = UserLoader.for_request(self.context['request'])
         auth_code = data.get('auth_code')
 
         # 1. 사용자 객체 인증 여부 확인
         if not user.is_authenticated:
             raise DRFValidationError({"detail": "로그인이 필요합니다."})
-        # 2. UserEmail 객체 확인
-        try:
-            email_info = user.email_info
-        except UserEmail.DoesNotExist:
-            raise DRFValidationError({"detail": "사용자 이메일 인증 정보가 누락되었습니다."})
-
-        # 3. code 유효 시간 체크
-        if email_info.email_code_date is None:
-            raise DRFValidationError({"detail": "사용자 이메일 인증 정보가 누락되었습니다."})
-        if (timezone.now() - email_info.email_code_date) > timedelta(minutes=5):
-            raise DRFValidationError({"detail": "CODE 유효 시간이 지났습니다.(5분)"})
+        # 2. UserEmail 객체 확인 (없으면 생성)
+        email_info = UserLoader.email_info(user)
 
-        # 4. 인증 코드 일치 여부 확인
-        if not email_info.email_auth_code or email_info.email_auth_code != auth_code:
+        # 3. 인증 코드 확인 (맞으면 저장소에서 삭제되어 다시 사용할 수 없음)
+        result = EmailVerification(user.pk, PURPOSE_AUTH).consume_code(auth_code)
+        if result == CODE_MISSING:
+            raise DRFValidationError({"detail": "CODE 유효 시간이 지났습니다.(5분)"})
+        if result == CODE_MISMATCH:
             raise DRFValidationError({"detail": "인증 코드가 일치하지 않습니다. 다시 확인해 주세요."})
 
         self.context['email_info'] = email_info
@@ -154,78 +106,47 @@ class EmailAuthConfirmSerializer(serializers.Serializer):
 class EmailChangeRequestSerializer(serializers.Serializer):
     new_email = serializers.EmailField(max_length=100)
 
-    @transaction.atomic
     def validate(self, data):
-        user = self.context['request'].user
-        email_info = user.email_info
+        user = UserLoader.for_request(self.context['request'])
         new_email = data.get('new_email')
 
-        # 1. 🛑 잠금 상태 확인 및 처리
-        if email_info.email_reauth_lock:
-            lock_time = email_info.email_reauth_date
-            unlock_time = lock_time + timedelta(minutes=LOCK_DURATION)
-
-            if timezone.now() < unlock_time:
-                remaining_seconds = (unlock_time - timezone.now()).total_seconds()
-                remaining_minutes = int(remaining_seconds // 60)
-                raise DRFValidationError({
-                    "detail": f"이메일 변경 요청 횟수를 초과했습니다. 잠금 해제까지 약 {remaining_minutes + 1}분 남았습니다."
-                })
-            else:
-                # 5분이 지났으므로 잠금 해제 및 횟수 초기화 (DB 반영)
-                email_info.email_reauth_lock = False
-                email_info.email_reauth_count = 0
-                email_info.email_reauth_date = None
-                email_info.save(update_fields=[
-                    'email_reauth_lock', 'email_reauth_count', 'email_reauth_date'
-                ])
-
-
-        # --- 기존 유효성 검사 로직 ---
-        if new_email == user.email:
-            raise DRFValidationError({"detail": "기존 이메일 주소와 동일합니다."})
-
-        if UserInfo.objects.filter(email=new_email).exists():
-            raise DRFValidationError({"detail": "사용 불가 이메일 주소입니다."})
-
-        if UserInfo.objects.filter(new_email=new_email).exclude(pk=user.pk).exists():
-            raise DRFValidationError({"detail": "현재 다른 사용자가 변경 요청 중인 이메일 주소입니다."})
+        # 1. 🛑 잠금 상태 확인 (잠금은 5분 후 저장소에서 자동 만료)
+        verification = EmailVerification(user.pk, PURPOSE_CHANGE)
+        locked_at = verification.locked_at()
+        if locked_at is not None:
+            remaining_seconds = (verification.unlock_time(locked_at) - timezone.now()).total_seconds()
+            remaining_minutes = int(max(remaining_seconds, 0) // 60)
+            raise DRFValidationError({
+                "detail": f"이메일 변경 요청 횟수를 초과했습니다. 잠금 해제까지 약 {remaining_minutes + 1}분 남았습니다."
+            })
+        self.context['verification'] = verification
+
+        # 2. 사용 가능 여부 확인 (현재 email / 다른 사용자 사용 중 / 다른 사용자 변경 요청 중을 쿼리 1번으로)
+        reason = check_email(new_email, user)
+        if reason != AVAILABLE:
+            raise DRFValidationError({"detail": EMAIL_MESSAGES[reason]})
 
         return data
 
     @transaction.atomic
     def save(self, **kwargs):
-        user = self.context['request'].user
+        user = UserLoader.for_request(self.context['request'])
         new_email = self.validated_data['new_email']
-        email_info = user.email_info
+        verification = self.context['verification']
         auth_code = generate_verification_code()
 
-        # 1. UserInfo: 새로운 이메일을 임시 필드에 저장
+        # 1. UserInfo: 새로운 이메일을 임시 필드에 저장 (다른 사용자의 중복 요청 확인에 사용)
         user.new_email = new_email
         user.save(update_fields=['new_email'])
 
-        # 2. UserEmail: 재인증 횟수 확인 및 잠금 (validate()에서 잠금 해제 처리했으므로 여기서는 횟수 증가 및 잠금만)
-        email_info.email_reauth_count += 1
-
-        if email_info.email_reauth_count > MAX_ATTEMPTS:
-            # 💥 4회 초과 시 잠금 설정
-            email_info.email_reauth_lock = True
-            email_info.email_reauth_date = timezone.now()
-            # ❗ save() 로직을 View로 이동하는 것을 고려해 보세요.
-            # Serializer의 save()는 객체 생성/업데이트 역할에 집중하는 것이 좋습니다.
-            email_info.save(update_fields=['email_reauth_lock', 'email_reauth_date', 'email_reauth_count'])
-            # ❗ validate()에서 이미 거부되었으므로 이 로직은 여기에 도달하지 않아야 합니다. (방어적 코딩)
-            # 안전하게 처리하려면 여기서 예외를 발생시켜야 합니다.
-
-        # 3. 코드 업데이트 및 저장
-        email_info.email_auth_code = auth_code
-        email_info.email_code_date = timezone.now()
-        # ❗ 잠금 로직이 validate()에 있다면 여기서는 횟수 증가와 코드 업데이트만 반영
-        email_info.save(update_fields=['email_reauth_count', 'email_auth_code', 'email_code_date'])
+        # 2. 요청 횟수 증가. 4회째 요청이면 잠금 (이번 요청의 코드는 전송)
+        verification.register_attempt()
 
+        # 3. 인증 코드 저장 (5분 후 자동 만료)
+        verification.issue_code(auth_code)
 
         # 4. 이메일 전송
-        send_auth_email_task.delay(new_email, auth_code)
+        send_email(new_email, auth_code, KIND_CHANGE, call_site='email-change-request')
 
         return user
 
@@ -236,62 +157,47 @@ class EmailChangeRequestSerializer(serializers.Serializer):
 class EmailChangeVerifySerializer(serializers.Serializer):
     code = serializers.CharField(max_length=10)
 
-    @transaction.atomic
     def validate(self, data):
-        user = self.context['request'].user
-        user_email_info = user.email_info
+        user = UserLoader.for_request(self.context['request'])
         code_input = data.get('code')
 
-        # 1. 🛑 잠금 상태 확인 및 처리
-        if user_email_info.email_reauth_lock:
-            lock_time = user_email_info.email_reauth_date
-            unlock_time = lock_time + timedelta(minutes=LOCK_DURATION)
-
-            if timezone.now() < unlock_time:
-                remaining_seconds = (unlock_time - timezone.now()).total_seconds()
-                remaining_minutes = int(remaining_seconds // 60)
-                raise DRFValidationError({
-                    "detail": f"이메일 재인증 시도 횟수를 초과했습니다. 잠금 해제까지 약 {remaining_minutes + 1}분 남았습니다."
-                })
-            else:
-                # 5분이 지났으므로 잠금 해제 및 횟수 초기화
-                user_email_info.email_reauth_lock = False
-                user_email_info.email_reauth_count = 0
-                user_email_info.email_reauth_date = None
-                user_email_info.save(update_fields=[
-                    'email_reauth_lock', 'email_reauth_count', 'email_reauth_date'
-                ])
-
-        # 2. 인증 코드 일치 확인 및 횟수/잠금 로직 (인증 실패 시)
-        if user_email_info.email_auth_code != code_input:
-            user_email_info.email_reauth_count += 1
-
-            if user_email_info.email_reauth_count > MAX_ATTEMPTS:
-                user_email_info.email_reauth_lock = True
-                user_email_info.email_reauth_date = timezone.now()
-                user_email_info.save(update_fields=[
-                    'email_reauth_count', 'email_reauth_lock', 'email_reauth_date'
-                ])
+        # 1. 🛑 잠금 상태 확인 (잠금은 5분 후 저장소에서 자동 만료)
+        verification = EmailVerification(user.pk, PURPOSE_CHANGE)
+        locked_at = verification.locked_at()
+        if locked_at is not None:
+            remaining_seconds = (verification.unlock_time(locked_at) - timezone.now()).total_seconds()
+            remaining_minutes = int(max(remaining_seconds, 0) // 60)
+            raise DRFValidationError({
+                "detail": f"이메일 재인증 시도 횟수를 초과했습니다. 잠금 해제까지 약 {remaining_minutes + 1}분 남았습니다."
+            })
+
+        # 2. 인증 코드 확인 (맞으면 저장소에서 삭제되어 다시 사용할 수 없음)
+        result = verification.consume_code(code_input)
+        if result == CODE_MISSING:
+            raise DRFValidationError({"code": "인증 코드가 만료되었습니다. 다시 요청해 주세요."})
+
+        if result == CODE_MISMATCH:
+            count, locked = verification.register_attempt()
+            if locked:
                 raise DRFValidationError({
                     "code": f"인증 코드가 {MAX_ATTEMPTS}회 이상 잘못 입력되어 계정이 {LOCK_DURATION}분 동안 잠금 처리됩니다."
                 })
-            else:
-                user_email_info.save(update_fields=['email_reauth_count'])
-                raise DRFValidationError({
-                    "code": f"인증 코드가 일치하지 않습니다. 남은 시도 횟수: {MAX_ATTEMPTS - user_email_info.email_reauth_count}"
-                })
-
-        # 3. 인증 코드 유효 기간 확인
-        code_age = timezone.now() - user_email_info.email_code_date
-        if code_age.total_seconds() > 300:
-             raise DRFValidationError({"code": "인증 코드가 만료되었습니다. 다시 요청해 주세요."})
+            raise DRFValidationError({
+                "code": f"인증 코드가 일치하지 않습니다. 남은 시도 횟수: {MAX_ATTEMPTS - count}"
+            })
 
         return data
 
     @transaction.atomic
     def save(self):
-        user = self.context['request'].user
-        user_email_info = user.email_info
+        # 인증에 쓴 user 는 캐시에서 풀어낸 값일 수 있으므로, 저장할 행은 잠그고 DB 에서 다시 읽습니다.
+        cached_user = UserLoader.for_request(self.context['request'])
+        user = UserInfo.objects.select_for_update().get(pk=cached_user.pk)
+        user_email_info, _ = UserEmail.objects.select_for_update().get_or_create(user=user)
+
+        if user.new_email is None:
+            # 다른 요청이 먼저 변경을 끝냈거나 요청이 취소된 경우
+            raise DRFValidationError({"detail": "변경 요청된 이메일이 없습니다. 이메일 변경을 다시 요청해 주세요."})
 
         # 1. 이메일 업데이트 (Core Logic)
         user.email = user.new_email
@@ -316,4 +222,8 @@ class EmailChangeVerifySerializer(serializers.Serializer):
         user.new_email = None
         user.save(update_fields=['email', 'new_email'])
 
+        # 4. 저장소의 인증 상태(코드 / 횟수 / 잠금) 초기화
+        EmailVerification(user.pk, PURPOSE_AUTH).reset()
+        EmailVerification(user.pk, PURPOSE_CHANGE).reset()
+
         return user
\ No newline at end of file
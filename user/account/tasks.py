@@ -1,57 +1,84 @@
 
+import time
+
 from celery import shared_task
-from django.core.mail import send_mail # 실제 전송 함수 import
-from django.conf import settings # 설정 정보 import
+from celery.signals import task_postrun, worker_process_shutdown
 from .models import EmailLog
+from .utils.circuit_breaker import backoff_delay, is_provider_error, smtp_circuit
+from .utils.email_dispatcher import EmailBatchQueue, build_auth_email, defer, deliver, enqueue
+from .utils.email_log import get_email_log_buffer, purge_email_logs
+from .utils.email_outbox import purge_relayed, relay_outbox
+from .utils.email_templates import KIND_VERIFY
+from .utils.rate_limiter import LIMIT_RECIPIENT, get_rate_limiter
+from .utils.smtp_pool import get_smtp_pool
 
 
-# bind=True, max_retries, default_retry_delay 설정 유지
-@shared_task(bind=True, max_retries=2, default_retry_delay=60)
-def send_auth_email_task(self, email, code):
-    """실제 이메일 전송 로직이 들어갈 자리입니다."""
-    print(f"📧 이메일 전송 시뮬레이션: {email}에게 인증 코드 {code} 전송됨.")
+# 워커 프로세스 종료 시 풀에 남아 있는 SMTP 연결을 QUIT 으로 정리합니다. (PooledEmailBackend)
+@worker_process_shutdown.connect
+def close_smtp_pool(**kwargs):
+    get_smtp_pool().close_all()
+
+
+# EmailLog 버퍼(utils/email_log.py): 작업이 끝날 때마다 FLUSH_INTERVAL 이 지났는지 확인하고, 프로세스 종료 시 모두 저장합니다.
+@task_postrun.connect
+def flush_email_log_if_due(**kwargs):
+    get_email_log_buffer().flush_if_due()
+
+
+@worker_process_shutdown.connect
+def flush_email_log(**kwargs):
+    get_email_log_buffer().flush()
 
-    subject = "회원가입 이메일 인증 코드"
-    message = f"인증 코드는 {code} 입니다. 5분 내에 입력해 주세요."
-    html_message_template = """
-    <html>
-    <body>
-        <h3 >이메일 인증</h3>
-
-        <p>
-            ℹ️ 인증번호 6자리 <strong>{code}</strong>
-        <br>
-        <p>
-            위 6자리 번호를 입력하여 인증을 완료하세요.<br>
-            <br>
-            <strong>인증번호는 5분간 유효합니다.</strong>
-        </p>
-    </body>
-    </html>
+
+# 메일 / 정리 작업은 결과를 읽는 곳이 없으므로 결과 백엔드(Redis)에 저장하지 않습니다. (ignore_result=True)
+# 반환 문자열은 워커 로그에만 남습니다. 큐는 settings.CELERY_TASK_ROUTES 에서 정합니다.
+
+# 재시도 간격은 고정(default_retry_delay) 대신 지터를 넣은 지수 백오프(utils/circuit_breaker.backoff_delay)를 사용합니다.
+@shared_task(bind=True, max_retries=2, ignore_result=True)
+def send_auth_email_task(self, email, code, kind=KIND_VERIFY, attempt=1):
+    """
+    인증 메일 1통을 보냅니다. (EMAIL_BATCH['ENABLED'] 가 False 일 때)
+    attempt: 실패 후 재시도 횟수 + 1. 브레이커가 열려 미룬 실행은 횟수에 포함하지 않습니다.
     """
-    html_message = html_message_template.format(code=code)
-    from_email = settings.DEFAULT_FROM_EMAIL
-    recipient_list = [email]
+    print(f"📧 이메일 전송 시뮬레이션: {email}에게 인증 코드 {code} 전송됨.")
 
-    try:
-        send_mail(
-            subject,
-            message,
-            from_email,
-            recipient_list,
-            fail_silently=False, # 전송 실패 시 예외 발생
-            html_message=html_message,
+    breaker = smtp_circuit()
+    if not breaker.allow_request():
+        # SMTP 서버 장애 중: 접속하지 않고 워커를 바로 돌려준 뒤, 브레이커가 닫힐 즈음 다시 실행합니다.
+        countdown = breaker.park_delay()
+        print(f"🚧 SMTP 서킷 브레이커 열림, 전송 보류: {email} ({countdown:.0f}초 후)")
+        raise self.retry(args=(email, code, kind), kwargs={'attempt': attempt}, countdown=countdown, max_retries=None)
+
+    decision = get_rate_limiter().acquire(email)
+    if not decision.allowed:
+        if decision.reason == LIMIT_RECIPIENT:
+            get_email_log_buffer().add(
+                email=email,
+                task_id=self.request.id,
+                log_type='RATE_LIMITED',
+                error_message=f"수신자 발송 한도 초과 ({decision.retry_after:.0f}초 후 가능)",
+            )
+            return "이메일 전송 거부: 수신자 발송 한도 초과"
+        # 계정 발송 한도: 토큰이 생길 때 다시 실행합니다. (시도 횟수에 포함하지 않음)
+        raise self.retry(
+            args=(email, code, kind), kwargs={'attempt': attempt}, countdown=decision.retry_after, max_retries=None,
         )
-        return "이메일 전송 성공"
+    if decision.delay:
+        time.sleep(decision.delay)
+
+    try:
+        # 전송 실패 시 예외 발생
+        build_auth_email(email, code, kind).send(fail_silently=False)
     except Exception as exc:
-        # 이메일 전송 실패 시, Celery의 재시도 로직을 따릅니다.
+        if is_provider_error(exc):
+            breaker.record_failure(exc)
 
         # 1. 재시도 횟수 초과 여부 확인
-        if self.request.retries >= self.max_retries:
-            # 2. 최종 실패 시 EmailLog에 기록
+        if attempt > self.max_retries:
+            # 2. 최종 실패 시 EmailLog에 기록 (버퍼에 모았다가 일괄 저장)
             error_msg = str(exc)
 
-            EmailLog.objects.create(
+            get_email_log_buffer().add(
                 email=email,
                 task_id=self.request.id, # 현재 Celery Task ID 기록
                 log_type='FINAL_FAILURE',
@@ -61,7 +88,133 @@ def send_auth_email_task(self, email, code):
 
             return "이메일 전송 최종 실패"
 
-        else:
-            # 3. 재시도 횟수가 남았으면 Celery에게 재시도를 요청합니다.
-            print(f"⚠️ 이메일 전송 실패, 재시도 요청: {email} (현재 시도 {self.request.retries + 1}/{self.max_retries + 1})")
-            raise self.retry(exc=exc)
\ No newline at end of file
+        # 3. 재시도 횟수가 남았으면 백오프 후 재시도합니다.
+        countdown = backoff_delay(attempt)
+        print(f"⚠️ 이메일 전송 실패, 재시도 요청: {email} (현재 시도 {attempt}/{self.max_retries + 1}, {countdown:.0f}초 후)")
+        raise self.retry(
+            exc=exc, args=(email, code, kind), kwargs={'attempt': attempt + 1}, countdown=countdown, max_retries=None,
+        )
+
+    breaker.record_success()
+    return "이메일 전송 성공"
+
+
+@shared_task(bind=True, ignore_result=True)
+def flush_email_batch_task(self):
+    """
+    대기열(utils/email_dispatcher.py)에 모인 인증 메일을 한 번에 보냅니다. (EMAIL_BATCH['ENGINE'])
+    수신자별 결과를 EmailLog 에 기록하고, 실패한 수신자만 백오프 후 다시 보내도록 대기열에 넣습니다.
+    SMTP 서킷 브레이커가 열려 있으면 대기열을 꺼내지 않고 flush 를 미룹니다.
+    """
+    queue = EmailBatchQueue()
+    # 지금부터 들어오는 메일은 다음 flush 로 예약되도록 합니다.
+    queue.clear_scheduled()
+
+    breaker = smtp_circuit()
+    if not len(queue):
+        return "이메일 일괄 전송: 대기열 없음"
+    if not breaker.allow_request():
+        countdown = breaker.park_delay()
+        if queue.mark_scheduled():
+            flush_email_batch_task.apply_async(countdown=countdown)
+        return f"이메일 일괄 전송 보류: SMTP 서킷 브레이커 열림 ({countdown:.0f}초 후)"
+
+    items, last = queue.claim_batch()
+    if last is None:
+        # 다른 워커가 보내는 중이면 (또는 보내다 죽은 워커의 잠금이 남아 있으면) 다음 WINDOW 에 다시 확인합니다.
+        if queue.mark_scheduled():
+            flush_email_batch_task.apply_async(countdown=queue.window)
+        return "이메일 일괄 전송 보류: 다른 워커가 전송 중"
+
+    try:
+        result = deliver(items)
+        if result.sent:
+            breaker.record_success()
+        elif result.provider_error:
+            breaker.record_failure(result.provider_error)
+
+        logs = [EmailLog(email=item['email'], task_id=self.request.id, log_type='SUCCESS') for item in result.sent]
+        for item, error_msg in result.failed:
+            final = item['attempt'] >= queue.max_attempts
+            logs.append(EmailLog(
+                email=item['email'],
+                task_id=self.request.id,
+                log_type='FINAL_FAILURE' if final else 'FAILURE',
+                error_message=error_msg,
+            ))
+            if final:
+                print(f"🚨 이메일 전송 최종 실패 및 로그 기록: {item['email']} - {error_msg}")
+            else:
+                print(f"⚠️ 이메일 전송 실패, 재시도 요청: {item['email']} (현재 시도 {item['attempt']}/{queue.max_attempts})")
+                defer([dict(item, attempt=item['attempt'] + 1)], backoff_delay(item['attempt']))
+
+        # 발송 한도: 수신자 한도는 보내지 않고 기록만, 계정 한도는 시도 횟수를 늘리지 않고 토큰이 생길 때 다시 보냅니다.
+        global_limited, retry_after = [], 0
+        for item, decision in result.limited:
+            if decision.reason == LIMIT_RECIPIENT:
+                logs.append(EmailLog(
+                    email=item['email'],
+                    task_id=self.request.id,
+                    log_type='RATE_LIMITED',
+                    error_message=f"수신자 발송 한도 초과 ({decision.retry_after:.0f}초 후 가능)",
+                ))
+            else:
+                global_limited.append(item)
+                retry_after = max(retry_after, decision.retry_after)
+        # 계정 한도로 남은 메일은 같은 시각에 다시 보낼 수 있으므로 작업 하나로 미룹니다.
+        defer(global_limited, retry_after)
+
+        # 보내고 재시도 / 한도 메일을 넘긴 뒤에만 대기열에서 지웁니다. (그 전에 워커가 죽으면 다음 flush 가 다시 보냄)
+        queue.ack(last)
+    finally:
+        queue.release()
+
+    # 묶음 결과는 바로 저장합니다. (버퍼에 남아 있던 단건 작업 로그도 같은 INSERT 로 함께 저장)
+    buffer = get_email_log_buffer()
+    buffer.extend(logs)
+    buffer.flush()
+
+    # 한 번에 다 보내지 못했으면 이어서 보냅니다.
+    if len(queue) and queue.mark_scheduled():
+        flush_email_batch_task.apply_async(countdown=0 if len(queue) >= queue.max_size else queue.window)
+
+    return f"이메일 일괄 전송: 성공 {len(result.sent)}, 실패 {len(result.failed)}, 한도 {len(result.limited)}"
+
+
+@shared_task(ignore_result=True)
+def requeue_email_task(items):
+    """
+    재시도 백오프 / 계정 발송 한도로 미룬 메일을 기다린 시간이 지난 뒤 대기열에 넣습니다. (utils/email_dispatcher.defer)
+    """
+    for item in items:
+        enqueue(item)
+    return f"이메일 재전송 대기열 추가: {len(items)}"
+
+
+@shared_task(ignore_result=True)
+def relay_email_outbox_task(max_rounds=10):
+    """
+    커밋된 아웃박스 행(EmailOutbox)을 일괄 전송 대기열로 옮깁니다.
+    커밋 직후(utils/email_outbox.kick_relay)와 주기 작업(CELERY_BEAT_SCHEDULE)에서 실행됩니다.
+    """
+    relayed = 0
+    for _ in range(max_rounds):
+        count = relay_outbox()
+        relayed += count
+        if not count:
+            break
+
+    purged = purge_relayed()
+    return f"이메일 아웃박스 전달: {relayed}, 정리: {purged}"
+
+
+@shared_task(ignore_result=True)
+def purge_email_logs_task():
+    """
+    보관 기간(EMAIL_LOG['RETENTION_DAYS'])이 지난 EmailLog 를 청크 단위로 삭제합니다. (CELERY_BEAT_SCHEDULE)
+    한 번에 PURGE_MAX_CHUNKS 까지만 지우고, 남아 있으면 이어서 실행되도록 다시 예약합니다.
+    """
+    deleted, remaining = purge_email_logs()
+    if remaining:
+        purge_email_logs_task.apply_async(countdown=1)
+    return f"이메일 로그 정리: {deleted}건{' (이어서 정리)' if remaining else ''}"
@@ -1,3 +1,1599 @@
-from django.test import TestCase
+import json
+import os
+import tempfile
+import threading
+import smtplib
+import time
+from datetime import timedelta
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.mail import EmailMessage, get_connection
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from .email_backend import CustomEmailBackend
+from .models import EmailLog, EmailOutbox, SMTPCircuitState, UserInfo, UserEmail
+from .hashers import ProfiledPBKDF2PasswordHasher
+from .utils.hashing_pool import HashingPool
+from .tasks import (
+    flush_email_batch_task, purge_email_logs_task, relay_email_outbox_task, requeue_email_task, send_auth_email_task,
+)
+from .utils.async_smtp import AsyncDeliveryEngine
+from .utils.circuit_breaker import STATE_CLOSED, STATE_OPEN, SMTPCircuitBreaker, backoff_delay
+from .utils.email_availability import (
+    AVAILABLE, MESSAGES as EMAIL_MESSAGES, REASON_PENDING, REASON_SAME, REASON_TAKEN, availability_queryset, check_email,
+)
+from .utils.email_delivery import SynchronousEmailError, guard_sync_smtp, send_email
+from .utils.email_dispatcher import EmailBatchQueue, build_auth_email, enqueue
+from .utils.email_templates import KIND_APPROVAL, KIND_CHANGE, KIND_VERIFY, CompiledString, get_template, render
+from .utils.email_log import EmailLogBuffer, purge_email_logs
+from .utils.email_outbox import queue_auth_email, relay_outbox
+from .utils.lockout import LockoutEngine
+from .utils.provisioning import provision_users, read_rows
+from .utils.rate_limiter import LIMIT_GLOBAL, LIMIT_RECIPIENT, EmailRateLimiter, TokenBucket, get_rate_limiter
+from .utils.smtp_pool import get_smtp_pool, reset_smtp_pool
+from .utils.smtp_sink import SMTPSink
+from .utils.claim_snapshot import ClaimSnapshotCache
+from .utils.user_cache import UserAuthCache
+from .utils.user_loader import UserLoader
+from .utils.verification_store import (
+    PURPOSE_AUTH, PURPOSE_CHANGE, EmailVerification, MemoryVerificationStore, CacheVerificationStore,
+)
+from approval.models import ApprovalRequest, RequestType
+from log_events.metrics import measure_request, timings
+
+# 테스트 속도를 위해 가벼운 해시 알고리즘을 사용합니다.
+FAST_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+
+# ----------------------------------------------------------------------
+# 1. 로그인 (api/token) 파이프라인
+# ----------------------------------------------------------------------
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class LoginPipelineTests(TestCase):
+    PASSWORD = 'oasis-test-pw!1'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.master = UserInfo.objects.create_user(
+            email='master@oasiss.co.kr', nick_name='master', password=cls.PASSWORD,
+            family_level='master', family_group_id='fam_1'
+        )
+        for i in range(3):
+            requestee = UserInfo.objects.create_user(
+                email=f'member{i}@oasiss.co.kr', nick_name=f'member{i}', password=cls.PASSWORD
+            )
+            ApprovalRequest.objects.create(
+                requestee=requestee, approver=cls.master, request_type=RequestType.GROUP_JOIN
+            )
+
+    def login(self, email, password=None):
+        return self.client.post(
+            reverse('token_obtain_pair'),
+            {'email': email, 'password': password or self.PASSWORD},
+            content_type='application/json'
+        )
+
+    def test_login_query_budget(self):
+        # 사용자 + email_info 1회, PENDING 승인 요청 1회
+        with self.assertNumQueries(2):
+            response = self.login(self.master.email)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data['approval_status'])
+        self.assertEqual(len(response.data['approval_list']), 3)
+
+    @override_settings(JWT_CLAIMS_PROFILE='full')
+    def test_full_profile_token_matches_response_body(self):
+        response = self.login(self.master.email)
+        token = AccessToken(response.data['access'])
+
+        for claim in ('user_id', 'nick_name', 'email_auth', 'family_group_id',
+                      'family_level', 'approval_status', 'approval_list'):
+            self.assertEqual(token[claim], response.data[claim], claim)
+
+    @override_settings(JWT_CLAIMS_PROFILE='compact')
+    def test_compact_profile_omits_approval_list(self):
+        response = self.login(self.master.email)
+        token = AccessToken(response.data['access'])
+
+        self.assertNotIn('approval_list', token.payload)
+        self.assertTrue(token['approval_status'])
+        self.assertEqual(token['approval_count'], 3)
+        self.assertEqual(token['claims_version'], response.data['claims_version'])
+        # 응답 본문은 계속 전체 목록을 포함합니다.
+        self.assertEqual(len(response.data['approval_list']), 3)
+
+    def test_login_without_pending_requests(self):
+        with self.assertNumQueries(2):
+            response = self.login('member0@oasiss.co.kr')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.data['approval_status'])
+        self.assertEqual(response.data['approval_list'], [])
+
+    def test_wrong_password_is_rejected(self):
+        response = self.login(self.master.email, 'wrong-password')
+        self.assertEqual(response.status_code, 400)
+
+    def test_unknown_email_is_rejected(self):
+        response = self.login('nobody@oasiss.co.kr')
+        self.assertEqual(response.status_code, 400)
+
+
+# ----------------------------------------------------------------------
+# 2. JWT 인증 사용자 캐시
+# ----------------------------------------------------------------------
+class CachedJWTAuthenticationTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserInfo.objects.create_user(email='cache@oasiss.co.kr', nick_name='cache')
+
+    def setUp(self):
+        # 테스트 간 DB 는 롤백되지만 캐시는 남아 있으므로 비워 줍니다.
+        cache.clear()
+        UserAuthCache.clear_local()
+        self.auth = {'HTTP_AUTHORIZATION': f'Bearer {RefreshToken.for_user(self.user).access_token}'}
+        self.url = reverse('check-pending-approvals')
+
+    def test_second_request_skips_user_query(self):
+        # 첫 요청: 사용자(+email_info) 1회 + 승인 요청 2회
+        with self.assertNumQueries(3):
+            self.client.get(self.url, **self.auth)
+        # 두 번째 요청: 사용자 조회 없음
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url, **self.auth)
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_cached_user_carries_email_info(self):
+        UserAuthCache.get(self.user.pk)
+
+        with self.assertNumQueries(0):
+            user = UserAuthCache.get(self.user.pk)
+            self.assertFalse(user.email_info.email_auth)
+
+    def test_password_hash_is_not_cached(self):
+        user = UserInfo.objects.create_user(email='secret@oasiss.co.kr', nick_name='secret', password='pw-1234')
+        UserAuthCache.get(user.pk)
+
+        payload = UserAuthCache.shared().get(UserAuthCache.key(user.pk))
+        self.assertNotIn(user.password.encode(), payload)
+
+        cached = UserAuthCache.get(user.pk)
+        self.assertEqual(cached.get_deferred_fields(), {'password'})
+        # 캐시에서 꺼낸 user 로 저장해도 password 는 그대로입니다.
+        cached.nick_name = 'renamed'
+        cached.save()
+        # password 를 읽으면 DB 에서 다시 조회합니다.
+        with self.assertNumQueries(1):
+            self.assertTrue(cached.check_password('pw-1234'))
+        self.assertTrue(UserInfo.objects.get(pk=user.pk).check_password('pw-1234'))
+
+    def test_save_invalidates_cache(self):
+        UserAuthCache.get(self.user.pk)
+
+        email_info = self.user.email_info
+        email_info.email_auth = True
+        email_info.save()
+
+        with self.assertNumQueries(1):
+            self.assertTrue(UserAuthCache.get(self.user.pk).email_info.email_auth)
+
+    def test_invalidate_runs_again_after_commit(self):
+        stale = UserAuthCache.get(self.user.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            email_info = UserEmail.objects.get(user=self.user)
+            email_info.email_auth = True
+            email_info.save()
+            # 커밋 전에 다른 요청이 이전 행으로 캐시를 다시 채운 경우
+            UserAuthCache.set(stale)
+
+        self.assertIsNone(UserAuthCache.shared().get(UserAuthCache.key(self.user.pk)))
+        self.assertTrue(UserAuthCache.get(self.user.pk).email_info.email_auth)
+
+    def test_inactive_user_is_rejected(self):
+        self.user.is_active = False
+        self.user.save()
+
+        response = self.client.get(self.url, **self.auth)
+
+        self.assertEqual(response.status_code, 401)
+
+
+# ----------------------------------------------------------------------
+# 3. 비동기 로그인 / 회원가입 (해시 프로세스 풀)
+# ----------------------------------------------------------------------
+def thread_backed_pool(max_workers=1, max_queue=0):
+    # 테스트에서는 프로세스 대신 스레드 풀로 같은 흐름을 검증합니다.
+    pool = HashingPool(max_workers, max_queue)
+    pool._executor = ThreadPoolExecutor(max_workers)
+    pool._pid = os.getpid()
+    return pool
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class AsyncLoginRegistrationTests(TestCase):
+    PASSWORD = 'oasis-test-pw!1'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserInfo.objects.create_user(
+            email='async@oasiss.co.kr', nick_name='async', password=cls.PASSWORD
+        )
+
+    def setUp(self):
+        self.pool = thread_backed_pool()
+        patcher = mock.patch('account.views.get_hashing_pool', return_value=self.pool)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.pool.shutdown)
+
+    async def test_async_login(self):
+        response = await self.async_client.post(
+            reverse('token_obtain_pair_async'),
+            {'email': self.user.email, 'password': self.PASSWORD},
+            content_type='application/json'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['user_id'], self.user.id)
+        self.assertIn('access', response.json())
+
+    async def test_async_login_wrong_password(self):
+        response = await self.async_client.post(
+            reverse('token_obtain_pair_async'),
+            {'email': self.user.email, 'password': 'wrong-password'},
+            content_type='application/json'
+        )
+
+        self.assertEqual(response.status_code, 400)
+
+    async def test_saturated_pool_returns_503(self):
+        self.pool._in_flight = self.pool.capacity
+
+        response = await self.async_client.post(
+            reverse('token_obtain_pair_async'),
+            {'email': self.user.email, 'password': self.PASSWORD},
+            content_type='application/json'
+        )
+
+        self.assertEqual(response.status_code, 503)
+
+    async def test_async_registration(self):
+        response = await self.async_client.post(
+            reverse('user-register-async'),
+            {'email': 'new@oasiss.co.kr', 'nick_name': 'new',
+             'password1': 'Secure-pass!234', 'password2': 'Secure-pass!234'},
+            content_type='application/json'
+        )
+
+        self.assertEqual(response.status_code, 201)
+        user = await UserInfo.objects.aget(email='new@oasiss.co.kr')
+        self.assertTrue(user.check_password('Secure-pass!234'))
+
+
+# ----------------------------------------------------------------------
+# 4. 계정 잠금 카운터 (캐시)
+# ----------------------------------------------------------------------
+class LockoutEngineTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserInfo.objects.create_user(email='lock@oasiss.co.kr', nick_name='lock')
+
+    def setUp(self):
+        cache.clear()
+        self.engine = LockoutEngine('test', max_attempts=4, window=60)
+
+    def test_failures_below_limit_do_not_write_user_row(self):
+        with self.assertNumQueries(0):
+            for _ in range(3):
+                result = self.engine.register_failure(self.user)
+
+        self.assertEqual(result.count, 3)
+        self.assertFalse(result.locked)
+
+    def test_lock_is_written_once_when_tripped(self):
+        for _ in range(3):
+            self.engine.register_failure(self.user)
+
+        with self.assertNumQueries(1):
+            result = self.engine.register_failure(self.user)
+        self.assertTrue(result.tripped)
+
+        with self.assertNumQueries(0):
+            result = self.engine.register_failure(self.user)
+        self.assertTrue(result.locked)
+        self.assertFalse(result.tripped)
+
+        self.user.refresh_from_db()
+        self.assertFalse(self.user.is_active)
+
+    def test_concurrent_failures_trip_exactly_once(self):
+        workers, attempts = 16, 200
+
+        # 스레드에서는 테스트 트랜잭션의 행이 보이지 않으므로 조건부 UPDATE 를 잠금으로 흉내 냅니다.
+        active, guard = [True], threading.Lock()
+
+        def lock_account(user, count):
+            with guard:
+                locked, active[0] = active[0], False
+            user.is_active = False
+            return locked
+
+        with mock.patch.object(LockoutEngine, 'lock_account', side_effect=lock_account):
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(
+                    lambda _: self.engine.register_failure(self.user), range(attempts)
+                ))
+
+        self.assertEqual(sum(r.tripped for r in results), 1)
+        self.assertEqual(sorted(r.count for r in results), list(range(1, attempts + 1)))
+        self.assertEqual(self.engine.failure_count(self.user), attempts)
+
+    def test_reactivated_account_is_locked_again(self):
+        for _ in range(4):
+            self.engine.register_failure(self.user)
+        # 관리자가 카운터가 남아 있는 동안 다시 활성화
+        user = UserInfo.objects.get(pk=self.user.pk)
+        user.is_active = True
+        user.save(update_fields=['is_active'])
+
+        result = self.engine.register_failure(user)
+
+        self.assertTrue(result.tripped)
+        self.assertFalse(UserInfo.objects.get(pk=self.user.pk).is_active)
+
+    def test_reset_clears_counter(self):
+        self.engine.register_failure(self.user)
+        self.engine.reset(self.user)
+
+        self.assertEqual(self.engine.failure_count(self.user), 0)
+
+
+# ----------------------------------------------------------------------
+# 5. 비밀번호 해시 비용 프로필 / 재해싱
+# ----------------------------------------------------------------------
+@override_settings(
+    PASSWORD_HASHERS=['account.hashers.ProfiledPBKDF2PasswordHasher'],
+    PASSWORD_HASH_ITERATIONS=1000
+)
+class PasswordRehashTests(TestCase):
+    PASSWORD = 'oasis-test-pw!1'
+
+    def create_user(self, iterations):
+        hasher = ProfiledPBKDF2PasswordHasher()
+        encoded = hasher.encode(self.PASSWORD, hasher.salt(), iterations=iterations)
+        return UserInfo.objects.create_user_with_hash(
+            email='hash@oasiss.co.kr', nick_name='hash', password_hash=encoded
+        )
+
+    def login(self):
+        return self.client.post(
+            reverse('token_obtain_pair'),
+            {'email': 'hash@oasiss.co.kr', 'password': self.PASSWORD},
+            content_type='application/json'
+        )
+
+    def test_old_cost_is_rehashed_on_login(self):
+        user = self.create_user(iterations=2000)
+
+        # 사용자 조회, 재해싱 저장, 승인 요청 조회
+        with self.assertNumQueries(3):
+            self.assertEqual(self.login().status_code, 200)
+
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith('pbkdf2_sha256$1000$'))
+
+    def test_current_cost_is_not_saved_again(self):
+        user = self.create_user(iterations=1000)
+        encoded = user.password
+
+        with self.assertNumQueries(2):
+            self.assertEqual(self.login().status_code, 200)
+
+        user.refresh_from_db()
+        self.assertEqual(user.password, encoded)
+
+    @override_settings(PASSWORD_HASH_ITERATIONS=None, PASSWORD_HASH_PROFILE='low')
+    def test_profile_selects_iterations(self):
+        self.assertEqual(ProfiledPBKDF2PasswordHasher().iterations, 320_000)
+
+
+# ----------------------------------------------------------------------
+# 6. 사용자 로더 (엔드포인트별 쿼리 수)
+# ----------------------------------------------------------------------
+@mock.patch('account.utils.email_delivery.queue_auth_email')
+class UserLoaderQueryBudgetTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserInfo.objects.create_user(email='loader@oasiss.co.kr', nick_name='loader')
+
+    def setUp(self):
+        cache.clear()
+        UserAuthCache.clear_local()
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+
+    def set_code(self, code='123456', purpose=PURPOSE_AUTH):
+        EmailVerification(self.user.pk, purpose).issue_code(code)
+
+    def test_loader_fetches_email_info_in_one_query(self, *mocks):
+        with self.assertNumQueries(1):
+            user = UserLoader.get(pk=self.user.pk)
+            self.assertFalse(UserLoader.email_info(user).email_auth)
+            self.assertTrue(UserLoader.is_loaded(user))
+
+    def test_email_auth_send(self, *mocks):
+        # 사용자(+email_info) 1회 (코드 / 횟수는 인증 상태 저장소에 기록)
+        with self.assertNumQueries(1):
+            response = self.client.post(reverse('email-auth-send'))
+        self.assertEqual(response.status_code, 200)
+
+    def test_email_auth_confirm(self, *mocks):
+        self.set_code()
+        # 사용자(+email_info) 1회, savepoint 2회, email_info 잠금 조회 / 저장 2회
+        with self.assertNumQueries(5):
+            response = self.client.post(reverse('email-auth-confirm'), {'auth_code': '123456'})
+        self.assertEqual(response.status_code, 200)
+
+    def test_email_change_request(self, *mocks):
+        # 사용자(+email_info) 1회, 사용 가능 여부 확인 1회(utils/email_availability.py), savepoint 2회, new_email 저장 1회
+        with self.assertNumQueries(5):
+            response = self.client.post(reverse('email_change_request'), {'new_email': 'new@oasiss.co.kr'})
+        self.assertEqual(response.status_code, 200)
+
+    def test_email_change_verify(self, *mocks):
+        self.set_code(purpose=PURPOSE_CHANGE)
+        UserInfo.objects.filter(pk=self.user.pk).update(new_email='new@oasiss.co.kr')
+        # 사용자(+email_info) 1회, savepoint 2회, user / email_info 잠금 조회 2회, 저장 2회
+        with self.assertNumQueries(7):
+            response = self.client.post(reverse('email_change_verify'), {'code': '123456'})
+        self.assertEqual(response.status_code, 200)
+
+    def test_email_change_verify_uses_current_row_not_cached_user(self, *mocks):
+        # 캐시에는 new_email 이 없는 사용자가 남아 있고, DB 에는 변경 요청이 저장된 경우 (시그널 없이 갱신)
+        UserAuthCache.get(self.user.pk)
+        UserInfo.objects.filter(pk=self.user.pk).update(new_email='fresh@oasiss.co.kr')
+        self.set_code(purpose=PURPOSE_CHANGE)
+
+        response = self.client.post(reverse('email_change_verify'), {'code': '123456'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(UserInfo.objects.get(pk=self.user.pk).email, 'fresh@oasiss.co.kr')
+
+    def test_email_change_verify_without_request_is_rejected(self, *mocks):
+        self.set_code(purpose=PURPOSE_CHANGE)
+
+        response = self.client.post(reverse('email_change_verify'), {'code': '123456'})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(UserInfo.objects.get(pk=self.user.pk).email, 'loader@oasiss.co.kr')
+
+    def test_email_auth_confirm_increments_current_count(self, *mocks):
+        UserAuthCache.get(self.user.pk)
+        # 캐시된 email_info 는 0 이지만 다른 요청이 이미 증가시킨 경우
+        UserEmail.objects.filter(user=self.user).update(email_auth_count=4)
+        self.set_code()
+
+        self.client.post(reverse('email-auth-confirm'), {'auth_code': '123456'})
+
+        self.assertEqual(UserEmail.objects.get(user=self.user).email_auth_count, 5)
+
+    def test_force_authenticated_user_is_loaded_once(self, *mocks):
+        # 캐시를 거치지 않은 사용자도 로더가 email_info 를 함께 1회만 조회합니다.
+        self.client.credentials()
+        self.client.force_authenticate(UserInfo.objects.get(pk=self.user.pk))
+        self.set_code()
+
+        # 사용자(+email_info) 1회, savepoint 2회, email_info 잠금 조회 / 저장 2회
+        with self.assertNumQueries(5):
+            response = self.client.post(reverse('email-auth-confirm'), {'auth_code': '123456'})
+        self.assertEqual(response.status_code, 200)
+
+
+# ----------------------------------------------------------------------
+# 7. 토큰 재발급 (클레임 스냅샷)
+# ----------------------------------------------------------------------
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class ClaimSnapshotRefreshTests(TestCase):
+    PASSWORD = 'oasis-test-pw!1'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.master = UserInfo.objects.create_user(
+            email='refresh@oasiss.co.kr', nick_name='refresh', password=cls.PASSWORD,
+            family_level='master', family_group_id='fam_1'
+        )
+        cls.member = UserInfo.objects.create_user(
+            email='refresh-member@oasiss.co.kr', nick_name='member', password=cls.PASSWORD
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def login(self):
+        response = self.client.post(
+            reverse('token_obtain_pair'),
+            {'email': self.master.email, 'password': self.PASSWORD},
+            content_type='application/json'
+        )
+        return response.data['refresh']
+
+    def refresh(self, token):
+        return self.client.post(reverse('token_refresh'), {'refresh': token}, content_type='application/json')
+
+    def test_refresh_after_login_hits_no_database(self):
+        token = self.login()
+
+        with self.assertNumQueries(0):
+            response = self.refresh(token)
+
+        self.assertEqual(response.status_code, 200)
+        access = AccessToken(response.data['access'])
+        self.assertEqual(access['user_id'], self.master.pk)
+        self.assertEqual(access['family_level'], 'master')
+        self.assertIn('refresh', response.data)
+
+    def test_email_auth_change_is_reflected(self):
+        token = self.login()
+        self.assertFalse(RefreshToken(token)['email_auth'])
+
+        email_info = self.master.email_info
+        email_info.email_auth = True
+        email_info.save()
+
+        # 스냅샷 재생성: 사용자(+email_info) 1회, PENDING 승인 요청 1회
+        with self.assertNumQueries(2):
+            response = self.refresh(token)
+
+        self.assertTrue(AccessToken(response.data['access'])['email_auth'])
+        self.assertTrue(RefreshToken(response.data['refresh'])['email_auth'])
+
+    def test_new_approval_request_is_reflected(self):
+        token = self.login()
+        self.assertEqual(ClaimSnapshotCache.get(self.master.pk)['claims']['approval_count'], 0)
+
+        ApprovalRequest.objects.create(
+            requestee=self.member, approver=self.master, request_type=RequestType.GROUP_JOIN
+        )
+        access = AccessToken(self.refresh(token).data['access'])
+
+        self.assertEqual(access['approval_count'], 1)
+        self.assertTrue(access['approval_status'])
+        self.assertEqual(ClaimSnapshotCache.get(self.master.pk)['claims']['approval_count'], 1)
+
+    @override_settings(JWT_CLAIMS_PROFILE='full')
+    def test_compact_profile_drops_stale_approval_list(self):
+        token = self.login()
+        self.assertIn('approval_list', RefreshToken(token).payload)
+
+        with override_settings(JWT_CLAIMS_PROFILE='compact'):
+            response = self.refresh(token)
+
+        self.assertNotIn('approval_list', AccessToken(response.data['access']).payload)
+
+    def test_inactive_user_cannot_refresh(self):
+        token = self.login()
+        self.master.is_active = False
+        self.master.save()
+
+        self.assertEqual(self.refresh(token).status_code, 401)
+
+
+# ----------------------------------------------------------------------
+# 8. SMTP 연결 풀 (PooledEmailBackend)
+# ----------------------------------------------------------------------
+class PooledEmailBackendTests(TestCase):
+
+    def setUp(self):
+        self.sink = SMTPSink().start()
+        self.addCleanup(self.sink.stop)
+        reset_smtp_pool()
+        self.addCleanup(reset_smtp_pool)
+
+    def send(self, to='member@oasiss.co.kr', **kwargs):
+        connection = get_connection(
+            'account.email_backend.PooledEmailBackend',
+            host=self.sink.host, port=self.sink.port, use_tls=False, username='', password='', **kwargs
+        )
+        return EmailMessage('인증 코드', '123456', 'noreply@oasiss.co.kr', [to], connection=connection).send()
+
+    def test_connection_is_reused_between_sends(self):
+        for _ in range(3):
+            self.assertEqual(self.send(), 1)
+
+        self.assertEqual(self.sink.message_count, 3)
+        self.assertEqual(self.sink.connection_count, 1)
+        self.assertEqual(get_smtp_pool().stats['reused'], 2)
+
+    def test_reconnects_when_server_dropped_connection(self):
+        self.send()
+        self.sink.drop_connections()
+
+        self.assertEqual(self.send(), 1)
+        self.assertEqual(self.sink.message_count, 2)
+        self.assertEqual(self.sink.connection_count, 2)
+        self.assertEqual(get_smtp_pool().stats['discarded'], 1)
+
+    def test_timeout_after_data_is_not_resent(self):
+        self.send(timeout=0.2)
+        # 서버는 본문을 받았지만 250 응답이 클라이언트 타임아웃보다 늦습니다.
+        self.sink.data_latency = 0.5
+
+        # smtplib 은 응답 대기 타임아웃을 SMTPServerDisconnected 로 바꿔 올립니다.
+        with self.assertRaises(smtplib.SMTPServerDisconnected):
+            self.send(timeout=0.2)
+        time.sleep(0.5)
+
+        self.assertEqual(self.sink.message_count, 2)
+        self.assertEqual(self.sink.connection_count, 1)
+        self.assertEqual(get_smtp_pool().stats['discarded'], 1)
+
+    def test_failed_reconnect_raises_unless_fail_silently(self):
+        self.send()
+        self.sink.drop_connections()
+
+        with mock.patch.object(CustomEmailBackend, 'open', return_value=False):
+            with self.assertRaises(smtplib.SMTPServerDisconnected):
+                self.send()
+        self.assertEqual(self.sink.message_count, 1)
+
+    @override_settings(EMAIL_CONNECTION_POOL={'MAX_IDLE': 0})
+    def test_idle_connection_is_recycled(self):
+        reset_smtp_pool()
+        self.send()
+        self.send()
+
+        self.assertEqual(self.sink.message_count, 2)
+        self.assertEqual(self.sink.connection_count, 2)
+        self.assertEqual(get_smtp_pool().stats['recycled'], 1)
+
+
+def requeue_immediately(testcase):
+    """requeue_email_task 를 예약하지 않고 바로 실행합니다. (백오프 / 한도 대기 시간이 지난 것으로 봄)"""
+    patcher = mock.patch(
+        'account.tasks.requeue_email_task.apply_async',
+        side_effect=lambda args, countdown: requeue_email_task(*args),
+    )
+    patcher.start()
+    testcase.addCleanup(patcher.stop)
+
+
+# ----------------------------------------------------------------------
+# 9. 인증 메일 일괄 전송 (email_dispatcher)
+# ----------------------------------------------------------------------
+# WINDOW 예약 작업은 실행하지 않고, flush 를 직접 호출합니다.
+@mock.patch('account.tasks.flush_email_batch_task.apply_async')
+class EmailBatchDispatcherTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        requeue_immediately(self)
+        self.sink = SMTPSink(reject_recipients={'bad@oasiss.co.kr'}).start()
+        self.addCleanup(self.sink.stop)
+        overrides = override_settings(
+            EMAIL_BACKEND='django.core.mail.backends.smtp.EmailBackend',
+            EMAIL_HOST=self.sink.host, EMAIL_PORT=self.sink.port,
+            EMAIL_USE_TLS=False, EMAIL_USE_SSL=False, EMAIL_HOST_USER='', EMAIL_HOST_PASSWORD='',
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+
+    @staticmethod
+    def enqueue(email, code, kind=KIND_VERIFY):
+        enqueue({'email': email, 'code': code, 'kind': kind, 'attempt': 1})
+
+    def test_queued_messages_are_sent_over_one_connection(self, apply_async):
+        self.enqueue('a@oasiss.co.kr', '111111')
+        self.enqueue('b@oasiss.co.kr', '222222')
+        self.enqueue('c@oasiss.co.kr', '333333', KIND_CHANGE)
+        # 첫 메일에서만 WINDOW 뒤 flush 가 예약됩니다.
+        self.assertEqual(apply_async.call_count, 1)
+
+        flush_email_batch_task()
+
+        self.assertEqual(self.sink.message_count, 3)
+        self.assertEqual(self.sink.connection_count, 1)
+        self.assertEqual(len(EmailBatchQueue()), 0)
+        self.assertEqual(EmailLog.objects.filter(log_type='SUCCESS').count(), 3)
+
+    @override_settings(EMAIL_BATCH={'MAX_SIZE': 2})
+    def test_full_queue_flushes_without_waiting(self, apply_async):
+        with mock.patch('account.tasks.flush_email_batch_task.delay') as delay:
+            self.enqueue('a@oasiss.co.kr', '111111')
+            self.enqueue('b@oasiss.co.kr', '222222')
+
+        delay.assert_called_once_with()
+
+    def test_only_failed_recipient_is_requeued(self, apply_async):
+        for email in ('a@oasiss.co.kr', 'bad@oasiss.co.kr', 'c@oasiss.co.kr'):
+            self.enqueue(email, '123456')
+
+        flush_email_batch_task()
+
+        self.assertEqual(self.sink.message_count, 2)
+        self.assertEqual(EmailLog.objects.filter(log_type='SUCCESS').count(), 2)
+        self.assertEqual(EmailLog.objects.get(log_type='FAILURE').email, 'bad@oasiss.co.kr')
+
+        # 다음 flush 에는 실패한 수신자만 남아 있습니다.
+        self.assertEqual(len(EmailBatchQueue()), 1)
+        flush_email_batch_task()
+        flush_email_batch_task()
+
+        self.assertEqual(self.sink.message_count, 2)
+        self.assertEqual(EmailLog.objects.filter(log_type='FAILURE').count(), 2)
+        self.assertEqual(EmailLog.objects.get(log_type='FINAL_FAILURE').email, 'bad@oasiss.co.kr')
+        self.assertEqual(len(EmailBatchQueue()), 0)
+
+    def test_retry_does_not_delay_or_join_fresh_messages(self, apply_async):
+        self.enqueue('bad@oasiss.co.kr', '111111')
+        with mock.patch('account.tasks.requeue_email_task.apply_async') as requeue:
+            flush_email_batch_task()
+        countdown = requeue.call_args.kwargs['countdown']
+        self.assertGreaterEqual(countdown, 15)
+
+        # 재시도를 기다리는 동안 들어온 새 메일은 WINDOW 뒤에 혼자 보내집니다.
+        apply_async.reset_mock()
+        self.enqueue('new@oasiss.co.kr', '222222')
+        self.assertEqual(apply_async.call_args.kwargs['countdown'], EmailBatchQueue().window)
+        flush_email_batch_task()
+        self.assertEqual([m['to'] for m in self.sink.messages], [['TO:<new@oasiss.co.kr>']])
+
+        # 백오프가 지나면 실패한 메일이 다음 시도 횟수로 대기열에 들어갑니다.
+        requeue_email_task(*requeue.call_args.kwargs['args'])
+        items, _ = EmailBatchQueue().claim_batch()
+        self.assertEqual(items, [
+            {'email': 'bad@oasiss.co.kr', 'code': '111111', 'kind': KIND_VERIFY, 'attempt': 2},
+        ])
+
+    def test_missing_item_is_skipped_after_grace(self, apply_async):
+        queue = EmailBatchQueue()
+        # 번호만 받고 item 을 저장하기 전에 워커가 죽은 경우
+        queue._incr(queue.key('tail'))
+        self.enqueue('b@oasiss.co.kr', '222222')
+
+        # MISSING_GRACE 전에는 push 진행 중일 수 있으므로 기다립니다.
+        flush_email_batch_task()
+        self.assertEqual(self.sink.message_count, 0)
+        self.assertEqual(len(queue), 2)
+
+        cache.set(queue.key('missing:1'), time.time() - queue.missing_grace, None)
+        flush_email_batch_task()
+
+        self.assertEqual([m['to'] for m in self.sink.messages], [['TO:<b@oasiss.co.kr>']])
+        self.assertEqual(len(queue), 0)
+        self.assertIsNone(cache.get(queue.key('missing:1')))
+
+    def test_messages_survive_worker_crash_after_claim(self, apply_async):
+        self.enqueue('a@oasiss.co.kr', '111111')
+
+        with mock.patch('account.tasks.deliver', side_effect=RuntimeError('worker lost')):
+            with self.assertRaises(RuntimeError):
+                flush_email_batch_task()
+        self.assertEqual(len(EmailBatchQueue()), 1)
+
+        flush_email_batch_task()
+        self.assertEqual(self.sink.message_count, 1)
+        self.assertEqual(len(EmailBatchQueue()), 0)
+
+    def test_flush_waits_while_another_worker_holds_lock(self, apply_async):
+        self.enqueue('a@oasiss.co.kr', '111111')
+        queue = EmailBatchQueue()
+        # 보내는 중에 죽은 워커의 잠금은 LOCK_TIMEOUT 까지 남아 있습니다.
+        queue.claim_batch()
+        apply_async.reset_mock()
+        queue.clear_scheduled()
+
+        flush_email_batch_task()
+        self.assertEqual(self.sink.message_count, 0)
+        self.assertEqual(apply_async.call_args.kwargs['countdown'], queue.window)
+
+        queue.release()
+        flush_email_batch_task()
+        self.assertEqual(self.sink.message_count, 1)
+        self.assertEqual(len(queue), 0)
+
+
+# ----------------------------------------------------------------------
+# 10. 인증 메일 트랜잭션 아웃박스
+# ----------------------------------------------------------------------
+class EmailOutboxTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = UserInfo.objects.create_user(email='member@oasiss.co.kr', nick_name='member', password='pw')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_send_writes_outbox_and_relays_after_commit(self):
+        with mock.patch('account.tasks.relay_email_outbox_task.delay') as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(reverse('email-auth-send'), {}, format='json')
+            self.assertEqual(response.status_code, 200)
+
+        row = EmailOutbox.objects.get()
+        self.assertEqual(row.email, 'member@oasiss.co.kr')
+        self.assertEqual(row.code, EmailVerification(self.user.pk, PURPOSE_AUTH).peek_code())
+        self.assertIsNone(row.relayed_at)
+        delay.assert_called_once_with()
+
+    def test_rollback_discards_outbox_row(self):
+        with mock.patch('account.tasks.relay_email_outbox_task.delay') as delay:
+            with self.captureOnCommitCallbacks(execute=True) as callbacks:
+                with self.assertRaises(RuntimeError), transaction.atomic():
+                    queue_auth_email('member@oasiss.co.kr', '123456')
+                    raise RuntimeError('rollback')
+
+        self.assertFalse(EmailOutbox.objects.exists())
+        self.assertEqual(callbacks, [])
+        delay.assert_not_called()
+
+    @mock.patch('account.tasks.flush_email_batch_task.apply_async')
+    def test_relay_moves_committed_rows_to_batch_queue(self, apply_async):
+        EmailOutbox.objects.bulk_create([
+            EmailOutbox(email=f'user{i}@oasiss.co.kr', code='123456') for i in range(3)
+        ])
+
+        # savepoint 생성/해제 + 조회(FOR UPDATE) 1회 + relayed_at 일괄 갱신 1회
+        with self.assertNumQueries(4):
+            self.assertEqual(relay_outbox(), 3)
+
+        self.assertFalse(EmailOutbox.objects.filter(relayed_at__isnull=True).exists())
+        self.assertEqual(len(EmailBatchQueue()), 3)
+        # 한 번 더 실행해도 다시 넘기지 않습니다.
+        relay_email_outbox_task()
+        self.assertEqual(len(EmailBatchQueue()), 3)
+        self.assertEqual(apply_async.call_count, 1)
+
+
+# ----------------------------------------------------------------------
+# 11. asyncio SMTP 전송 엔진
+# ----------------------------------------------------------------------
+class AsyncDeliveryEngineTests(TestCase):
+
+    def setUp(self):
+        self.sink = SMTPSink(reject_recipients={'bad@oasiss.co.kr'}).start()
+        self.addCleanup(self.sink.stop)
+
+    def engine(self, **kwargs):
+        return AsyncDeliveryEngine(
+            host=self.sink.host, port=self.sink.port, username='', password='',
+            use_tls=False, use_ssl=False, **kwargs
+        )
+
+    @staticmethod
+    def items(*emails):
+        return [{'email': email, 'code': '123456', 'kind': KIND_VERIFY, 'attempt': 1} for email in emails]
+
+    def test_sends_concurrently_within_cap(self):
+        engine = self.engine(concurrency=4)
+        result = engine.deliver(self.items(*[f'user{i}@oasiss.co.kr' for i in range(20)]))
+
+        self.assertEqual(len(result.sent), 20)
+        self.assertEqual(self.sink.message_count, 20)
+        self.assertEqual(engine.connections_opened, 4)
+        self.assertIn(b'123456', self.sink.messages[0]['data'])
+
+    def test_rate_limiter_runs_off_event_loop(self):
+        loop_threads = []
+        limiter = get_rate_limiter()
+        acquire = limiter.acquire
+
+        def record_thread(email):
+            loop_threads.append(threading.current_thread())
+            return acquire(email)
+
+        engine = self.engine(concurrency=2)
+        with mock.patch('account.utils.async_smtp.get_rate_limiter', return_value=limiter), \
+                mock.patch.object(limiter, 'acquire', side_effect=record_thread):
+            result = engine.deliver(self.items('a@oasiss.co.kr', 'b@oasiss.co.kr'))
+
+        self.assertEqual(len(result.sent), 2)
+        # 이벤트 루프(asyncio.run 을 호출한 현재 스레드)가 아닌 스레드에서 호출됩니다.
+        self.assertEqual(len(loop_threads), 2)
+        self.assertNotIn(threading.current_thread(), loop_threads)
+
+    def test_rejected_recipient_does_not_break_connection(self):
+        engine = self.engine(concurrency=1)
+        result = engine.deliver(self.items('a@oasiss.co.kr', 'bad@oasiss.co.kr', 'c@oasiss.co.kr'))
+
+        self.assertEqual([item['email'] for item in result.sent], ['a@oasiss.co.kr', 'c@oasiss.co.kr'])
+        self.assertEqual(result.failed[0][0]['email'], 'bad@oasiss.co.kr')
+        self.assertIn('550', result.failed[0][1])
+        self.assertEqual(engine.connections_opened, 1)
+
+    def test_auth_failure_is_provider_error(self):
+        self.sink.reject_auth = True
+        engine = AsyncDeliveryEngine(
+            host=self.sink.host, port=self.sink.port, username='user', password='wrong',
+            use_tls=False, use_ssl=False, concurrency=1,
+        )
+        result = engine.deliver(self.items('a@oasiss.co.kr', 'b@oasiss.co.kr', 'c@oasiss.co.kr'))
+
+        # 535 는 수신자 실패가 아니라 서버 장애이므로, 남은 메일을 같은 연결로 보내지 않습니다.
+        self.assertIn('535', result.provider_error)
+        self.assertEqual(len(result.failed), 3)
+        self.assertEqual(result.sent, [])
+        self.assertEqual(engine.connections_opened, 1)
+        self.assertEqual(self.sink.message_count, 0)
+
+    @mock.patch('account.tasks.requeue_email_task.apply_async')
+    @mock.patch('account.tasks.flush_email_batch_task.apply_async')
+    def test_flush_task_writes_same_email_logs(self, apply_async, requeue):
+        cache.clear()
+        for item in self.items('a@oasiss.co.kr', 'bad@oasiss.co.kr'):
+            enqueue(item)
+
+        with override_settings(
+            EMAIL_BATCH={'ENGINE': 'async'}, EMAIL_HOST=self.sink.host, EMAIL_PORT=self.sink.port,
+            EMAIL_USE_TLS=False, EMAIL_USE_SSL=False, EMAIL_HOST_USER='', EMAIL_HOST_PASSWORD='',
+        ):
+            flush_email_batch_task()
+
+        self.assertEqual(EmailLog.objects.get(log_type='SUCCESS').email, 'a@oasiss.co.kr')
+        self.assertEqual(EmailLog.objects.get(log_type='FAILURE').email, 'bad@oasiss.co.kr')
+
+
+# ----------------------------------------------------------------------
+# 12. 이메일 템플릿 레지스트리
+# ----------------------------------------------------------------------
+class EmailTemplateTests(TestCase):
+
+    def test_templates_are_compiled_once(self):
+        self.assertIs(get_template(KIND_VERIFY), get_template(KIND_VERIFY))
+        self.assertEqual(get_template(KIND_VERIFY).fields, {'code'})
+        # 자리표시자가 없는 제목은 원본 문자열을 그대로 사용합니다.
+        template = get_template(KIND_VERIFY)
+        self.assertIs(template.render(code='1').subject, template.subject.source)
+
+    def test_each_kind_has_its_own_subject(self):
+        subjects = {kind: render(kind, code='1', requestee='a', request_type='b').subject
+                    for kind in (KIND_VERIFY, KIND_CHANGE, KIND_APPROVAL)}
+        self.assertEqual(len(set(subjects.values())), 3)
+
+    def test_matches_legacy_format_and_escapes_html_values(self):
+        rendered = render(KIND_VERIFY, code='123456')
+        self.assertEqual(rendered.text, "인증 코드는 123456 입니다. 5분 내에 입력해 주세요.")
+        self.assertEqual(rendered.html, get_template(KIND_VERIFY).html.source.format(code='123456'))
+
+        rendered = render(KIND_APPROVAL, requestee='<b>kim</b>', request_type='그룹 가입 요청')
+        self.assertIn('&lt;b&gt;kim&lt;/b&gt;', rendered.html)
+        self.assertIn('<b>kim</b>', rendered.text)
+
+    def test_missing_value_and_format_spec_are_rejected(self):
+        with self.assertRaises(KeyError):
+            render(KIND_APPROVAL, requestee='kim')
+        with self.assertRaises(ValueError):
+            CompiledString('{code:>10}')
+
+    def test_auth_email_uses_kind_template(self):
+        message = build_auth_email('member@oasiss.co.kr', '654321', KIND_CHANGE)
+        self.assertEqual(message.subject, get_template(KIND_CHANGE).subject.source)
+        self.assertIn('654321', message.alternatives[0][0])
+
+
+# ----------------------------------------------------------------------
+# 13. 인증 코드 / 재전송 횟수 TTL 저장소
+# ----------------------------------------------------------------------
+@mock.patch('account.utils.email_delivery.queue_auth_email')
+class VerificationStoreTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserInfo.objects.create_user(email='verify@oasiss.co.kr', nick_name='verify')
+
+    def setUp(self):
+        cache.clear()
+        UserAuthCache.clear_local()
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+
+    def test_store_backends_share_semantics(self, *mocks):
+        for store in (MemoryVerificationStore(), CacheVerificationStore('default')):
+            self.assertEqual(store.incr('n', 60), 1)
+            self.assertEqual(store.incr('n', 60), 2)
+            store.set('code', '111111', 60)
+            self.assertFalse(store.compare_and_delete('code', '222222'))
+            self.assertTrue(store.compare_and_delete('code', '111111'))
+            self.assertFalse(store.compare_and_delete('code', '111111'))
+            self.assertIsNone(store.get('code'))
+            store.set('gone', 1, -1)
+            self.assertIsNone(store.get('gone'))
+
+    def test_send_locks_on_fourth_request_without_db_writes(self, *mocks):
+        url = reverse('email-auth-send')
+        for _ in range(3):
+            self.assertEqual(self.client.post(url).status_code, 200)
+        self.assertIsNone(EmailVerification(self.user.pk, PURPOSE_AUTH).locked_at())
+
+        # 4회째: 코드는 보내고 잠금, 5회째: 거부
+        response = self.client.post(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('잠깁니다', response.data['detail'][0])
+        self.assertEqual(self.client.post(url).status_code, 400)
+
+        email_info = UserEmail.objects.get(user=self.user)
+        self.assertEqual(email_info.email_refresh_count, 0)
+        self.assertFalse(email_info.email_auth_lock)
+        self.assertIsNone(email_info.email_auth_code)
+
+    def test_confirm_consumes_code_once(self, *mocks):
+        self.client.post(reverse('email-auth-send'))
+        code = EmailVerification(self.user.pk, PURPOSE_AUTH).peek_code()
+
+        url = reverse('email-auth-confirm')
+        self.assertEqual(self.client.post(url, {'auth_code': code}).status_code, 200)
+        self.assertEqual(self.client.post(url, {'auth_code': code}).status_code, 400)
+        self.assertTrue(UserEmail.objects.get(user=self.user).email_auth)
+
+    def test_change_verify_counts_wrong_codes_and_locks(self, *mocks):
+        self.client.post(reverse('email_change_request'), {'new_email': 'new@oasiss.co.kr'})
+        verification = EmailVerification(self.user.pk, PURPOSE_CHANGE)
+        code = verification.peek_code()
+        self.assertIsNotNone(code)
+
+        url = reverse('email_change_verify')
+        for _ in range(4):
+            response = self.client.post(url, {'code': '000000'})
+            self.assertEqual(response.status_code, 400)
+        self.assertIsNotNone(verification.locked_at())
+
+        # 잠긴 동안에는 올바른 코드도 거부합니다.
+        self.assertEqual(self.client.post(url, {'code': code}).status_code, 400)
+        self.assertEqual(UserInfo.objects.get(pk=self.user.pk).email, 'verify@oasiss.co.kr')
+
+
+# ----------------------------------------------------------------------
+# 14. 재시도 백오프 / SMTP 서킷 브레이커
+# ----------------------------------------------------------------------
+@override_settings(EMAIL_CIRCUIT_BREAKER={'FAILURE_THRESHOLD': 2, 'OPEN_SECONDS': 60})
+@mock.patch('account.tasks.flush_email_batch_task.apply_async')
+class SMTPCircuitBreakerTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        requeue_immediately(self)
+        # 연결을 받지 않는 포트 (sink 를 열었다 닫아 빈 포트를 얻습니다.)
+        sink = SMTPSink().start()
+        self.dead_port = sink.port
+        sink.stop()
+        overrides = override_settings(
+            EMAIL_BACKEND='django.core.mail.backends.smtp.EmailBackend',
+            EMAIL_HOST='127.0.0.1', EMAIL_PORT=self.dead_port, EMAIL_TIMEOUT=1,
+            EMAIL_USE_TLS=False, EMAIL_USE_SSL=False, EMAIL_HOST_USER='', EMAIL_HOST_PASSWORD='',
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+
+    def test_backoff_grows_with_jitter_and_cap(self, apply_async):
+        delays = [backoff_delay(1, base=30, cap=600) for _ in range(200)]
+        self.assertTrue(all(15 <= d <= 30 for d in delays))
+        self.assertGreater(len({round(d, 3) for d in delays}), 100)
+        self.assertTrue(60 <= backoff_delay(3, base=30, cap=600) <= 120)
+        self.assertTrue(300 <= backoff_delay(10, base=30, cap=600) <= 600)
+
+    def test_breaker_opens_after_threshold_and_probes_once(self, apply_async):
+        breaker = SMTPCircuitBreaker('smtp.example.com')
+        self.assertFalse(breaker.record_failure('down'))
+        self.assertTrue(breaker.record_failure('down'))
+        self.assertFalse(breaker.allow_request())
+
+        state = SMTPCircuitState.objects.get(host='smtp.example.com')
+        self.assertEqual((state.state, state.trip_count, state.last_error), (STATE_OPEN, 1, 'down'))
+
+        # OPEN_SECONDS 가 지나면 한 작업만 시험 전송합니다.
+        cache.set(breaker.key('open_until'), timezone.now(), 60)
+        self.assertTrue(breaker.allow_request())
+        self.assertFalse(breaker.allow_request())
+
+        breaker.record_success()
+        self.assertTrue(breaker.allow_request())
+        self.assertEqual(SMTPCircuitState.objects.get(host='smtp.example.com').state, STATE_CLOSED)
+
+    def test_flush_is_parked_while_open(self, apply_async):
+        for i in range(2):
+            enqueue({'email': f'u{i}@oasiss.co.kr', 'code': '123456', 'kind': KIND_VERIFY, 'attempt': 1})
+            flush_email_batch_task()
+        # 연결 실패한 flush 2회로 브레이커가 열립니다. (메일 수가 아니라 flush 단위로 셉니다.)
+        self.assertFalse(SMTPCircuitBreaker('127.0.0.1').allow_request())
+        logs = EmailLog.objects.count()
+
+        # 열려 있는 동안에는 대기열을 꺼내지 않고 다시 예약만 합니다.
+        apply_async.reset_mock()
+        cache.delete(EmailBatchQueue().key('scheduled'))
+        flush_email_batch_task()
+        self.assertEqual(len(EmailBatchQueue()), 2)
+        self.assertEqual(EmailLog.objects.count(), logs)
+        self.assertGreaterEqual(apply_async.call_args.kwargs['countdown'], 55)
+
+    def test_failed_recipient_is_retried_after_backoff(self, apply_async):
+        enqueue({'email': 'u@oasiss.co.kr', 'code': '123456', 'kind': KIND_VERIFY, 'attempt': 1})
+        with mock.patch('account.tasks.requeue_email_task.apply_async') as requeue:
+            flush_email_batch_task()
+        # 실패한 메일은 대기열이 아니라 백오프 시간 뒤의 requeue_email_task 로 갑니다.
+        self.assertEqual(len(EmailBatchQueue()), 0)
+        self.assertEqual(requeue.call_args.kwargs['args'][0][0]['attempt'], 2)
+        self.assertGreaterEqual(requeue.call_args.kwargs['countdown'], 15)
+
+    def test_single_send_task_is_parked_without_connecting(self, apply_async):
+        SMTPCircuitBreaker('127.0.0.1').trip(error='down')
+        with mock.patch('account.tasks.build_auth_email') as build, \
+                mock.patch.object(send_auth_email_task, 'retry', side_effect=RuntimeError('retry')) as retry:
+            with self.assertRaises(RuntimeError):
+                send_auth_email_task('u@oasiss.co.kr', '123456')
+
+        build.assert_not_called()
+        self.assertEqual(retry.call_args.kwargs['kwargs'], {'attempt': 1})
+        self.assertIsNone(retry.call_args.kwargs['max_retries'])
+
+
+# ----------------------------------------------------------------------
+# 15. 발송 메일 토큰 버킷
+# ----------------------------------------------------------------------
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class EmailRateLimiterTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.clock = FakeClock()
+
+    def limiter(self, **overrides):
+        config = dict(GLOBAL_RATE=10, GLOBAL_BURST=5, RECIPIENT_RATE=1, RECIPIENT_BURST=2, MAX_WAIT=0.25)
+        config.update(overrides)
+        return EmailRateLimiter(account='sender@oasiss.co.kr', clock=self.clock, **config)
+
+    def test_bucket_allows_burst_then_paces_at_rate(self):
+        bucket = TokenBucket('bucket', rate=10, burst=3, clock=self.clock)
+        self.assertEqual([bucket.reserve() for _ in range(3)], [(True, 0.0)] * 3)
+        allowed, retry_after = bucket.reserve()
+        self.assertFalse(allowed)
+        self.assertAlmostEqual(retry_after, 0.1)
+
+        # 기다릴 수 있으면 예약하고 기다릴 시간을 돌려줍니다.
+        allowed, delay = bucket.reserve(max_wait=0.15)
+        self.assertTrue(allowed)
+        self.assertAlmostEqual(delay, 0.1)
+        self.clock.now += 0.25
+        self.assertTrue(bucket.reserve()[0])
+
+        # 오래 쉬어도 burst 이상 쌓이지 않습니다.
+        self.clock.now += 3600
+        self.assertEqual(sum(bucket.reserve()[0] for _ in range(5)), 3)
+
+    def test_recipient_limit_rejects_and_global_limit_defers(self):
+        limiter = self.limiter()
+        self.assertTrue(all(limiter.acquire('a@oasiss.co.kr').allowed for _ in range(2)))
+        decision = limiter.acquire('a@oasiss.co.kr')
+        self.assertEqual(decision.reason, LIMIT_RECIPIENT)
+
+        for i in range(3):
+            self.assertTrue(limiter.acquire(f'u{i}@oasiss.co.kr').allowed)
+        # 계정 버킷이 비면 MAX_WAIT 안에서는 기다렸다 보내고, 넘으면 미룹니다.
+        decisions = [limiter.acquire(f'w{i}@oasiss.co.kr') for i in range(3)]
+        self.assertEqual([round(d.delay, 3) for d in decisions[:2]], [0.1, 0.2])
+        self.assertEqual(decisions[2].reason, LIMIT_GLOBAL)
+        self.assertAlmostEqual(decisions[2].retry_after, 0.3)
+
+        # 미룬 메일의 수신자 토큰은 돌려받습니다.
+        self.clock.now += 0.5
+        self.assertTrue(limiter.acquire('w2@oasiss.co.kr').allowed)
+        self.assertTrue(limiter.acquire('w2@oasiss.co.kr').allowed)
+
+    def test_disabled_limiter_always_allows(self):
+        limiter = self.limiter(ENABLED=False, RECIPIENT_BURST=1)
+        self.assertTrue(all(limiter.acquire('a@oasiss.co.kr').allowed for _ in range(10)))
+
+    @mock.patch('account.tasks.flush_email_batch_task.apply_async')
+    def test_flush_defers_global_and_logs_recipient_limits(self, apply_async):
+        sink = SMTPSink().start()
+        self.addCleanup(sink.stop)
+        items = [{'email': email, 'code': '123456', 'kind': KIND_VERIFY, 'attempt': 1}
+                 for email in ('a@oasiss.co.kr', 'a@oasiss.co.kr', 'b@oasiss.co.kr', 'c@oasiss.co.kr')]
+        for item in items:
+            enqueue(item)
+
+        with override_settings(
+            EMAIL_BACKEND='django.core.mail.backends.smtp.EmailBackend',
+            EMAIL_HOST=sink.host, EMAIL_PORT=sink.port, EMAIL_USE_TLS=False, EMAIL_USE_SSL=False,
+            EMAIL_HOST_USER='', EMAIL_HOST_PASSWORD='',
+            EMAIL_RATE_LIMIT={'GLOBAL_RATE': 0.01, 'GLOBAL_BURST': 2, 'RECIPIENT_RATE': 0.01,
+                              'RECIPIENT_BURST': 1, 'MAX_WAIT': 0},
+        ), mock.patch('account.tasks.requeue_email_task.apply_async') as requeue:
+            flush_email_batch_task()
+
+        # a 1통 발송, a 두 번째는 수신자 한도로 거부, b 발송 후 계정 한도 소진 -> c 는 토큰이 생길 때 다시 대기열로
+        self.assertEqual(sink.message_count, 2)
+        self.assertEqual(EmailLog.objects.get(log_type='RATE_LIMITED').email, 'a@oasiss.co.kr')
+        self.assertEqual(len(EmailBatchQueue()), 0)
+        self.assertEqual(requeue.call_args.kwargs['args'], ([items[3]],))
+        self.assertGreater(requeue.call_args.kwargs['countdown'], 60)
+
+
+# ----------------------------------------------------------------------
+# 16. SMTP sink 지연 / 실패 주입
+# ----------------------------------------------------------------------
+class SMTPSinkInjectionTests(TestCase):
+
+    def send(self, sink):
+        connection = get_connection(
+            'django.core.mail.backends.smtp.EmailBackend',
+            host=sink.host, port=sink.port, use_tls=False, username='', password='', timeout=2,
+        )
+        return EmailMessage('인증 코드', '123456', 'noreply@oasiss.co.kr', ['a@oasiss.co.kr'],
+                            connection=connection).send()
+
+    def test_latency_is_added_to_each_reply(self):
+        with SMTPSink(command_latency=0.01, data_latency=0.05) as sink:
+            started = time.perf_counter()
+            self.assertEqual(self.send(sink), 1)
+            # 220 / EHLO / MAIL / RCPT / DATA / 250 / QUIT 응답 7번 + DATA 처리 지연
+            self.assertGreaterEqual(time.perf_counter() - started, 0.12)
+
+    def test_failure_rate_answers_451(self):
+        with SMTPSink(failure_rate=1.0) as sink:
+            with self.assertRaises(smtplib.SMTPDataError) as ctx:
+                self.send(sink)
+            self.assertEqual(ctx.exception.smtp_code, 451)
+            self.assertEqual((sink.injected_failures, sink.message_count), (1, 0))
+
+    def test_disconnect_rate_drops_connection_and_is_seeded(self):
+        with SMTPSink(disconnect_rate=1.0) as sink:
+            with self.assertRaises(smtplib.SMTPServerDisconnected):
+                self.send(sink)
+            self.assertEqual(sink.injected_disconnects, 1)
+
+        outcomes = []
+        for _ in range(2):
+            with SMTPSink(failure_rate=0.5, seed=7) as sink:
+                for _ in range(10):
+                    try:
+                        self.send(sink)
+                    except smtplib.SMTPDataError:
+                        pass
+                outcomes.append(sink.message_count)
+        self.assertEqual(outcomes[0], outcomes[1])
+
+
+# ----------------------------------------------------------------------
+# 17. 이메일 로그 일괄 저장 / 보관 기간 정리
+# ----------------------------------------------------------------------
+class EmailLogWriterTests(TestCase):
+
+    def test_buffer_flushes_by_size_in_one_insert(self):
+        buffer = EmailLogBuffer(buffer_size=3, flush_interval=60)
+        buffer.add('a@oasiss.co.kr', 'FAILURE', error_message='down')
+        buffer.add('b@oasiss.co.kr', 'RATE_LIMITED')
+        self.assertEqual(EmailLog.objects.count(), 0)
+
+        with self.assertNumQueries(1):
+            buffer.add('c@oasiss.co.kr', 'RATE_LIMITED')
+        self.assertEqual(EmailLog.objects.count(), 3)
+        self.assertEqual(len(buffer), 0)
+
+    def test_buffer_flushes_after_interval(self):
+        buffer = EmailLogBuffer(buffer_size=100, flush_interval=0)
+        buffer.add('a@oasiss.co.kr', 'FINAL_FAILURE')
+        self.assertEqual(EmailLog.objects.count(), 1)
+        self.assertEqual(buffer.flush_if_due(), 0)
+
+    def test_final_failure_is_saved_immediately_with_buffered_rows(self):
+        buffer = EmailLogBuffer(buffer_size=100, flush_interval=60)
+        buffer.add('a@oasiss.co.kr', 'RATE_LIMITED')
+        self.assertEqual(EmailLog.objects.count(), 0)
+
+        with self.assertNumQueries(1):
+            buffer.add('b@oasiss.co.kr', 'FINAL_FAILURE', error_message='down')
+        self.assertEqual(sorted(EmailLog.objects.values_list('log_type', flat=True)), ['FINAL_FAILURE', 'RATE_LIMITED'])
+
+    def test_idle_process_flushes_on_timer(self):
+        # 다음 작업(task_postrun)이 오지 않아도 FLUSH_INTERVAL 뒤 타이머 스레드가 저장합니다.
+        saved = threading.Event()
+        buffer = EmailLogBuffer(buffer_size=100, flush_interval=0.05)
+        with mock.patch.object(EmailLog.objects, 'bulk_create', side_effect=lambda rows, **kwargs: saved.set()), \
+                mock.patch('account.utils.email_log.connections'):
+            buffer.add('a@oasiss.co.kr', 'RATE_LIMITED')
+            timer = buffer._timer
+            self.assertTrue(saved.wait(2))
+            timer.join(2)
+
+        self.assertEqual(len(buffer), 0)
+        self.assertEqual(buffer.flushed, 1)
+
+    def test_purge_deletes_expired_rows_in_chunks(self):
+        EmailLog.objects.bulk_create([EmailLog(email=f'u{i}@oasiss.co.kr', log_type='SUCCESS') for i in range(7)])
+        EmailLog.objects.update(created_at=timezone.now() - timedelta(days=40))
+        recent = EmailLog.objects.create(email='new@oasiss.co.kr', log_type='SUCCESS')
+
+        # 청크 3개 * 2행 = 6행까지만 지우고 남았다고 알립니다.
+        self.assertEqual(purge_email_logs(retention_days=30, chunk_size=2, max_chunks=3, pause=0), (6, True))
+        self.assertEqual(purge_email_logs(retention_days=30, chunk_size=2, max_chunks=3, pause=0), (1, False))
+        self.assertEqual(list(EmailLog.objects.values_list('pk', flat=True)), [recent.pk])
+
+    def test_composite_indexes_exist(self):
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, EmailLog._meta.db_table)
+        indexed = {tuple(c['columns']) for c in constraints.values() if c['index']}
+        self.assertIn(('email', 'created_at'), indexed)
+        self.assertIn(('log_type', 'created_at'), indexed)
+
+
+# ----------------------------------------------------------------------
+# 18. 메일 전송 단일 진입점 / 요청 안 동기 SMTP 방지
+# ----------------------------------------------------------------------
+class EmailDeliveryGuardTests(TestCase):
+
+    def setUp(self):
+        timings.reset()
+        self.addCleanup(timings.reset)
+        self.sink = SMTPSink().start()
+        self.addCleanup(self.sink.stop)
+        reset_smtp_pool()
+        self.addCleanup(reset_smtp_pool)
+
+    def send_smtp(self):
+        connection = get_connection(
+            'account.email_backend.PooledEmailBackend',
+            host=self.sink.host, port=self.sink.port, use_tls=False, username='', password='',
+        )
+        return EmailMessage('인증 코드', '123456', 'noreply@oasiss.co.kr', ['member@oasiss.co.kr'],
+                            connection=connection).send()
+
+    @override_settings(EMAIL_DELIVERY={'SYNC_SMTP_IN_REQUEST': 'raise'})
+    def test_smtp_in_request_raises(self):
+        with measure_request('email-auth-send', record=False):
+            with self.assertRaises(SynchronousEmailError):
+                self.send_smtp()
+        self.assertEqual(self.sink.message_count, 0)
+
+    @override_settings(DEBUG=True, EMAIL_DELIVERY={})
+    def test_debug_defaults_to_raise(self):
+        with measure_request('email-auth-send', record=False):
+            with self.assertRaises(SynchronousEmailError):
+                guard_sync_smtp('test')
+
+    @override_settings(DEBUG=False, EMAIL_DELIVERY={})
+    def test_production_logs_and_sends(self):
+        with measure_request('email-auth-send', record=False), mock.patch('builtins.print') as printed:
+            self.assertEqual(self.send_smtp(), 1)
+        self.assertEqual(self.sink.message_count, 1)
+        self.assertTrue(printed.called)
+        violations = timings.snapshot()['sync_smtp_in_request']
+        self.assertEqual(violations['email-auth-send:PooledEmailBackend']['count'], 1)
+
+    @override_settings(EMAIL_DELIVERY={'SYNC_SMTP_IN_REQUEST': 'raise'})
+    def test_smtp_outside_request_is_allowed(self):
+        # Celery 작업 / 관리 명령은 요청 밖이므로 그대로 보냅니다.
+        self.assertEqual(self.send_smtp(), 1)
+        self.assertEqual(self.sink.message_count, 1)
+
+    @mock.patch('account.utils.email_outbox.kick_relay')
+    def test_send_email_records_enqueue_latency_per_call_site(self, kick_relay):
+        with measure_request('email-auth-send', record=False) as measurement:
+            send_email('a@oasiss.co.kr', '123456', call_site='email-auth-send')
+        send_email('b@oasiss.co.kr', '654321', KIND_CHANGE, call_site='email-change-request')
+
+        self.assertEqual(EmailOutbox.objects.count(), 2)
+        self.assertGreater(measurement.phase_ms('email_enqueue'), 0)
+        enqueue = timings.snapshot()['email_enqueue']
+        self.assertEqual(enqueue['email-auth-send']['count'], 1)
+        self.assertEqual(enqueue['email-change-request']['count'], 1)
+
+
+# ----------------------------------------------------------------------
+# 19. Celery 큐 구성 / 결과 저장 생략
+# ----------------------------------------------------------------------
+class CeleryQueueTopologyTests(TestCase):
+
+    def test_email_and_maintenance_tasks_are_routed(self):
+        from user.celery import app
+
+        router = app.amqp.router
+        for task, queue in (
+            (send_auth_email_task, 'email'),
+            (flush_email_batch_task, 'email'),
+            (requeue_email_task, 'email'),
+            (relay_email_outbox_task, 'email'),
+            (purge_email_logs_task, 'maintenance'),
+        ):
+            self.assertEqual(router.route({}, task.name)['queue'].name, queue)
+        self.assertEqual(router.route({}, 'user.celery.debug_task')['queue'].name, 'default')
+
+    def test_fire_and_forget_tasks_ignore_results(self):
+        for task in (send_auth_email_task, flush_email_batch_task, requeue_email_task, relay_email_outbox_task,
+                     purge_email_logs_task):
+            self.assertTrue(task.ignore_result, task.name)
+
+    def test_worker_profile_applies_to_single_queue_worker(self):
+        from user.celery import app, apply_queue_profile
+
+        def worker(queues, concurrency, prefetch_multiplier):
+            sender = mock.Mock(concurrency=concurrency, prefetch_multiplier=prefetch_multiplier)
+            sender.app.conf = app.conf
+            sender.app.amqp.queues.consume_from = {name: None for name in queues}
+            with mock.patch('builtins.print'):
+                apply_queue_profile(sender=sender)
+            return sender.concurrency, sender.prefetch_multiplier
+
+        default_concurrency = app.conf.worker_concurrency or os.cpu_count()
+        default_prefetch = app.conf.worker_prefetch_multiplier
+        self.assertEqual(worker(['maintenance'], default_concurrency, default_prefetch), (1, 1))
+        # 명령줄에서 바꾼 값은 유지합니다.
+        self.assertEqual(worker(['maintenance'], 3, default_prefetch), (3, 1))
+        # 여러 큐를 받는 워커에는 적용하지 않습니다.
+        self.assertEqual(
+            worker(['email', 'default'], default_concurrency, default_prefetch), (default_concurrency, default_prefetch)
+        )
+
+
+# ----------------------------------------------------------------------
+# 20. 사용자 일괄 생성 (provision_users)
+# ----------------------------------------------------------------------
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class UserProvisioningTests(TestCase):
+
+    def write_file(self, suffix, text):
+        f = tempfile.NamedTemporaryFile('w', suffix=suffix, delete=False, encoding='utf-8')
+        with f:
+            f.write(text)
+        self.addCleanup(os.unlink, f.name)
+        return f.name
+
+    def test_csv_creates_users_and_email_info_in_chunks(self):
+        UserInfo.objects.create_user('taken@oasiss.co.kr', 'pw', nick_name='taken')
+        path = self.write_file('.csv', '\n'.join([
+            'email,nick_name,password,family_level',
+            'a@oasiss.co.kr,a,pw-a,master',
+            'b@oasiss.co.kr,b,,',
+            'taken@oasiss.co.kr,dup,pw,',
+            'A@OASISS.co.kr,dup,pw,',
+            'not-an-email,bad,pw,',
+            'c@oasiss.co.kr,c,pw-c,owner',
+            'd@oasiss.co.kr,d,pw-d,user',
+        ]))
+
+        # 청크 2개: 청크마다 기존 email 조회 1 + 트랜잭션(SAVEPOINT/RELEASE 2, INSERT 2) 으로 행 수와 관계없이 일정
+        with self.assertNumQueries(2 * 5):
+            result = provision_users(read_rows(path), chunk_size=4, hash_workers=0)
+
+        self.assertEqual(result.created, 3)
+        self.assertEqual(result.chunks, 2)
+        self.assertEqual(sorted(line for line, _, _ in result.skipped), [4, 5, 6, 7])
+        a = UserInfo.objects.get(email='a@oasiss.co.kr')
+        self.assertTrue(a.check_password('pw-a'))
+        self.assertEqual(a.family_level, 'master')
+        self.assertFalse(UserInfo.objects.get(email='b@oasiss.co.kr').has_usable_password())
+        self.assertEqual(UserEmail.objects.filter(user__email__in=['a@oasiss.co.kr', 'b@oasiss.co.kr', 'd@oasiss.co.kr']).count(), 3)
+        self.assertGreater(result.rows_per_sec, 0)
+
+    def test_jsonl_with_process_pool(self):
+        path = self.write_file('.jsonl', '\n'.join(
+            json.dumps({'email': f'p{i}@oasiss.co.kr', 'nick_name': f'p{i}', 'password': f'pw{i}'}) for i in range(6)
+        ) + '\n{broken\n')
+
+        result = provision_users(read_rows(path), chunk_size=4, hash_workers=2)
+
+        self.assertEqual(result.created, 6)
+        self.assertEqual([line for line, _, _ in result.skipped], [7])
+        self.assertTrue(UserInfo.objects.get(email='p5@oasiss.co.kr').check_password('pw5'))
+        self.assertEqual(UserEmail.objects.filter(user__email__startswith='p').count(), 6)
+
+    def test_command_dry_run_does_not_write(self):
+        path = self.write_file('.csv', 'email,nick_name\nx@oasiss.co.kr,x\n')
+        with mock.patch('sys.stdout'):
+            call_command('provision_users', path, '--dry-run', '--hash-workers', '0', stdout=open(os.devnull, 'w'))
+        self.assertFalse(UserInfo.objects.filter(email='x@oasiss.co.kr').exists())
+
+
+# ----------------------------------------------------------------------
+# 21. 회원가입 시 UserEmail 명시적 생성 (post_save 시그널 제거)
+# ----------------------------------------------------------------------
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class UserEmailCreationTests(TestCase):
+
+    def test_create_user_creates_email_info_in_one_transaction(self):
+        user = UserInfo.objects.create_user('new@oasiss.co.kr', 'pw', nick_name='new')
+
+        self.assertTrue(UserEmail.objects.filter(user=user).exists())
+        # 생성 시 캐시가 채워지므로 추가 조회가 없습니다.
+        with self.assertNumQueries(0):
+            self.assertFalse(user.email_info.email_auth)
+
+    def test_email_info_failure_rolls_back_user(self):
+        with mock.patch('django.db.models.query.QuerySet.create', side_effect=RuntimeError('boom')):
+            with self.assertRaises(RuntimeError):
+                UserInfo.objects.create_user('rollback@oasiss.co.kr', 'pw', nick_name='rollback')
+
+        self.assertFalse(UserInfo.objects.filter(email='rollback@oasiss.co.kr').exists())
+
+    def test_save_existing_user_runs_single_update(self):
+        user = UserInfo.objects.create_user('save@oasiss.co.kr', 'pw', nick_name='save')
+
+        # 시그널이 없으므로 UPDATE 1번만 실행됩니다.
+        with self.assertNumQueries(1):
+            user.decryption_fail_count += 1
+            user.save(update_fields=['decryption_fail_count'])
+
+    def test_email_info_created_lazily_for_legacy_user(self):
+        # create_user() 를 거치지 않은 사용자(관리자 페이지 등)는 UserEmail 이 없습니다.
+        user = UserInfo.objects.create(email='legacy@oasiss.co.kr', nick_name='legacy')
+        self.assertFalse(UserEmail.objects.filter(user=user).exists())
+
+        info = UserLoader.email_info(user)
+
+        self.assertFalse(info.email_auth)
+        self.assertEqual(UserEmail.objects.filter(user=user).count(), 1)
+        with self.assertNumQueries(0):
+            self.assertEqual(UserLoader.email_info(user).pk, info.pk)
+
+
+# ----------------------------------------------------------------------
+# 22. 이메일 사용 가능 여부 확인 (email_normalized / new_email 인덱스)
+# ----------------------------------------------------------------------
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class EmailAvailabilityTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserInfo.objects.create_user('me@oasiss.co.kr', 'pw', nick_name='me')
+        cls.other = UserInfo.objects.create_user('Other@Oasiss.co.kr', 'pw', nick_name='other')
+        cls.other.new_email = 'pending@oasiss.co.kr'
+        cls.other.save(update_fields=['new_email'])
+
+    def test_email_normalized_follows_email(self):
+        self.assertEqual(self.other.email_normalized, 'other@oasiss.co.kr')
+        self.user.email = 'Changed@oasiss.co.kr'
+        self.user.save(update_fields=['email'])
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.email_normalized, 'changed@oasiss.co.kr')
+
+    def test_check_email_single_query(self):
+        cases = [
+            ('ME@oasiss.co.kr', self.user, REASON_SAME),
+            ('other@OASISS.co.kr', self.user, REASON_TAKEN),
+            ('pending@oasiss.co.kr', self.user, REASON_PENDING),
+            ('pending@oasiss.co.kr', self.other, AVAILABLE),
+            ('free@oasiss.co.kr', self.user, AVAILABLE),
+            ('OTHER@oasiss.co.kr', None, REASON_TAKEN),
+            ('pending@oasiss.co.kr', None, REASON_PENDING),
+        ]
+        for email, user, expected in cases:
+            with self.subTest(email=email, user=user), self.assertNumQueries(1):
+                self.assertEqual(check_email(email, user), expected)
+
+    def test_lookup_uses_indexes(self):
+        plan = availability_queryset('x@oasiss.co.kr').explain()
+
+        self.assertIn('user_info_email_norm_idx', plan)
+        self.assertIn('user_info_new_email_idx', plan)
+        if connection.vendor == 'sqlite':
+            # 전체 테이블 읽기(SCAN user_info) 없이 인덱스 두 개로만 찾습니다.
+            self.assertNotIn('SCAN user_info', plan)
+
+    def test_registration_rejects_case_insensitive_duplicate(self):
+        response = APIClient().post(reverse('user-register'), {
+            'email': 'OTHER@oasiss.co.kr', 'nick_name': 'dup',
+            'password1': 'Str0ng-pass!word', 'password2': 'Str0ng-pass!word',
+        }, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['email'], [EMAIL_MESSAGES[REASON_TAKEN]])
@@ -1,10 +1,12 @@
 from django.urls import path
-from .views import UserRegistrationView, UserLoginView, EmailAuthSendView, EmailAuthConfirmView, EmailChangeRequestView, EmailChangeVerifyView
+from .views import UserRegistrationView, AsyncUserRegistrationView, UserLoginView, EmailAuthSendView, EmailAuthConfirmView, EmailChangeRequestView, EmailChangeVerifyView
 
 
 urlpatterns = [
     # 사용자 등록 (회원가입) API
     path('register/', UserRegistrationView.as_view(), name='user-register'),
+    # 사용자 등록 API (비동기, 비밀번호 해시를 프로세스 풀에서 처리)
+    path('register/async/', AsyncUserRegistrationView.as_view(), name='user-register-async'),
 
     # 사용자 로그인 API (추가) --
     # 현재론 api/token 로그인 방식으로 인한 사용 중지
@@ -0,0 +1,282 @@
+# util/async_smtp.py
+#
+# asyncio 기반 SMTP 전송 엔진 (표준 라이브러리만 사용)
+# prefork 워커 1개가 SMTP 대화 1개씩만 처리하던 것을, 한 프로세스에서 여러 연결을 동시에 사용하도록 합니다.
+
+import asyncio
+import base64
+import time
+
+from django.conf import settings
+from django.core.mail.message import sanitize_address
+
+from ..email_backend import build_ssl_context
+from .email_delivery import guard_sync_smtp
+from .email_dispatcher import BatchResult, build_auth_email
+from .email_templates import KIND_VERIFY
+from .rate_limiter import get_rate_limiter
+
+DEFAULT_ASYNC_SMTP = {
+    # 동시에 열어 둘 SMTP 연결(= 동시에 진행하는 전송) 최대 수
+    'CONCURRENCY': 100,
+    # 연결 / 응답 대기 시간 (초)
+    'TIMEOUT': 10,
+    # 연결 하나로 보낼 최대 메일 수 (넘으면 QUIT 후 다시 연결)
+    'MESSAGES_PER_CONNECTION': 100,
+}
+
+
+def _get_config():
+    config = dict(DEFAULT_ASYNC_SMTP)
+    config.update(getattr(settings, 'ASYNC_SMTP', {}))
+    return config
+
+
+class AsyncSMTPError(Exception):
+    """SMTP 서버가 기대하지 않은 응답 코드를 반환했을 때"""
+
+    def __init__(self, code, message, command=''):
+        self.code = code
+        self.message = message
+        super().__init__(f"{command} {code} {message}".strip())
+
+    @property
+    def permanent(self):
+        # 5xx 는 같은 연결로 다시 보내도 실패합니다. (수신자 거부 등)
+        return 500 <= self.code < 600
+
+
+class AsyncSMTPClient:
+    """
+    asyncio 스트림 위의 최소 SMTP 클라이언트 (EHLO / STARTTLS / AUTH PLAIN / MAIL / RCPT / DATA / QUIT)
+    """
+
+    def __init__(self, host, port, use_tls=False, use_ssl=False, username='', password='',
+                 ssl_context=None, timeout=10, local_hostname=None):
+        self.host = host
+        self.port = port
+        self.use_tls = use_tls
+        self.use_ssl = use_ssl
+        self.username = username
+        self.password = password
+        self.ssl_context = ssl_context
+        self.timeout = timeout
+        self.local_hostname = local_hostname or 'localhost'
+        self.reader = None
+        self.writer = None
+        self.extensions = set()
+
+    async def _read_reply(self):
+        lines = []
+        while True:
+            raw = await asyncio.wait_for(self.reader.readline(), self.timeout)
+            if not raw:
+                raise ConnectionError('SMTP 서버가 연결을 닫았습니다.')
+            line = raw.decode('utf-8', 'replace').rstrip('\r\n')
+            lines.append(line[4:])
+            if len(line) < 4 or line[3] != '-':
+                return int(line[:3]), lines
+
+    async def command(self, line, expect=(250,)):
+        self.writer.write(f'{line}\r\n'.encode('utf-8'))
+        await self.writer.drain()
+        code, lines = await self._read_reply()
+        if code not in expect:
+            raise AsyncSMTPError(code, ' '.join(lines), line.split(' ', 1)[0])
+        return code, lines
+
+    async def ehlo(self):
+        _, lines = await self.command(f'EHLO {self.local_hostname}')
+        self.extensions = {line.split(' ', 1)[0].upper() for line in lines[1:]}
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.wait_for(
+            asyncio.open_connection(
+                self.host, self.port,
+                ssl=self.ssl_context if self.use_ssl else None,
+                server_hostname=self.host if self.use_ssl else None,
+            ),
+            self.timeout,
+        )
+        code, lines = await self._read_reply()
+        if code != 220:
+            raise AsyncSMTPError(code, ' '.join(lines), 'CONNECT')
+        await self.ehlo()
+
+        if self.use_tls and not self.use_ssl:
+            await self.command('STARTTLS', expect=(220,))
+            await asyncio.wait_for(
+                self.writer.start_tls(self.ssl_context, server_hostname=self.host), self.timeout
+            )
+            # TLS 이후에는 서버 기능 목록을 다시 받아야 합니다.
+            await self.ehlo()
+
+        if self.username and self.password:
+            token = base64.b64encode(f'\0{self.username}\0{self.password}'.encode('utf-8')).decode('ascii')
+            await self.command(f'AUTH PLAIN {token}', expect=(235,))
+
+    async def sendmail(self, from_addr, recipients, message_bytes):
+        await self.command(f'MAIL FROM:<{from_addr}>')
+        for recipient in recipients:
+            await self.command(f'RCPT TO:<{recipient}>', expect=(250, 251))
+        await self.command('DATA', expect=(354,))
+
+        # 점으로 시작하는 줄은 점을 하나 더 붙입니다. (dot-stuffing)
+        lines = message_bytes.split(b'\r\n')
+        body = b'\r\n'.join(b'.' + line if line.startswith(b'.') else line for line in lines)
+        self.writer.write(body + b'\r\n.\r\n')
+        await self.writer.drain()
+        code, lines = await self._read_reply()
+        if code != 250:
+            raise AsyncSMTPError(code, ' '.join(lines), 'DATA')
+
+    async def reset(self):
+        await self.command('RSET')
+
+    async def quit(self):
+        try:
+            await self.command('QUIT', expect=(221,))
+        except (AsyncSMTPError, OSError, asyncio.TimeoutError):
+            pass
+        finally:
+            self.close()
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+
+class AsyncDeliveryEngine:
+    """
+    메일 목록을 CONCURRENCY 개의 SMTP 연결로 동시에 보냅니다.
+    연결(코루틴)마다 대기열에서 메일을 꺼내 순서대로 보내므로, 동시에 진행 중인 전송 수는 CONCURRENCY 를 넘지 않습니다.
+
+    TLS 설정(TLS 1.2 이상, 인증서)은 CustomEmailBackend 와 같은 build_ssl_context() 를 사용하고,
+    결과는 send_batch() 와 같은 BatchResult 로 반환하므로 EmailLog 기록 방식도 같습니다.
+    """
+
+    def __init__(self, host=None, port=None, username=None, password=None, use_tls=None, use_ssl=None,
+                 concurrency=None, timeout=None, messages_per_connection=None):
+        config = _get_config()
+        self.host = host or settings.EMAIL_HOST
+        self.port = port or settings.EMAIL_PORT
+        self.username = settings.EMAIL_HOST_USER if username is None else username
+        self.password = settings.EMAIL_HOST_PASSWORD if password is None else password
+        self.use_tls = settings.EMAIL_USE_TLS if use_tls is None else use_tls
+        self.use_ssl = settings.EMAIL_USE_SSL if use_ssl is None else use_ssl
+        self.concurrency = concurrency or config['CONCURRENCY']
+        self.timeout = timeout or config['TIMEOUT']
+        self.messages_per_connection = messages_per_connection or config['MESSAGES_PER_CONNECTION']
+        self.ssl_context = None
+        if self.use_tls or self.use_ssl:
+            self.ssl_context = build_ssl_context(settings.EMAIL_SSL_CERTFILE, settings.EMAIL_SSL_KEYFILE)
+        # 벤치마크 / 테스트 확인용 (latencies: 메일별 전송 시간, 연결 시간 포함)
+        self.connections_opened = 0
+        self.latencies = []
+
+    def client(self):
+        return AsyncSMTPClient(
+            self.host, self.port, use_tls=self.use_tls, use_ssl=self.use_ssl,
+            username=self.username, password=self.password,
+            ssl_context=self.ssl_context, timeout=self.timeout,
+        )
+
+    @staticmethod
+    def envelope(item):
+        message = build_auth_email(item['email'], item['code'], item.get('kind', KIND_VERIFY))
+        encoding = message.encoding or settings.DEFAULT_CHARSET
+        from_addr = sanitize_address(message.from_email, encoding)
+        recipients = [sanitize_address(addr, encoding) for addr in message.recipients()]
+        return from_addr, recipients, message.message().as_bytes(linesep='\r\n')
+
+    async def _worker(self, queue, result, limiter):
+        client = None
+        sent_on_connection = 0
+        try:
+            while True:
+                try:
+                    item = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+
+                # 발송 한도 확인: 공유 캐시 I/O 와 토큰 버킷 잠금 대기(time.sleep)가 있으므로
+                # 이벤트 루프를 막지 않도록 스레드에서 실행합니다. (다른 연결의 전송은 계속 진행)
+                decision = await asyncio.to_thread(limiter.acquire, item['email'])
+                if not decision.allowed:
+                    result.limited.append((item, decision))
+                    continue
+                if decision.delay:
+                    await asyncio.sleep(decision.delay)
+
+                started = time.perf_counter()
+                if client is None or sent_on_connection >= self.messages_per_connection:
+                    if client is not None:
+                        await client.quit()
+                    client = self.client()
+                    sent_on_connection = 0
+                    self.connections_opened += 1
+                    try:
+                        await client.connect()
+                    except (AsyncSMTPError, OSError, asyncio.TimeoutError) as e:
+                        # 인사 / STARTTLS / AUTH 실패(554, 535 등)는 코드와 관계없이 서버 장애입니다.
+                        # 같은 연결로 계속 보내면 남은 메일도 모두 수신자 실패로 기록되므로,
+                        # 남은 메일은 보내지 않고 함께 재시도로 넘깁니다. (서킷 브레이커에 반영)
+                        error = str(e) or e.__class__.__name__
+                        result.provider_error = error
+                        result.failed.append((item, error))
+                        while not queue.empty():
+                            result.failed.append((queue.get_nowait(), error))
+                        client.close()
+                        client = None
+                        return
+
+                try:
+                    await client.sendmail(*self.envelope(item))
+                    sent_on_connection += 1
+                    result.sent.append(item)
+                    self.latencies.append(time.perf_counter() - started)
+                except AsyncSMTPError as e:
+                    result.failed.append((item, str(e)))
+                    if not e.permanent:
+                        result.provider_error = str(e)
+                    if e.permanent and client.writer is not None:
+                        # MAIL / RCPT / DATA 의 5xx(수신자 거부 등)는 연결을 유지하고 트랜잭션만 초기화합니다.
+                        try:
+                            await client.reset()
+                            continue
+                        except (AsyncSMTPError, OSError, asyncio.TimeoutError):
+                            pass
+                    client.close()
+                    client = None
+                except (OSError, asyncio.TimeoutError) as e:
+                    result.failed.append((item, str(e) or e.__class__.__name__))
+                    result.provider_error = str(e) or e.__class__.__name__
+                    client.close()
+                    client = None
+        finally:
+            if client is not None:
+                await client.quit()
+
+    async def deliver_async(self, items):
+        result = BatchResult()
+        queue = asyncio.Queue()
+        for item in items:
+            queue.put_nowait(item)
+
+        workers = min(self.concurrency, len(items))
+        limiter = get_rate_limiter()
+        await asyncio.gather(*(self._worker(queue, result, limiter) for _ in range(workers)))
+        return result
+
+    def deliver(self, items):
+        """동기 코드(Celery 작업)에서 호출합니다."""
+        if not items:
+            return BatchResult()
+        guard_sync_smtp('AsyncDeliveryEngine')
+        return asyncio.run(self.deliver_async(items))
+
+
+def send_batch_async(items):
+    """send_batch() 의 asyncio 엔진 버전"""
+    return AsyncDeliveryEngine().deliver(items)
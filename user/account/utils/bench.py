@@ -0,0 +1,94 @@
+# util/bench.py
+# 벤치마크 management command 들이 공통으로 사용하는 도구 모음
+
+import json
+import math
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.db import connections
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+
+@contextmanager
+def bench_database(verbosity=0, keepdb=False):
+    """
+    운영 DB 를 건드리지 않도록 테스트 DB(test_<NAME>) 를 만들고, 끝나면 삭제합니다.
+    setup_test_environment() 로 이메일 백엔드도 locmem 으로 바뀝니다.
+    """
+    setup_test_environment()
+    connection = connections['default']
+    old_name = connection.creation.create_test_db(verbosity=verbosity, autoclobber=True, keepdb=keepdb)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=verbosity, keepdb=keepdb)
+        teardown_test_environment()
+
+
+def percentile(values, pct):
+    """정렬되지 않은 값 목록의 백분위수 (nearest-rank)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(latencies, elapsed, **extra):
+    """
+    지연 시간(초) 목록과 전체 경과 시간으로 요약 통계를 만듭니다. (ms 단위)
+    """
+    count = len(latencies)
+    summary = {
+        'requests': count,
+        'rps': round(count / elapsed, 2) if elapsed > 0 else 0.0,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 2),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 2),
+        'max_ms': round(max(latencies) * 1000, 2) if latencies else 0.0,
+    }
+    summary.update(extra)
+    return summary
+
+
+def write_json(path, payload):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, ensure_ascii=False, indent=2, default=str)
+
+
+@contextmanager
+def local_json_server(payload, status=200):
+    """
+    외부 API 대신 사용할 로컬 HTTP 서버를 띄우고 URL 을 반환합니다.
+    모든 요청(GET/POST)에 payload 를 JSON 으로 응답합니다.
+    """
+    body = json.dumps(payload).encode('utf-8')
+
+    class Handler(BaseHTTPRequestHandler):
+        def _respond(self):
+            length = int(self.headers.get('Content-Length') or 0)
+            if length:
+                self.rfile.read(length)
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        do_GET = do_POST = _respond
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        host, port = server.server_address
+        yield f'http://{host}:{port}/'
+    finally:
+        server.shutdown()
+        server.server_close()
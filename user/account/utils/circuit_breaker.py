@@ -0,0 +1,210 @@
+# util/circuit_breaker.py
+#
+# 이메일 재시도용 지수 백오프(지터 포함)와 SMTP 호스트별 서킷 브레이커
+#
+#   - 재시도 간격을 고정(60초)으로 두면 장애 동안 쌓인 작업이 같은 시각에 함께 깨어나 다시 실패합니다.
+#     backoff_delay() 는 시도 횟수마다 간격을 두 배로 늘리고, 그 안에서 무작위로 흩어 놓습니다.
+#   - 같은 SMTP 호스트에서 연속으로 실패하면 브레이커를 열고(OPEN), 열려 있는 동안에는 SMTP 에 접속하지 않고
+#     재시도를 미뤄(park) 워커를 바로 돌려줍니다. OPEN_SECONDS 가 지나면 한 작업만 시험 전송(HALF_OPEN)하고,
+#     성공하면 닫고(CLOSED) 실패하면 다시 엽니다.
+#
+# 판단에 쓰는 상태는 공유 캐시에 두고(전송마다 DB 를 조회하지 않음), 상태가 바뀔 때만
+# SMTPCircuitState 행에 기록해 관리자 페이지에서 확인할 수 있게 합니다.
+
+import asyncio
+import random
+import smtplib
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import F
+from django.utils import timezone
+
+from ..models import SMTPCircuitState
+
+DEFAULT_EMAIL_CIRCUIT_BREAKER = {
+    # 브레이커 상태를 공유할 캐시 alias (웹 / 워커 프로세스가 같은 캐시를 사용해야 합니다.)
+    'ALIAS': 'default',
+    # 이 횟수만큼 연속으로 SMTP 서버 장애가 나면 브레이커를 엽니다.
+    'FAILURE_THRESHOLD': 5,
+    # 연속 실패로 보는 시간 (초). 이 시간 동안 실패가 없으면 횟수를 다시 셉니다.
+    'FAILURE_WINDOW': 60,
+    # 브레이커를 열어 두는 시간 (초). 지나면 한 번 시험 전송합니다.
+    'OPEN_SECONDS': 60,
+    # 재시도 간격: BACKOFF_BASE * 2^(시도-1) 초, 최대 BACKOFF_MAX 초 (지터 포함)
+    'BACKOFF_BASE': 30,
+    'BACKOFF_MAX': 15 * 60,
+}
+
+STATE_CLOSED = 'closed'
+STATE_OPEN = 'open'
+STATE_HALF_OPEN = 'half_open'
+
+
+def _get_config():
+    config = dict(DEFAULT_EMAIL_CIRCUIT_BREAKER)
+    config.update(getattr(settings, 'EMAIL_CIRCUIT_BREAKER', {}))
+    return config
+
+
+def backoff_delay(attempt, base=None, cap=None):
+    """
+    attempt 번째 실패 후 재시도까지 기다릴 시간 (초)
+
+    "equal jitter": 상한의 절반은 보장하고 나머지 절반을 무작위로 흩어 놓습니다.
+    (같은 시각에 실패한 작업들이 같은 시각에 다시 깨어나지 않고, 너무 빨리 재시도하지도 않습니다.)
+    """
+    config = _get_config()
+    base = base or config['BACKOFF_BASE']
+    cap = cap or config['BACKOFF_MAX']
+    ceiling = min(cap, base * 2 ** max(attempt - 1, 0))
+    return ceiling / 2 + random.uniform(0, ceiling / 2)
+
+
+# SMTP 서버(공급자) 장애로 보는 오류. 수신자 거부(5xx) 같은 메일 한 통의 문제는 브레이커에 반영하지 않습니다.
+PROVIDER_ERRORS = (
+    smtplib.SMTPServerDisconnected,
+    smtplib.SMTPConnectError,
+    smtplib.SMTPHeloError,
+    smtplib.SMTPAuthenticationError,
+    OSError,
+    asyncio.TimeoutError,
+)
+
+
+def is_provider_error(exc):
+    if isinstance(exc, smtplib.SMTPRecipientsRefused):
+        return False
+    if isinstance(exc, PROVIDER_ERRORS):
+        return True
+    # 4xx: 서버 과부하 등 일시적 장애
+    code = getattr(exc, 'smtp_code', None) or getattr(exc, 'code', None)
+    return isinstance(code, int) and 400 <= code < 500
+
+
+class SMTPCircuitBreaker:
+    """
+    SMTP 호스트 하나의 서킷 브레이커
+
+    캐시 키 구성 (smtp_circuit:<host>:...)
+        failures  : 연속 실패 횟수 (FAILURE_WINDOW 후 만료)
+        open_until: 브레이커가 열려 있는 마감 시각 (없으면 닫힘)
+        probe     : 시험 전송 선점 표시 (HALF_OPEN 에서 한 작업만)
+    """
+    KEY_PREFIX = 'smtp_circuit'
+
+    def __init__(self, host=None, alias=None, failure_threshold=None, failure_window=None, open_seconds=None):
+        config = _get_config()
+        self.host = host or settings.EMAIL_HOST
+        self.alias = alias or config['ALIAS']
+        self.failure_threshold = failure_threshold or config['FAILURE_THRESHOLD']
+        self.failure_window = failure_window or config['FAILURE_WINDOW']
+        self.open_seconds = open_seconds or config['OPEN_SECONDS']
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def key(self, name):
+        return f'{self.KEY_PREFIX}:{self.host}:{name}'
+
+    def _incr(self, key, ttl):
+        self.cache.add(key, 0, ttl)
+        try:
+            return self.cache.incr(key)
+        except ValueError:
+            self.cache.add(key, 0, ttl)
+            return self.cache.incr(key)
+
+    # --- 상태 조회 ---
+    def open_until(self):
+        return self.cache.get(self.key('open_until'))
+
+    @property
+    def state(self):
+        open_until = self.open_until()
+        if open_until is None:
+            return STATE_CLOSED
+        return STATE_OPEN if timezone.now() < open_until else STATE_HALF_OPEN
+
+    def retry_after(self):
+        """브레이커가 열려 있으면 시험 전송이 가능해질 때까지 남은 시간 (초), 아니면 0"""
+        open_until = self.open_until()
+        if open_until is None:
+            return 0
+        return max((open_until - timezone.now()).total_seconds(), 0)
+
+    def park_delay(self):
+        """
+        열려 있는 동안 미룬 작업을 다시 실행할 시간 (초)
+        마감 시각에 한꺼번에 깨어나지 않도록 OPEN_SECONDS 안에서 흩어 놓습니다.
+        """
+        return self.retry_after() + random.uniform(0, self.open_seconds)
+
+    def allow_request(self):
+        """
+        지금 SMTP 로 보내도 되는지 확인합니다.
+        HALF_OPEN 에서는 시험 전송을 선점한 한 작업만 True 를 받습니다.
+        """
+        state = self.state
+        if state == STATE_CLOSED:
+            return True
+        if state == STATE_OPEN:
+            return False
+        if self.cache.add(self.key('probe'), 1, self.open_seconds):
+            self._persist(STATE_HALF_OPEN)
+            return True
+        return False
+
+    # --- 결과 기록 ---
+    def record_success(self):
+        if self.open_until() is not None:
+            self.cache.delete_many([self.key('open_until'), self.key('probe')])
+            self._persist(STATE_CLOSED, failure_count=0)
+            print(f"✅ SMTP 서킷 브레이커 닫힘: {self.host}")
+        self.cache.delete(self.key('failures'))
+
+    def record_failure(self, error=''):
+        """SMTP 서버 장애 1회를 기록하고, 브레이커가 열렸으면 True 를 반환합니다."""
+        count = self._incr(self.key('failures'), self.failure_window)
+        # 시험 전송이 실패하면 바로 다시 엽니다.
+        if count >= self.failure_threshold or self.state == STATE_HALF_OPEN:
+            self.trip(count, error)
+            return True
+        return False
+
+    def trip(self, count=None, error=''):
+        opened_at = timezone.now()
+        open_until = opened_at + timedelta(seconds=self.open_seconds)
+        self.cache.set(self.key('open_until'), open_until, self.open_seconds + self.failure_window)
+        self.cache.delete_many([self.key('failures'), self.key('probe')])
+        self._persist(STATE_OPEN, failure_count=count, opened_at=opened_at, open_until=open_until,
+                      last_error=str(error)[:1000], trip=True)
+        print(f"🚧 SMTP 서킷 브레이커 열림: {self.host} ({self.open_seconds}초) - {error}")
+
+    def reset(self):
+        """관리자 페이지에서 강제로 닫을 때 사용합니다."""
+        self.cache.delete_many([self.key('failures'), self.key('open_until'), self.key('probe')])
+        self._persist(STATE_CLOSED, failure_count=0)
+
+    def _persist(self, state, trip=False, **fields):
+        """상태가 바뀔 때만 호출됩니다. 기록에 실패해도 전송 흐름은 계속합니다."""
+        fields = {name: value for name, value in fields.items() if value is not None}
+        fields['state'] = state
+        if trip:
+            fields['trip_count'] = F('trip_count') + 1
+        try:
+            updated = SMTPCircuitState.objects.filter(host=self.host).update(
+                updated_at=timezone.now(), **fields
+            )
+            if not updated:
+                fields['trip_count'] = 1 if trip else 0
+                SMTPCircuitState.objects.get_or_create(host=self.host, defaults=fields)
+        except Exception as e:
+            print(f"SMTP 서킷 브레이커 상태 기록 실패: {e}")
+
+
+def smtp_circuit(host=None):
+    """EMAIL_HOST(기본) 의 서킷 브레이커"""
+    return SMTPCircuitBreaker(host)
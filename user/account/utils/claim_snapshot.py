@@ -0,0 +1,99 @@
+# util/claim_snapshot.py
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from .claims import CLAIMS_PROFILE_FULL, CLAIMS_SCHEMA
+from .login_pipeline import LoginSnapshot
+from .user_loader import UserLoader
+
+DEFAULT_CLAIM_SNAPSHOT_CACHE = {
+    # 공유 캐시(settings.CACHES) alias
+    'ALIAS': 'default',
+    # 스냅샷 보관 시간 (초). 시그널로 무효화되지 않는 변경(QuerySet.update 등)은 최대 이 시간만큼 늦게 반영됩니다.
+    'TTL': 300,
+}
+
+
+def _get_config():
+    config = dict(DEFAULT_CLAIM_SNAPSHOT_CACHE)
+    config.update(getattr(settings, 'CLAIM_SNAPSHOT_CACHE', {}))
+    return config
+
+
+class ClaimSnapshotCache:
+    """
+    토큰 재발급(api/token/refresh/) 시 사용하는 사용자별 클레임 스냅샷 캐시.
+
+    스냅샷 구성 (dict)
+        is_active : 계정 활성 상태 (재발급 허용 여부 판단)
+        claims    : LoginSnapshot.apply_claims() 결과 (full 프로필)
+
+    UserInfo / UserEmail / ApprovalRequest 저장/삭제 시 시그널에서 invalidate() 가 호출되고,
+    캐시에 없으면 DB 에서 다시 만듭니다. (사용자 1회 + PENDING 승인 요청 1회)
+    """
+    KEY_PREFIX = 'claims'
+
+    @classmethod
+    def key(cls, user_id):
+        # 클레임 구성(CLAIMS_SCHEMA)이 바뀌면 이전 스냅샷은 자연스럽게 사용되지 않습니다.
+        return f'{cls.KEY_PREFIX}:{CLAIMS_SCHEMA}:{user_id}'
+
+    @classmethod
+    def cache(cls):
+        return caches[_get_config()['ALIAS']]
+
+    @staticmethod
+    def build(login_snapshot):
+        claims = login_snapshot.apply_claims({}, CLAIMS_PROFILE_FULL)
+        # ReturnList / ReturnDict 를 일반 list / dict 로 바꿔 캐시에 저장합니다.
+        claims['approval_list'] = [dict(item) for item in claims['approval_list']]
+        return {
+            'is_active': login_snapshot.user.is_active,
+            'claims': claims,
+        }
+
+    @classmethod
+    def get(cls, user_id):
+        """
+        Raises:
+            UserInfo.DoesNotExist: 사용자가 없을 경우
+        """
+        key = cls.key(user_id)
+        try:
+            snapshot = cls.cache().get(key)
+        except Exception as e:
+            print(f"클레임 스냅샷 캐시 조회 실패: {e}")
+            snapshot = None
+
+        if snapshot is not None:
+            return snapshot
+
+        return cls.set(LoginSnapshot(UserLoader.get(pk=user_id)))
+
+    @classmethod
+    def set(cls, login_snapshot):
+        """로그인 등에서 이미 만든 LoginSnapshot 으로 스냅샷을 저장합니다. (추가 쿼리 없음)"""
+        snapshot = cls.build(login_snapshot)
+        try:
+            cls.cache().set(cls.key(login_snapshot.user.pk), snapshot, _get_config()['TTL'])
+        except Exception as e:
+            print(f"클레임 스냅샷 캐시 저장 실패: {e}")
+        return snapshot
+
+    @classmethod
+    def delete(cls, user_id):
+        try:
+            cls.cache().delete(cls.key(user_id))
+        except Exception as e:
+            print(f"클레임 스냅샷 캐시 삭제 실패: {e}")
+
+    @classmethod
+    def invalidate(cls, user_id):
+        """
+        즉시 삭제하고, 트랜잭션 안이라면 커밋 후에 한 번 더 삭제합니다.
+        (커밋 전에 다른 요청이 이전 값으로 스냅샷을 다시 만든 경우를 정리)
+        """
+        cls.delete(user_id)
+        transaction.on_commit(lambda: cls.delete(user_id))
@@ -0,0 +1,33 @@
+# util/claims.py
+
+import hashlib
+
+from django.conf import settings
+
+# JWT 클레임 프로필
+# - compact : 고정 크기 클레임만 포함 (approval_status, approval_count, claims_version)
+# - full    : 기존 방식. approval_list 전체를 토큰에 포함
+CLAIMS_PROFILE_COMPACT = 'compact'
+CLAIMS_PROFILE_FULL = 'full'
+CLAIMS_PROFILES = (CLAIMS_PROFILE_COMPACT, CLAIMS_PROFILE_FULL)
+
+# 클레임 구성이 바뀌면 올려서 이전 버전 값과 충돌하지 않도록 합니다.
+CLAIMS_SCHEMA = 1
+
+
+def get_claims_profile():
+    """settings.JWT_CLAIMS_PROFILE 값을 반환합니다. (잘못된 값이면 ValueError)"""
+    profile = getattr(settings, 'JWT_CLAIMS_PROFILE', CLAIMS_PROFILE_COMPACT)
+    if profile not in CLAIMS_PROFILES:
+        raise ValueError(f"지원하지 않는 JWT_CLAIMS_PROFILE 입니다: {profile}")
+    return profile
+
+
+def approval_version(request_ids):
+    """
+    PENDING 승인 요청 id 목록으로 짧은 버전 문자열을 만듭니다.
+    목록이 같으면 항상 같은 값이 나오므로, 앱은 토큰의 claims_version 과
+    delta API 의 version 을 비교해 목록 재조회 여부를 판단할 수 있습니다.
+    """
+    raw = f"{CLAIMS_SCHEMA}:" + ",".join(str(i) for i in sorted(request_ids))
+    return hashlib.sha1(raw.encode('ascii')).hexdigest()[:12]
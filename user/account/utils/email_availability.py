@@ -0,0 +1,57 @@
+# util/email_availability.py
+#
+# 회원가입 / 이메일 변경에서 쓰는 이메일 사용 가능 여부 확인
+#
+#   - 변경 전에는 email 중복(filter(email=...))과 다른 사용자의 변경 대기(filter(new_email=...).exclude(pk=...))를
+#     쿼리 2번으로 확인했고, new_email 에는 인덱스가 없어 두 번째 쿼리가 user_info 전체를 읽었습니다.
+#   - check_email() 은 email_normalized / new_email 인덱스(UserInfo.Meta.indexes)로 찾은 행만
+#     조건별로 세어 쿼리 1번으로 판단합니다. (MySQL: index_merge union, sqlite: MULTI-INDEX OR)
+#   - email 은 email_normalized(소문자)로 비교하므로 DB collation 과 관계없이 대소문자를 구분하지 않습니다.
+#     new_email 은 저장한 값 그대로 비교합니다. (MySQL 기본 collation 에서는 대소문자 구분 없음)
+
+from django.db.models import Count, Q
+
+from ..models import UserInfo
+
+AVAILABLE = 'available'
+REASON_SAME = 'same'        # 요청한 사용자 자신의 현재 email
+REASON_TAKEN = 'taken'      # 다른 사용자가 사용 중
+REASON_PENDING = 'pending'  # 다른 사용자가 변경 요청 중 (new_email)
+
+MESSAGES = {
+    REASON_SAME: '기존 이메일 주소와 동일합니다.',
+    REASON_TAKEN: '사용 불가 이메일 주소입니다.',
+    REASON_PENDING: '현재 다른 사용자가 변경 요청 중인 이메일 주소입니다.',
+}
+
+
+def availability_queryset(email):
+    """email 이 현재 email 이거나 변경 대기 중인 행 (인덱스 두 개로만 찾습니다)"""
+    return UserInfo.objects.filter(Q(email_normalized=UserInfo.objects.email_key(email)) | Q(new_email=email))
+
+
+def check_email(email, user=None):
+    """
+    email 을 user(회원가입이면 None)가 새로 사용할 수 있는지 확인합니다.
+    Returns:
+        AVAILABLE 또는 REASON_SAME / REASON_TAKEN / REASON_PENDING
+    """
+    key = UserInfo.objects.email_key(email)
+    aggregates = {
+        'taken': Count('pk', filter=Q(email_normalized=key)),
+        'pending': Count('pk', filter=Q(new_email=email)),
+    }
+    if user is not None:
+        aggregates = {
+            'same': Count('pk', filter=Q(pk=user.pk, email_normalized=key)),
+            'taken': Count('pk', filter=Q(email_normalized=key) & ~Q(pk=user.pk)),
+            'pending': Count('pk', filter=Q(new_email=email) & ~Q(pk=user.pk)),
+        }
+    counts = availability_queryset(email).aggregate(**aggregates)
+    if counts.get('same'):
+        return REASON_SAME
+    if counts['taken']:
+        return REASON_TAKEN
+    if counts['pending']:
+        return REASON_PENDING
+    return AVAILABLE
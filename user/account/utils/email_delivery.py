@@ -0,0 +1,77 @@
+# util/email_delivery.py
+#
+# 메일 전송 요청의 단일 진입점과 요청 안 동기 SMTP 방지
+#
+#   - send_email(): 뷰 / serializer 는 이 함수로만 메일을 요청합니다. (아웃박스에 저장 -> 커밋 후 워커가 전송)
+#     호출 지점(call_site)별 요청 시간(enqueue 지연)을 log_events.metrics.timings 에 기록합니다.
+#   - guard_sync_smtp(): SMTP 백엔드 / asyncio 엔진이 전송 직전에 호출합니다.
+#     웹 요청(log_events 미들웨어의 measure_request) 안에서 SMTP 로 직접 보내려 하면
+#     DEBUG 에서는 예외를 발생시키고, 운영에서는 출력 / 집계만 하고 그대로 보냅니다.
+
+import time
+import traceback
+
+from django.conf import settings
+
+from log_events.metrics import current_measurement, measure_phase, timings
+
+from .email_outbox import queue_auth_email
+from .email_templates import KIND_VERIFY
+
+DEFAULT_EMAIL_DELIVERY = {
+    # 요청 안 동기 SMTP 전송 처리: 'raise' / 'log' / None (None 이면 DEBUG 에서 raise, 아니면 log)
+    'SYNC_SMTP_IN_REQUEST': None,
+}
+
+MODE_RAISE = 'raise'
+MODE_LOG = 'log'
+
+# timings 그룹 / 요청 측정 phase 이름
+TIMING_EMAIL_ENQUEUE = 'email_enqueue'
+TIMING_SYNC_SMTP = 'sync_smtp_in_request'
+
+
+def _get_config():
+    config = dict(DEFAULT_EMAIL_DELIVERY)
+    config.update(getattr(settings, 'EMAIL_DELIVERY', {}))
+    return config
+
+
+class SynchronousEmailError(RuntimeError):
+    """웹 요청 안에서 SMTP 로 직접 메일을 보내려 한 경우 (DEBUG)"""
+
+
+def sync_smtp_mode():
+    mode = _get_config()['SYNC_SMTP_IN_REQUEST']
+    if mode is None:
+        return MODE_RAISE if settings.DEBUG else MODE_LOG
+    return mode
+
+
+def guard_sync_smtp(where):
+    """
+    SMTP 전송 직전에 호출합니다. 웹 요청 밖(Celery 작업, 관리 명령)에서는 아무것도 하지 않습니다.
+    요청 안이면 MODE_RAISE 에서는 SynchronousEmailError, MODE_LOG 에서는 출력 후 계속 진행합니다.
+    """
+    measurement = current_measurement()
+    if measurement is None:
+        return
+    endpoint = measurement.endpoint or '<unresolved>'
+    # 요청마다 0ms 로 1회 기록해 엔드포인트별 위반 횟수를 셉니다.
+    timings.observe(TIMING_SYNC_SMTP, f'{endpoint}:{where}', 0)
+    message = (f"웹 요청({endpoint}) 안에서 SMTP 로 직접 메일을 보내려 했습니다 ({where}). "
+               f"utils/email_delivery.send_email() 로 요청해 주세요.")
+    if sync_smtp_mode() == MODE_RAISE:
+        raise SynchronousEmailError(message)
+    print(f"⚠️ {message}\n{''.join(traceback.format_stack(limit=8)[:-1])}")
+
+
+def send_email(email, code, kind=KIND_VERIFY, call_site='unknown'):
+    """
+    인증 코드 메일 전송을 요청합니다. (요청 처리 중에는 SMTP 에 접속하지 않습니다.)
+    call_site: 호출 지점 이름. timings['email_enqueue'][call_site] 로 요청 시간이 집계됩니다.
+    """
+    started = time.perf_counter()
+    with measure_phase(TIMING_EMAIL_ENQUEUE):
+        queue_auth_email(email, code, kind)
+    timings.observe(TIMING_EMAIL_ENQUEUE, call_site, (time.perf_counter() - started) * 1000)
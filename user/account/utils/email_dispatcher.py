@@ -0,0 +1,261 @@
+# util/email_dispatcher.py
+
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.mail import EmailMultiAlternatives, get_connection
+
+from .circuit_breaker import is_provider_error
+from .email_templates import KIND_VERIFY, render
+from .rate_limiter import LIMIT_GLOBAL, get_rate_limiter
+
+DEFAULT_EMAIL_BATCH = {
+    # False 면 기존처럼 메일 1통마다 send_auth_email_task 를 실행합니다. (utils/email_outbox.handoff)
+    'ENABLED': True,
+    # 대기열로 사용할 공유 캐시 alias (워커 / 웹 프로세스가 같은 캐시를 사용해야 합니다.)
+    'ALIAS': 'default',
+    # 첫 메일이 대기열에 들어온 뒤 이 시간(초) 동안 모아서 한 번에 보냅니다.
+    'WINDOW': 2,
+    # 한 번에 보낼 최대 메일 수. 대기열이 이만큼 차면 WINDOW 를 기다리지 않고 바로 보냅니다.
+    'MAX_SIZE': 50,
+    # 수신자별 최대 전송 시도 횟수 (초과 시 FINAL_FAILURE 로 기록)
+    'MAX_ATTEMPTS': 3,
+    # 전송 방식. 'smtp': EMAIL_BACKEND 연결 하나로 순서대로, 'async': utils/async_smtp.py 로 여러 연결에서 동시에
+    'ENGINE': 'smtp',
+    # flush 잠금 유지 시간 (초). 꺼낸 메일을 다 보낼 때까지 잠그므로 한 묶음 전송 시간보다 길게 둡니다.
+    # 워커가 죽으면 이 시간이 지난 뒤 다른 flush 가 같은 메일을 다시 보냅니다.
+    'LOCK_TIMEOUT': 300,
+    # 번호만 받고 저장되지 않은 메일(push 중 워커 종료 등)을 이 시간(초)이 지나면 건너뜁니다.
+    'MISSING_GRACE': 30,
+}
+
+ENGINE_SMTP = 'smtp'
+ENGINE_ASYNC = 'async'
+
+
+def _get_config():
+    config = dict(DEFAULT_EMAIL_BATCH)
+    config.update(getattr(settings, 'EMAIL_BATCH', {}))
+    return config
+
+
+def build_email(kind, to, connection=None, **context):
+    """등록된 템플릿(utils/email_templates.py)으로 텍스트 + HTML 메일을 만듭니다."""
+    rendered = render(kind, **context)
+    message = EmailMultiAlternatives(
+        subject=rendered.subject,
+        body=rendered.text,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=to,
+        connection=connection,
+    )
+    message.attach_alternative(rendered.html, 'text/html')
+    return message
+
+
+def build_auth_email(email, code, kind=KIND_VERIFY, connection=None):
+    """인증 코드 메일 (회원가입 / 이메일 변경)"""
+    return build_email(kind, [email], connection, code=code)
+
+
+class BatchResult:
+    """send_batch() 결과 (수신자별)"""
+
+    def __init__(self):
+        self.sent = []
+        # (item, error_message)
+        self.failed = []
+        # SMTP 서버 장애(연결 실패 / 4xx 등)가 있었으면 마지막 오류 메시지 (서킷 브레이커에 반영)
+        self.provider_error = None
+        # 발송 한도(utils/rate_limiter.py)에 걸려 보내지 않은 메일 (item, RateDecision)
+        self.limited = []
+
+
+class EmailBatchQueue:
+    """
+    인증 / 이메일 변경 메일을 공유 캐시에 모아 두는 대기열.
+
+    캐시 키 구성
+        email_batch:tail     : 마지막으로 넣은 번호 (incr)
+        email_batch:head     : 마지막으로 꺼낸 번호
+        email_batch:item:<n> : n 번 메일 {'email', 'code', 'kind', 'attempt'}
+        email_batch:scheduled: flush 작업 예약 여부 (WINDOW 동안 한 번만 예약)
+        email_batch:flushing : flush 실행 잠금 (동시에 한 워커만 꺼내서 보냄)
+        email_batch:missing:<n> : n 번 메일이 없다는 것을 처음 확인한 시각 (MISSING_GRACE)
+
+    claim_batch() 로 꺼낸 메일은 보낸 뒤 ack() 를 호출해야 대기열에서 지워집니다. (최소 1회 전송)
+    """
+    KEY_PREFIX = 'email_batch'
+
+    def __init__(self, window=None, max_size=None, alias=None):
+        config = _get_config()
+        self.window = window if window is not None else config['WINDOW']
+        self.max_size = max_size or config['MAX_SIZE']
+        self.alias = alias or config['ALIAS']
+        self.max_attempts = config['MAX_ATTEMPTS']
+        self.lock_timeout = config['LOCK_TIMEOUT']
+        self.missing_grace = config['MISSING_GRACE']
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def key(self, name):
+        return f'{self.KEY_PREFIX}:{name}'
+
+    def _incr(self, key):
+        self.cache.add(key, 0, None)
+        try:
+            return self.cache.incr(key)
+        except ValueError:
+            self.cache.add(key, 0, None)
+            return self.cache.incr(key)
+
+    def __len__(self):
+        return max(self.cache.get(self.key('tail'), 0) - self.cache.get(self.key('head'), 0), 0)
+
+    def push(self, item):
+        """메일을 넣고, 대기열 길이를 반환합니다."""
+        number = self._incr(self.key('tail'))
+        self.cache.set(self.key(f'item:{number}'), item, None)
+        return number - self.cache.get(self.key('head'), 0)
+
+    def mark_scheduled(self):
+        """이번 WINDOW 에 처음 들어온 메일이면 True (flush 예약 필요)"""
+        return self.cache.add(self.key('scheduled'), 1, self.window + 60)
+
+    def clear_scheduled(self):
+        self.cache.delete(self.key('scheduled'))
+
+    def _missing_expired(self, number):
+        """n 번 메일이 없는 상태로 MISSING_GRACE 가 지났으면 True"""
+        key = self.key(f'missing:{number}')
+        self.cache.add(key, time.time(), self.missing_grace + 3600)
+        first_seen = self.cache.get(key)
+        return first_seen is None or time.time() - first_seen >= self.missing_grace
+
+    def claim_batch(self):
+        """
+        최대 MAX_SIZE 개의 메일과 마지막 번호를 반환합니다. 대기열에서는 아직 지우지 않습니다.
+        보낸 뒤 ack(last) 를, 끝나면 성공 여부와 관계없이 release() 를 호출해야 합니다.
+        다른 워커가 보내는 중이면 ([], None) 을 반환합니다.
+
+        번호는 받았지만 아직 저장되지 않은 메일(push 진행 중)을 만나면 거기서 멈추고,
+        MISSING_GRACE 가 지나도 없으면 건너뜁니다. (대기열이 그 번호에서 멈추지 않도록)
+        """
+        if not self.cache.add(self.key('flushing'), 1, self.lock_timeout):
+            return [], None
+        head = self.cache.get(self.key('head'), 0)
+        tail = self.cache.get(self.key('tail'), 0)
+        items = []
+        number = head
+        while number < tail and len(items) < self.max_size:
+            item = self.cache.get(self.key(f'item:{number + 1}'))
+            if item is None:
+                if not self._missing_expired(number + 1):
+                    break
+                print(f"⚠️ 이메일 대기열: {number + 1}번 메일이 저장되지 않아 건너뜁니다.")
+            else:
+                items.append(item)
+            number += 1
+        return items, number
+
+    def ack(self, last):
+        """claim_batch() 로 꺼낸 메일(last 번까지)을 대기열에서 지웁니다."""
+        head = self.cache.get(self.key('head'), 0)
+        if last <= head:
+            return
+        numbers = range(head + 1, last + 1)
+        self.cache.delete_many(
+            [self.key(f'item:{n}') for n in numbers] + [self.key(f'missing:{n}') for n in numbers]
+        )
+        self.cache.set(self.key('head'), last, None)
+
+    def release(self):
+        self.cache.delete(self.key('flushing'))
+
+def batching_enabled():
+    return _get_config()['ENABLED']
+
+
+def enqueue(item):
+    """대기열에 넣고, 필요하면 flush 작업을 예약합니다."""
+    from ..tasks import flush_email_batch_task
+
+    queue = EmailBatchQueue()
+    size = queue.push(item)
+
+    if size >= queue.max_size:
+        # 대기열이 가득 찼으면 WINDOW 를 기다리지 않고 바로 보냅니다.
+        flush_email_batch_task.delay()
+    elif queue.mark_scheduled():
+        flush_email_batch_task.apply_async(countdown=queue.window)
+
+
+def defer(items, countdown):
+    """
+    재시도 / 발송 한도로 미룬 메일을 countdown 초 뒤에 대기열에 넣습니다. (requeue_email_task)
+    기다리는 동안에는 대기열 밖에 있으므로 새로 들어온 메일의 flush 를 늦추지 않고,
+    새 메일의 flush 에 섞여 백오프보다 먼저 다시 보내지지도 않습니다.
+    """
+    from ..tasks import requeue_email_task
+
+    if items:
+        requeue_email_task.apply_async(args=(list(items),), countdown=countdown)
+
+
+def send_batch(items, connection=None):
+    """
+    메일들을 SMTP 연결 하나로 보냅니다. 연결은 한 번만 열고 메일마다 send_messages() 를 호출해
+    수신자별 성공 / 실패를 구분합니다. (한 통이 실패해도 나머지는 계속 보냅니다.)
+    메일마다 발송 한도 토큰을 받고, 계정 한도가 MAX_WAIT 이상 비면 남은 메일은 모두 limited 로 돌려줍니다.
+    """
+    result = BatchResult()
+    if not items:
+        return result
+
+    connection = connection or get_connection()
+    try:
+        connection.open()
+    except Exception as e:
+        result.failed = [(item, str(e)) for item in items]
+        result.provider_error = str(e)
+        return result
+
+    limiter = get_rate_limiter()
+    try:
+        for index, item in enumerate(items):
+            decision = limiter.acquire(item['email'])
+            if not decision.allowed:
+                if decision.reason == LIMIT_GLOBAL:
+                    result.limited.extend((rest, decision) for rest in items[index:])
+                    break
+                result.limited.append((item, decision))
+                continue
+            if decision.delay:
+                time.sleep(decision.delay)
+
+            message = build_auth_email(item['email'], item['code'], item.get('kind', KIND_VERIFY), connection)
+            try:
+                sent = connection.send_messages([message])
+            except Exception as e:
+                result.failed.append((item, str(e)))
+                if is_provider_error(e):
+                    result.provider_error = str(e)
+                continue
+            if sent:
+                result.sent.append(item)
+            else:
+                result.failed.append((item, '전송되지 않았습니다.'))
+    finally:
+        connection.close()
+    return result
+
+
+def deliver(items):
+    """설정(EMAIL_BATCH['ENGINE'])에 따라 send_batch() 또는 asyncio 엔진으로 보냅니다."""
+    if _get_config()['ENGINE'] == ENGINE_ASYNC:
+        from .async_smtp import send_batch_async
+        return send_batch_async(items)
+    return send_batch(items)
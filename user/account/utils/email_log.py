@@ -0,0 +1,171 @@
+# util/email_log.py
+#
+# EmailLog 기록 / 정리
+#
+#   - EmailLogBuffer: 워커 프로세스 안에 로그 행을 모았다가 bulk_create 한 번으로 저장합니다.
+#     (공급자 장애 중 메일마다 INSERT 하던 것을 BUFFER_SIZE 개 / FLUSH_INTERVAL 초 단위로 묶음)
+#     작업 종료(task_postrun)와 워커 프로세스 종료 시에도 비우고, 작업이 더 오지 않는 유휴 프로세스는 타이머로 비웁니다.
+#     최종 실패(FINAL_FAILURE)처럼 잃으면 안 되는 행은 모으지 않고 바로 저장합니다. (IMMEDIATE_TYPES)
+#   - purge_email_logs: 보관 기간이 지난 행을 CHUNK_SIZE 개씩 나눠 삭제합니다.
+#     한 번의 DELETE 로 테이블 전체를 오래 잠그지 않도록 청크 사이에 잠시 쉬고, 한 번에 MAX_CHUNKS 까지만 지웁니다.
+
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+
+from ..models import EmailLog
+
+DEFAULT_EMAIL_LOG = {
+    # 모아 둘 최대 행 수 (도달하면 바로 저장)
+    'BUFFER_SIZE': 200,
+    # 첫 행을 넣은 뒤 이 시간(초)이 지나면 저장
+    'FLUSH_INTERVAL': 5,
+    # 모으지 않고 바로 저장할 log_type (버퍼에 남아 있던 행도 같은 INSERT 로 함께 저장)
+    'IMMEDIATE_TYPES': ('FINAL_FAILURE',),
+    # 보관 기간 (일)
+    'RETENTION_DAYS': 30,
+    # 정리 작업: 한 번에 삭제할 행 수 / 청크 사이 쉬는 시간 (초) / 작업 1회당 최대 청크 수
+    'PURGE_CHUNK_SIZE': 1000,
+    'PURGE_PAUSE': 0.05,
+    'PURGE_MAX_CHUNKS': 100,
+}
+
+
+def _get_config():
+    config = dict(DEFAULT_EMAIL_LOG)
+    config.update(getattr(settings, 'EMAIL_LOG', {}))
+    return config
+
+
+class EmailLogBuffer:
+    """
+    프로세스 단위 EmailLog 버퍼
+
+    워커가 강제 종료(SIGKILL)되면 저장되지 않은 행(최대 FLUSH_INTERVAL 초 분량)은 사라집니다.
+    IMMEDIATE_TYPES 의 행은 버퍼에 남기지 않으므로 영향이 없습니다.
+    """
+
+    def __init__(self, buffer_size=None, flush_interval=None, immediate_types=None):
+        config = _get_config()
+        self.buffer_size = buffer_size or config['BUFFER_SIZE']
+        self.flush_interval = config['FLUSH_INTERVAL'] if flush_interval is None else flush_interval
+        self.immediate_types = set(config['IMMEDIATE_TYPES'] if immediate_types is None else immediate_types)
+        self._rows = []
+        self._first_added = None
+        self._timer = None
+        self._lock = threading.Lock()
+        self.flushed = 0
+
+    def __len__(self):
+        return len(self._rows)
+
+    def add(self, email, log_type, task_id=None, error_message=None):
+        self.extend([EmailLog(email=email, log_type=log_type, task_id=task_id, error_message=error_message)])
+
+    def extend(self, logs):
+        with self._lock:
+            if not self._rows:
+                self._first_added = time.monotonic()
+                self._start_timer()
+            self._rows.extend(logs)
+        if any(log.log_type in self.immediate_types for log in logs):
+            self.flush()
+        else:
+            self.flush_if_due()
+
+    def _start_timer(self):
+        # 다음 작업이 오지 않아 task_postrun 이 실행되지 않는(유휴) 프로세스에서도 FLUSH_INTERVAL 뒤에 저장합니다.
+        if self.flush_interval <= 0:
+            return
+        self._timer = threading.Timer(self.flush_interval, self._flush_on_timer)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _flush_on_timer(self):
+        try:
+            self.flush()
+        finally:
+            # 타이머 스레드에서 연 DB 연결을 닫습니다.
+            connections.close_all()
+
+    def due(self):
+        if not self._rows:
+            return False
+        return (len(self._rows) >= self.buffer_size
+                or time.monotonic() - self._first_added >= self.flush_interval)
+
+    def flush_if_due(self):
+        if self.due():
+            return self.flush()
+        return 0
+
+    def flush(self):
+        """모아 둔 행을 저장하고 저장한 행 수를 반환합니다. 저장에 실패하면 행을 버리고 출력만 합니다."""
+        with self._lock:
+            rows, self._rows = self._rows, []
+            self._first_added = None
+            timer, self._timer = self._timer, None
+        if timer is not None:
+            timer.cancel()
+        if not rows:
+            return 0
+        # created_at(auto_now_add)은 저장 시각이므로 실제 발생 시각보다 최대 FLUSH_INTERVAL 늦을 수 있습니다.
+        try:
+            EmailLog.objects.bulk_create(rows, batch_size=self.buffer_size)
+        except Exception as e:
+            print(f"EmailLog 일괄 저장 실패 ({len(rows)}건): {e}")
+            return 0
+        self.flushed += len(rows)
+        return len(rows)
+
+
+_buffer = None
+_buffer_lock = threading.Lock()
+
+
+def get_email_log_buffer():
+    global _buffer
+    with _buffer_lock:
+        if _buffer is None:
+            _buffer = EmailLogBuffer()
+        return _buffer
+
+
+def reset_email_log_buffer():
+    """설정 변경(테스트) 시 버퍼를 다시 만들도록 합니다. 남은 행은 버립니다."""
+    global _buffer
+    with _buffer_lock:
+        _buffer = None
+
+
+def purge_email_logs(retention_days=None, chunk_size=None, max_chunks=None, pause=None):
+    """
+    보관 기간이 지난 EmailLog 를 오래된 순서로 chunk_size 개씩 삭제합니다.
+    Returns:
+        (삭제한 행 수, 남은 행이 있어 이어서 실행해야 하는지)
+    """
+    config = _get_config()
+    retention_days = retention_days or config['RETENTION_DAYS']
+    chunk_size = chunk_size or config['PURGE_CHUNK_SIZE']
+    max_chunks = max_chunks or config['PURGE_MAX_CHUNKS']
+    pause = config['PURGE_PAUSE'] if pause is None else pause
+
+    threshold = timezone.now() - timedelta(days=retention_days)
+    expired = EmailLog.objects.filter(created_at__lt=threshold)
+    deleted = 0
+    for _ in range(max_chunks):
+        # created_at 인덱스 순서로 PK 만 가져와 PK 로 지웁니다. (청크마다 짧은 트랜잭션)
+        ids = list(expired.order_by('created_at').values_list('pk', flat=True)[:chunk_size])
+        if not ids:
+            return deleted, False
+        count, _ = EmailLog.objects.filter(pk__in=ids).delete()
+        deleted += count
+        if len(ids) < chunk_size:
+            return deleted, False
+        if pause:
+            time.sleep(pause)
+    return deleted, expired.exists()
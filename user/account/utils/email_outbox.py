@@ -0,0 +1,91 @@
+# util/email_outbox.py
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils import timezone
+
+from ..models import EmailOutbox
+from .email_dispatcher import batching_enabled, enqueue
+from .email_templates import KIND_VERIFY
+
+DEFAULT_EMAIL_OUTBOX = {
+    # 커밋 직후 relay 작업을 깨우는 신호용 캐시 alias
+    'ALIAS': 'default',
+    # relay 작업 1회에 옮길 최대 행 수
+    'RELAY_BATCH': 500,
+    # 이 시간(초) 동안은 커밋이 여러 번 있어도 relay 작업을 한 번만 깨웁니다. (나머지 요청은 브로커를 호출하지 않음)
+    'KICK_INTERVAL': 1,
+    # 전달이 끝난 행을 보관하는 시간 (초)
+    'RETENTION': 24 * 60 * 60,
+}
+
+
+def _get_config():
+    config = dict(DEFAULT_EMAIL_OUTBOX)
+    config.update(getattr(settings, 'EMAIL_OUTBOX', {}))
+    return config
+
+
+def queue_auth_email(email, code, kind=KIND_VERIFY):
+    """
+    인증 코드 메일 전송을 요청합니다. (기존 send_auth_email_task.delay() 대체)
+
+    요청 트랜잭션 안에서 아웃박스 행만 저장하고 브로커는 호출하지 않습니다.
+    커밋된 뒤에 relay 작업을 깨우고, 롤백되면 행과 함께 전송 요청도 사라집니다.
+    """
+    EmailOutbox.objects.create(email=email, code=code, kind=kind)
+    transaction.on_commit(kick_relay)
+
+
+def kick_relay():
+    """relay 작업을 예약합니다. 실패해도 주기 작업(CELERY_BEAT_SCHEDULE)이 이어서 처리합니다."""
+    from ..tasks import relay_email_outbox_task
+
+    config = _get_config()
+    try:
+        if caches[config['ALIAS']].add('email_outbox:kick', 1, config['KICK_INTERVAL']):
+            relay_email_outbox_task.delay()
+    except Exception as e:
+        print(f"이메일 아웃박스 relay 예약 실패 (주기 작업에서 처리): {e}")
+
+
+def handoff(rows):
+    """아웃박스 행을 일괄 전송 대기열(utils/email_dispatcher.py)로 넘깁니다."""
+    if batching_enabled():
+        for row in rows:
+            enqueue({'email': row.email, 'code': row.code, 'kind': row.kind, 'attempt': 1})
+        return
+
+    from ..tasks import send_auth_email_task
+    for row in rows:
+        send_auth_email_task.delay(row.email, row.code, row.kind)
+
+
+def relay_outbox(limit=None):
+    """
+    커밋된 미전달 행을 최대 limit 개 옮기고, 옮긴 행 수를 반환합니다.
+    여러 워커가 동시에 실행해도 SKIP LOCKED 로 서로 다른 행을 가져갑니다.
+    (넘긴 뒤 커밋 전에 실패하면 다음 relay 에서 다시 넘기므로 최소 1회 전송입니다.)
+    """
+    limit = limit or _get_config()['RELAY_BATCH']
+    with transaction.atomic():
+        rows = list(
+            EmailOutbox.objects.select_for_update(skip_locked=True)
+            .filter(relayed_at__isnull=True)
+            .order_by('id')[:limit]
+        )
+        if not rows:
+            return 0
+        handoff(rows)
+        EmailOutbox.objects.filter(pk__in=[row.pk for row in rows]).update(relayed_at=timezone.now())
+    return len(rows)
+
+
+def purge_relayed():
+    """보관 시간이 지난 전달 완료 행을 삭제합니다."""
+    threshold = timezone.now() - timedelta(seconds=_get_config()['RETENTION'])
+    deleted, _ = EmailOutbox.objects.filter(relayed_at__lt=threshold).delete()
+    return deleted
@@ -0,0 +1,156 @@
+# util/email_templates.py
+#
+# 메일 종류별 제목 / 텍스트 / HTML 템플릿을 프로세스당 한 번만 컴파일해 두는 레지스트리.
+# 렌더링 시에는 미리 나눠 둔 고정 문자열 조각과 값만 이어 붙입니다. (매번 서식 문자열을 다시 해석하지 않음)
+
+from html import escape
+from string import Formatter
+
+KIND_VERIFY = 'verify'
+KIND_CHANGE = 'change'
+KIND_APPROVAL = 'approval'
+
+
+class CompiledString:
+    """
+    '{name}' 자리표시자가 있는 문자열을 (고정 문자열, 필드 이름) 조각으로 미리 나눠 둡니다.
+    자리표시자가 없으면 원본 문자열을 그대로 반환합니다. (복사 없음)
+    """
+    __slots__ = ('source', 'pieces', 'slots', 'fields', 'escape')
+
+    def __init__(self, source, escape_values=False):
+        self.source = source
+        # 고정 문자열 조각 사이사이에 값이 들어갈 자리(None)를 둔 목록과, 그 자리의 (위치, 필드 이름)
+        self.pieces = []
+        self.slots = []
+        for literal, field, spec, conversion in Formatter().parse(source):
+            if spec or conversion:
+                raise ValueError(f"서식 지정자는 지원하지 않습니다: {{{field}!{conversion}:{spec}}}")
+            if literal:
+                self.pieces.append(literal)
+            if field is not None:
+                self.slots.append((len(self.pieces), field))
+                self.pieces.append(None)
+        self.fields = frozenset(field for _, field in self.slots)
+        self.escape = escape_values
+
+    def render(self, context):
+        if not self.slots:
+            return self.source
+
+        pieces = self.pieces.copy()
+        if self.escape:
+            for index, field in self.slots:
+                pieces[index] = escape(str(context[field]))
+        else:
+            for index, field in self.slots:
+                pieces[index] = str(context[field])
+        return ''.join(pieces)
+
+
+class RenderedEmail:
+    __slots__ = ('subject', 'text', 'html')
+
+    def __init__(self, subject, text, html):
+        self.subject = subject
+        self.text = text
+        self.html = html
+
+
+class EmailTemplate:
+    """메일 한 종류의 제목 / 텍스트 / HTML (HTML 에 들어가는 값은 escape 합니다.)"""
+
+    def __init__(self, kind, subject, text, html):
+        self.kind = kind
+        self.subject = CompiledString(subject)
+        self.text = CompiledString(text)
+        self.html = CompiledString(html, escape_values=True)
+        self.fields = self.subject.fields | self.text.fields | self.html.fields
+
+    def render(self, **context):
+        """
+        Raises:
+            KeyError: 템플릿에 필요한 값이 빠졌을 경우
+        """
+        return RenderedEmail(
+            self.subject.render(context),
+            self.text.render(context),
+            self.html.render(context),
+        )
+
+
+_registry = {}
+
+
+def register(kind, subject, text, html):
+    template = _registry[kind] = EmailTemplate(kind, subject, text, html)
+    return template
+
+
+def get_template(kind):
+    """
+    Raises:
+        KeyError: 등록되지 않은 메일 종류일 경우
+    """
+    return _registry[kind]
+
+
+def render(kind, **context):
+    return get_template(kind).render(**context)
+
+
+CODE_EMAIL_HTML = """
+    <html>
+    <body>
+        <h3 >{title}</h3>
+
+        <p>
+            ℹ️ 인증번호 6자리 <strong>{code}</strong>
+        <br>
+        <p>
+            위 6자리 번호를 입력하여 인증을 완료하세요.<br>
+            <br>
+            <strong>인증번호는 5분간 유효합니다.</strong>
+        </p>
+    </body>
+    </html>
+    """
+
+
+def _code_email_html(title):
+    # 제목은 고정 문자열이므로 등록 시점에 채워 넣고, 인증 코드만 자리표시자로 남깁니다.
+    return CODE_EMAIL_HTML.replace('{title}', title)
+
+
+register(
+    KIND_VERIFY,
+    subject="회원가입 이메일 인증 코드",
+    text="인증 코드는 {code} 입니다. 5분 내에 입력해 주세요.",
+    html=_code_email_html("이메일 인증"),
+)
+
+register(
+    KIND_CHANGE,
+    subject="이메일 변경 인증 코드",
+    text="이메일 변경 인증 코드는 {code} 입니다. 5분 내에 입력해 주세요.",
+    html=_code_email_html("이메일 변경 인증"),
+)
+
+register(
+    KIND_APPROVAL,
+    subject="[OAS] 새로운 승인 요청이 도착했습니다",
+    text="{requestee} 님이 {request_type} 을(를) 보냈습니다. 앱에서 확인해 주세요.",
+    html="""
+    <html>
+    <body>
+        <h3 >승인 요청 알림</h3>
+
+        <p>
+            <strong>{requestee}</strong> 님이 <strong>{request_type}</strong> 을(를) 보냈습니다.<br>
+            <br>
+            앱의 승인 요청 목록에서 확인해 주세요.
+        </p>
+    </body>
+    </html>
+    """,
+)
@@ -0,0 +1,143 @@
+# util/hashing_pool.py
+
+import asyncio
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+DEFAULT_PASSWORD_HASHING_POOL = {
+    # 해시 작업을 처리할 프로세스 수
+    'MAX_WORKERS': 2,
+    # 실행 중인 작업 외에 대기시킬 수 있는 최대 작업 수 (초과 시 503)
+    'MAX_QUEUE': 32,
+}
+
+
+class HashingPoolSaturated(APIException):
+    """해시 작업 대기열이 가득 찬 경우 (잠시 후 재시도 유도)"""
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = '요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해 주세요.'
+    default_code = 'hashing_pool_saturated'
+
+
+# ----------------------------------------------------------------------
+# 프로세스 풀에서 실행되는 함수 (pickle 가능하도록 모듈 최상위에 정의)
+# ----------------------------------------------------------------------
+def _init_worker():
+    # spawn 방식으로 시작된 프로세스는 Django 설정이 로드되어 있지 않습니다.
+    import django
+    from django.apps import apps
+    if not apps.ready:
+        django.setup()
+
+
+def _check_password(password, encoded):
+    """(일치 여부, 재해싱 필요 여부) 를 반환합니다."""
+    must_update = []
+    ok = hashers.check_password(password, encoded, setter=lambda raw: must_update.append(True))
+    return ok, bool(must_update)
+
+
+def _make_password(password):
+    return hashers.make_password(password)
+
+
+class HashingPool:
+    """
+    비밀번호 해시(PBKDF2 등) 작업을 이벤트 루프 / 요청 스레드 밖의 프로세스 풀에서 실행합니다.
+
+    실행 중 + 대기 중인 작업 수가 MAX_WORKERS + MAX_QUEUE 를 넘으면
+    작업을 쌓지 않고 HashingPoolSaturated(503) 를 즉시 발생시킵니다.
+    """
+
+    def __init__(self, max_workers, max_queue):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = None
+        self._pid = None
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls):
+        config = dict(DEFAULT_PASSWORD_HASHING_POOL)
+        config.update(getattr(settings, 'PASSWORD_HASHING_POOL', {}))
+        return cls(config['MAX_WORKERS'], config['MAX_QUEUE'])
+
+    @property
+    def capacity(self):
+        return self.max_workers + self.max_queue
+
+    @property
+    def in_flight(self):
+        return self._in_flight
+
+    def executor(self):
+        # gunicorn 워커 fork 이후에는 프로세스마다 새 풀을 만듭니다.
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    initializer=_init_worker
+                )
+                self._pid = os.getpid()
+            return self._executor
+
+    def _acquire(self):
+        with self._lock:
+            if self._in_flight >= self.capacity:
+                raise HashingPoolSaturated()
+            self._in_flight += 1
+
+    def _release(self):
+        with self._lock:
+            self._in_flight -= 1
+
+    async def run(self, fn, *args):
+        self._acquire()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor(), fn, *args)
+        finally:
+            self._release()
+
+    async def check_password(self, password, encoded):
+        """
+        Returns:
+            tuple[bool, bool]: (비밀번호 일치 여부, 재해싱 필요 여부)
+        """
+        return await self.run(_check_password, password, encoded)
+
+    async def make_password(self, password):
+        return await self.run(_make_password, password)
+
+    def make_passwords(self, passwords, chunksize=16):
+        """
+        여러 비밀번호를 풀의 모든 프로세스에 나눠 해시하고, 입력 순서대로 반환합니다.
+        관리 명령 같은 동기 코드용입니다. (대기열 제한 / 503 없이 끝날 때까지 기다립니다.)
+        """
+        return list(self.executor().map(_make_password, passwords, chunksize=chunksize))
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_hashing_pool():
+    """프로세스 단위 HashingPool 싱글톤을 반환합니다."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = HashingPool.from_settings()
+        return _pool
@@ -0,0 +1,118 @@
+# util/lockout.py
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+
+from .claim_snapshot import ClaimSnapshotCache
+from .user_cache import UserAuthCache
+
+DEFAULT_ACCOUNT_LOCKOUT = {
+    # 카운터를 저장할 캐시 alias (테스트에서는 locmem)
+    'ALIAS': 'default',
+    # 연속 실패 허용 횟수 (이 횟수에 도달하면 계정 잠금)
+    'MAX_ATTEMPTS': 4,
+    # 실패 카운터 유지 시간 (초). 마지막 실패가 아닌 첫 실패 기준으로 만료됩니다.
+    'WINDOW': 15 * 60,
+}
+
+
+def _get_config():
+    config = dict(DEFAULT_ACCOUNT_LOCKOUT)
+    config.update(getattr(settings, 'ACCOUNT_LOCKOUT', {}))
+    return config
+
+
+class LockoutResult:
+    """register_failure() 결과"""
+
+    def __init__(self, count, tripped, max_attempts):
+        self.count = count
+        # 이번 실패로 잠금이 걸렸는지 (동시에 실패해도 한 요청만 True)
+        self.tripped = tripped
+        self.max_attempts = max_attempts
+
+    @property
+    def locked(self):
+        return self.count >= self.max_attempts
+
+    @property
+    def remaining(self):
+        return max(self.max_attempts - self.count, 0)
+
+
+class LockoutEngine:
+    """
+    계정 잠금용 실패 카운터를 user_info 행 대신 공유 캐시에 보관합니다.
+
+    - 실패할 때마다 캐시의 원자적 incr 만 수행합니다. (DB 쓰기 없음)
+    - 카운트가 MAX_ATTEMPTS 에 도달하면 활성 상태인 행만 잠그는 조건부 UPDATE 로 잠금(is_active=False)을 기록하므로,
+      여러 워커에서 동시에 실패해도 잠금은 한 번만 걸립니다.
+    - 잠금 후 관리자가 다시 활성화한 계정은 카운터가 남아 있어도 다음 실패에서 다시 잠급니다.
+    """
+    KEY_PREFIX = 'lockout'
+
+    def __init__(self, scope, max_attempts=None, window=None, alias=None):
+        config = _get_config()
+        self.scope = scope
+        self.max_attempts = max_attempts or config['MAX_ATTEMPTS']
+        self.window = window or config['WINDOW']
+        self.alias = alias or config['ALIAS']
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def key(self, user_id):
+        return f'{self.KEY_PREFIX}:{self.scope}:{user_id}'
+
+    def _incr(self, key):
+        # add() 는 키가 없을 때만 TTL 과 함께 0 을 넣으므로 첫 실패 시점부터 WINDOW 가 적용됩니다.
+        self.cache.add(key, 0, self.window)
+        try:
+            return self.cache.incr(key)
+        except ValueError:
+            # add() 와 incr() 사이에 만료된 경우
+            self.cache.add(key, 0, self.window)
+            return self.cache.incr(key)
+
+    def failure_count(self, user):
+        return self.cache.get(self.key(user.pk), 0)
+
+    def register_failure(self, user):
+        count = self._incr(self.key(user.pk))
+        tripped = False
+
+        # 카운트가 MAX_ATTEMPTS 에 도달한 요청, 또는 잠금 후 관리자가 다시 활성화한 계정(카운터는 WINDOW 동안 남음)의 실패
+        if count == self.max_attempts or (count > self.max_attempts and user.is_active):
+            tripped = self.lock_account(user, count)
+
+        return LockoutResult(count, tripped, self.max_attempts)
+
+    def lock_account(self, user, count):
+        """
+        활성 상태인 user_info 행만 잠급니다. 조건부 UPDATE 이므로 동시에 여러 요청이 와도 한 요청만 True 입니다.
+        Returns:
+            이번 요청이 잠금을 걸었는지
+        """
+        now = timezone.now()
+        updated = type(user)._default_manager.filter(pk=user.pk, is_active=True).update(
+            decryption_fail_count=count,
+            last_fail_time=now,
+            is_active=False, # is_active 필드를 False로 설정 (계정 잠금)
+        )
+        user.decryption_fail_count, user.last_fail_time, user.is_active = count, now, False
+        if updated:
+            # update() 는 post_save 시그널을 보내지 않으므로 signals.py 와 같이 직접 무효화합니다.
+            UserAuthCache.invalidate(user.pk)
+            ClaimSnapshotCache.invalidate(user.pk)
+        return bool(updated)
+
+    def reset(self, user):
+        """성공 또는 잠금 해제 시 카운터를 삭제합니다. (DB 쓰기 없음)"""
+        self.cache.delete(self.key(user.pk))
+
+
+# 환경 제어기 QR 복호화 실패 잠금
+def decryption_lockout():
+    return LockoutEngine('decrypt')
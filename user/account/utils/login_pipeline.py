@@ -0,0 +1,88 @@
+# util/login_pipeline.py
+
+from django.utils.functional import cached_property
+
+from ..models import UserInfo
+from approval.models import ApprovalRequest, ApprovalStatus
+from approval.serializers import ApprovalRequestSerializer
+from .user_loader import UserLoader
+from .claims import CLAIMS_PROFILE_FULL, approval_version
+
+
+class LoginSnapshot:
+    """
+    로그인 1회 동안 사용할 사용자 / 이메일 인증 / 승인 요청 정보를 한 번만 조회해 보관합니다.
+    토큰 클레임과 응답 본문은 모두 이 스냅샷을 재사용합니다.
+
+    쿼리 구성 (일반 로그인 기준 2회)
+        1. UserInfo + UserEmail (select_related)
+        2. 나에게 들어온 PENDING 승인 요청 목록
+    """
+
+    def __init__(self, user, pending_requests=None):
+        self.user = user
+        self._pending_requests = pending_requests
+
+    @classmethod
+    def load_user(cls, email):
+        """
+        이메일로 사용자와 email_info 를 한 번의 쿼리로 가져옵니다.
+
+        Raises:
+            UserInfo.DoesNotExist: 해당 이메일의 사용자가 없을 경우
+        """
+        return UserLoader.get(**{UserInfo.USERNAME_FIELD: email})
+
+    @property
+    def pending_requests(self):
+        """나에게(approver) 들어온 PENDING 요청 목록 (최초 접근 시 1회만 조회)"""
+        if self._pending_requests is None:
+            self._pending_requests = list(
+                ApprovalRequest.objects.filter(
+                    approver=self.user,
+                    status=ApprovalStatus.PENDING
+                ).order_by('requested_at')
+            )
+        return self._pending_requests
+
+    @property
+    def approval_status(self):
+        return len(self.pending_requests) > 0
+
+    @property
+    def approval_count(self):
+        return len(self.pending_requests)
+
+    @cached_property
+    def claims_version(self):
+        return approval_version(r.id for r in self.pending_requests)
+
+    @cached_property
+    def approval_list(self):
+        # 토큰과 응답 본문이 같은 직렬화 결과를 공유합니다.
+        return ApprovalRequestSerializer(self.pending_requests, many=True).data
+
+    @property
+    def email_auth(self):
+        return UserLoader.email_info(self.user).email_auth
+
+    def apply_claims(self, target, profile=CLAIMS_PROFILE_FULL):
+        """
+        토큰(Token) 또는 응답 dict 에 로그인 클레임을 채워 넣습니다.
+        두 객체 모두 item 할당을 지원하므로 같은 코드로 처리합니다.
+
+        profile 이 'full' 일 때만 approval_list 전체를 포함합니다.
+        ('compact' 는 approval_count / claims_version 만 포함, utils/claims.py 참고)
+        """
+        user = self.user
+        target['user_id'] = user.id
+        target['nick_name'] = user.nick_name
+        target['email_auth'] = self.email_auth
+        target['family_group_id'] = user.family_group_id
+        target['family_level'] = user.family_level
+        target['approval_status'] = self.approval_status
+        target['approval_count'] = self.approval_count
+        target['claims_version'] = self.claims_version
+        if profile == CLAIMS_PROFILE_FULL:
+            target['approval_list'] = self.approval_list
+        return target
@@ -0,0 +1,247 @@
+# util/provisioning.py
+#
+# 사용자 일괄 생성 (단지 입주 등으로 수백 ~ 수천 계정을 한 번에 만들 때)
+#
+#   - create_user() 는 사용자마다 트랜잭션 하나(INSERT user_info + user_email)와 비밀번호 해시를 순서대로 합니다.
+#   - provision_users() 는 CHUNK_SIZE 행씩 비밀번호를 프로세스 풀(utils/hashing_pool.py)에서 한꺼번에 해시하고,
+#     청크마다 트랜잭션 하나에서 UserInfo / UserEmail 을 bulk_create 로 저장합니다.
+#     UserEmail 은 create_user() 와 마찬가지로 여기서 직접 만듭니다.
+#     (새 사용자이므로 인증 캐시 무효화도 필요 없습니다.)
+
+import csv
+import json
+import os
+import time
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import IntegrityError, connection, transaction
+
+from ..models import UserEmail, UserInfo
+from .hashing_pool import HashingPool, _make_password
+
+DEFAULT_USER_PROVISIONING = {
+    # 트랜잭션 1개에 저장할 행 수
+    'CHUNK_SIZE': 500,
+    # 비밀번호 해시 프로세스 수 (None 이면 CPU 수, 0 이면 현재 프로세스에서 해시)
+    'HASH_WORKERS': None,
+}
+
+FAMILY_LEVELS = {value for value, _ in UserInfo._meta.get_field('family_level').choices}
+
+FORMAT_CSV = 'csv'
+FORMAT_JSONL = 'jsonl'
+
+
+def _get_config():
+    config = dict(DEFAULT_USER_PROVISIONING)
+    config.update(getattr(settings, 'USER_PROVISIONING', {}))
+    return config
+
+
+def read_rows(path, fmt=None):
+    """
+    CSV(헤더 포함) 또는 JSONL 파일에서 (줄 번호, 행 dict) 를 차례로 반환합니다.
+    fmt 를 주지 않으면 확장자(.csv / .jsonl, .ndjson)로 정합니다.
+    """
+    if fmt is None:
+        fmt = FORMAT_CSV if path.lower().endswith('.csv') else FORMAT_JSONL
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        if fmt == FORMAT_CSV:
+            # 헤더가 1번째 줄이므로 데이터는 2번째 줄부터입니다.
+            for line, row in enumerate(csv.DictReader(f), start=2):
+                yield line, row
+            return
+        for line, text in enumerate(f, start=1):
+            text = text.strip()
+            if not text:
+                continue
+            try:
+                yield line, json.loads(text)
+            except ValueError as e:
+                yield line, {'_error': f'JSON 오류: {e}'}
+
+
+class ProvisionResult:
+    """provision_users() 결과"""
+
+    def __init__(self):
+        self.created = 0
+        # [(줄 번호, email, 사유)]
+        self.skipped = []
+        self.chunks = 0
+        self.hash_seconds = 0.0
+        self.write_seconds = 0.0
+        self.elapsed = 0.0
+
+    @property
+    def rows(self):
+        return self.created + len(self.skipped)
+
+    @property
+    def rows_per_sec(self):
+        return round(self.rows / self.elapsed, 2) if self.elapsed > 0 else 0.0
+
+    def as_dict(self):
+        return {
+            'rows': self.rows,
+            'created': self.created,
+            'skipped': len(self.skipped),
+            'chunks': self.chunks,
+            'elapsed_s': round(self.elapsed, 3),
+            'hash_s': round(self.hash_seconds, 3),
+            'write_s': round(self.write_seconds, 3),
+            'rows_per_sec': self.rows_per_sec,
+            'errors': [{'line': line, 'email': email, 'reason': reason} for line, email, reason in self.skipped],
+        }
+
+
+def clean_row(row):
+    """
+    입력 행을 UserInfo 필드 dict 로 바꿉니다. 잘못된 값이면 ValidationError 를 발생시킵니다.
+    """
+    if '_error' in row:
+        raise ValidationError(row['_error'])
+    email = UserInfo.objects.normalize_email((row.get('email') or '').strip())
+    if not email:
+        raise ValidationError('email 이 없습니다.')
+    validate_email(email)
+    nick_name = (row.get('nick_name') or '').strip()
+    if not nick_name:
+        raise ValidationError('nick_name 이 없습니다.')
+
+    fields = {'email': email, 'nick_name': nick_name, 'password': row.get('password') or None}
+    family_level = (row.get('family_level') or '').strip()
+    if family_level:
+        if family_level not in FAMILY_LEVELS:
+            raise ValidationError(f'family_level 은 {sorted(FAMILY_LEVELS)} 중 하나여야 합니다.')
+        fields['family_level'] = family_level
+    for name in ('oas_group_id', 'family_group_id'):
+        value = (row.get(name) or '').strip()
+        if value:
+            fields[name] = value
+    return fields
+
+
+class UserProvisioner:
+    """
+    행 목록을 청크 단위로 검증 / 해시 / 저장합니다.
+    이미 있는 email 과 입력 안에서 중복된 email 은 건너뛰고 result.skipped 에 사유를 남깁니다.
+    """
+
+    def __init__(self, chunk_size=None, hash_workers=None, dry_run=False):
+        config = _get_config()
+        self.chunk_size = chunk_size or config['CHUNK_SIZE']
+        hash_workers = config['HASH_WORKERS'] if hash_workers is None else hash_workers
+        self.hash_workers = os.cpu_count() if hash_workers is None else hash_workers
+        self.dry_run = dry_run
+        self.pool = HashingPool(self.hash_workers, 0) if self.hash_workers > 0 else None
+        self.result = ProvisionResult()
+        self._seen = set()
+
+    def run(self, rows):
+        started = time.perf_counter()
+        try:
+            chunk = []
+            for line, row in rows:
+                chunk.append((line, row))
+                if len(chunk) >= self.chunk_size:
+                    self.process_chunk(chunk)
+                    chunk = []
+            if chunk:
+                self.process_chunk(chunk)
+        finally:
+            if self.pool is not None:
+                self.pool.shutdown()
+            self.result.elapsed = time.perf_counter() - started
+        return self.result
+
+    def skip(self, line, email, reason):
+        self.result.skipped.append((line, email, reason))
+
+    def process_chunk(self, chunk):
+        self.result.chunks += 1
+        valid = []
+        for line, row in chunk:
+            try:
+                fields = clean_row(row)
+            except ValidationError as e:
+                self.skip(line, row.get('email'), '; '.join(e.messages))
+                continue
+            # MySQL 기본 collation 은 대소문자를 구분하지 않으므로 대소문자만 다른 email 도 중복으로 봅니다.
+            key = UserInfo.objects.email_key(fields['email'])
+            if key in self._seen:
+                self.skip(line, fields['email'], '입력 파일 안에서 중복된 email 입니다.')
+                continue
+            self._seen.add(key)
+            valid.append((line, fields))
+
+        valid = self.exclude_existing(valid)
+        if not valid or self.dry_run:
+            return
+
+        started = time.perf_counter()
+        passwords = self.hash_passwords([fields.pop('password') for _, fields in valid])
+        self.result.hash_seconds += time.perf_counter() - started
+
+        started = time.perf_counter()
+        # bulk_create 는 save() 를 거치지 않으므로 email_normalized 를 직접 채웁니다.
+        users = [
+            UserInfo(password=encoded, email_normalized=UserInfo.objects.email_key(fields['email']), **fields)
+            for (_, fields), encoded in zip(valid, passwords)
+        ]
+        try:
+            self.write(users)
+        except IntegrityError:
+            # 검사 뒤에 같은 email 이 다른 경로(회원가입)로 생성된 경우: 청크 전체가 롤백되었으므로 다시 걸러서 한 번 더 저장합니다.
+            kept = {fields['email'] for _, fields in self.exclude_existing(valid)}
+            self.write([user for user in users if user.email in kept])
+        self.result.write_seconds += time.perf_counter() - started
+
+    def exclude_existing(self, valid):
+        existing = set(UserInfo.objects.filter(
+            email_normalized__in=[UserInfo.objects.email_key(fields['email']) for _, fields in valid]
+        ).values_list('email_normalized', flat=True))
+        kept = []
+        for line, fields in valid:
+            if UserInfo.objects.email_key(fields['email']) in existing:
+                self.skip(line, fields['email'], '이미 가입된 email 입니다.')
+            else:
+                kept.append((line, fields))
+        return kept
+
+    def hash_passwords(self, passwords):
+        # 비밀번호가 없는 행은 로그인할 수 없는 비밀번호로 저장합니다. (비밀번호 재설정 후 사용)
+        hashed = iter(self._hash([p for p in passwords if p]))
+        return [next(hashed) if p else make_password(None) for p in passwords]
+
+    def _hash(self, passwords):
+        if not passwords:
+            return []
+        if self.pool is None:
+            return [_make_password(p) for p in passwords]
+        return self.pool.make_passwords(passwords, chunksize=max(1, len(passwords) // (self.hash_workers * 4)))
+
+    def write(self, users):
+        if not users:
+            return
+        with transaction.atomic():
+            UserInfo.objects.bulk_create(users, batch_size=self.chunk_size)
+            if not connection.features.can_return_rows_from_bulk_insert:
+                # MySQL 은 bulk_create 후 PK 를 채우지 않으므로 email 로 다시 조회합니다.
+                ids = dict(UserInfo.objects.filter(email__in=[u.email for u in users]).values_list('email', 'pk'))
+                for user in users:
+                    user.pk = ids[user.email]
+            UserEmail.objects.bulk_create([UserEmail(user_id=user.pk) for user in users], batch_size=self.chunk_size)
+        self.result.created += len(users)
+
+
+def provision_users(rows, chunk_size=None, hash_workers=None, dry_run=False):
+    """
+    rows: (줄 번호, 행 dict) 의 iterable (read_rows() 결과)
+    Returns:
+        ProvisionResult
+    """
+    return UserProvisioner(chunk_size, hash_workers, dry_run).run(rows)
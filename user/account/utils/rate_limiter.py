@@ -0,0 +1,184 @@
+# util/rate_limiter.py
+#
+# 발송 메일 토큰 버킷 (워커 간 공유 캐시)
+#
+#   - 계정 버킷 : EMAIL_HOST_USER 1개당 1개. SMTP 공급자(Gmail)의 계정별 발송 한도를 넘지 않도록
+#                 넘칠 것 같으면 MAX_WAIT 안에서는 기다렸다 보내고(지연), 그 이상이면 나중으로 미룹니다.
+#   - 수신자 버킷: 수신 주소 1개당 1개. 한 주소로 짧은 시간에 메일이 몰리면 보내지 않고 거부합니다.
+#
+# 버킷 상태는 GCRA(Generic Cell Rate Algorithm) 방식으로 "다음 토큰이 생기는 이론적 시각(TAT)" 하나만 저장합니다.
+# (토큰 수 + 갱신 시각 두 값을 저장하는 토큰 버킷과 같은 동작이며, 읽고-계산하고-쓰기를 버킷 잠금 안에서 합니다.)
+
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+DEFAULT_EMAIL_RATE_LIMIT = {
+    'ENABLED': True,
+    # 버킷을 공유할 캐시 alias (웹 / 워커 프로세스가 같은 캐시를 사용해야 합니다.)
+    'ALIAS': 'default',
+    # 계정 버킷: 초당 토큰 수 / 최대 연속 발송 수
+    'GLOBAL_RATE': 2000 / (24 * 60 * 60),
+    'GLOBAL_BURST': 100,
+    # 수신자 버킷: 초당 토큰 수 / 최대 연속 발송 수
+    'RECIPIENT_RATE': 10 / (60 * 60),
+    'RECIPIENT_BURST': 6,
+    # 계정 버킷이 비었을 때 워커 안에서 기다릴 최대 시간 (초). 넘으면 대기열로 되돌려 나중에 보냅니다.
+    'MAX_WAIT': 5,
+}
+
+# RateDecision.reason
+LIMIT_GLOBAL = 'global'
+LIMIT_RECIPIENT = 'recipient'
+
+
+def _get_config():
+    config = dict(DEFAULT_EMAIL_RATE_LIMIT)
+    config.update(getattr(settings, 'EMAIL_RATE_LIMIT', {}))
+    return config
+
+
+class RateDecision:
+    """acquire() 결과"""
+    __slots__ = ('allowed', 'delay', 'reason', 'retry_after')
+
+    def __init__(self, allowed, delay=0.0, reason=None, retry_after=0.0):
+        self.allowed = allowed
+        # 허용된 경우 보내기 전에 기다릴 시간 (초)
+        self.delay = delay
+        # 허용되지 않은 경우 LIMIT_GLOBAL / LIMIT_RECIPIENT
+        self.reason = reason
+        # 허용되지 않은 경우 다시 시도해도 되는 시간 (초)
+        self.retry_after = retry_after
+
+    def __repr__(self):
+        if self.allowed:
+            return f'<RateDecision allowed delay={self.delay:.3f}>'
+        return f'<RateDecision {self.reason} retry_after={self.retry_after:.3f}>'
+
+
+class TokenBucket:
+    """
+    rate(초당 토큰) / burst(최대 토큰) 토큰 버킷 하나
+
+    TAT(theoretical arrival time): 버킷이 가득 찬 상태라면 TAT <= now 이고,
+    토큰 1개를 쓰면 TAT 가 interval(=1/rate) 만큼 뒤로 밀립니다. TAT - now 가 tolerance 이하이면 토큰이 남아 있는 것입니다.
+    """
+    LOCK_TTL = 1
+    LOCK_RETRIES = 200
+
+    def __init__(self, key, rate, burst, alias='default', clock=time.time):
+        self.key = key
+        self.rate = rate
+        self.burst = burst
+        self.alias = alias
+        self.clock = clock
+        self.interval = 1.0 / rate
+        self.tolerance = (burst - 1) * self.interval
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def _lock(self):
+        lock_key = f'{self.key}:lock'
+        for _ in range(self.LOCK_RETRIES):
+            if self.cache.add(lock_key, 1, self.LOCK_TTL):
+                return lock_key
+            time.sleep(0.001)
+        return None
+
+    def reserve(self, max_wait=0.0):
+        """
+        토큰 1개를 예약합니다. max_wait 안에 토큰이 생기면 예약하고, 아니면 버킷을 건드리지 않습니다.
+        Returns:
+            (True, 기다릴 시간) 또는 (False, 토큰이 생길 때까지 남은 시간)
+        """
+        lock_key = self._lock()
+        if lock_key is None:
+            # 잠금을 얻지 못하면 발송을 막지 않습니다. (한도는 공급자가 최종적으로 지킵니다.)
+            print(f"메일 발송 버킷 잠금 실패, 제한 없이 진행: {self.key}")
+            return True, 0.0
+        try:
+            now = self.clock()
+            tat = max(self.cache.get(self.key) or now, now)
+            wait = tat - self.tolerance - now
+            # 부동소수점 오차로 마지막 burst 토큰이 거부되지 않도록 약간의 여유를 둡니다.
+            if wait > max_wait + 1e-6:
+                return False, wait
+            new_tat = tat + self.interval
+            # 버킷이 다시 가득 차는 시각까지만 보관합니다.
+            self.cache.set(self.key, new_tat, max(int(new_tat - now) + 1, 1))
+            return True, max(wait, 0.0)
+        finally:
+            self.cache.delete(lock_key)
+
+    def release(self):
+        """reserve() 한 토큰 1개를 돌려줍니다. (다른 버킷에서 거부된 경우)"""
+        lock_key = self._lock()
+        if lock_key is None:
+            return
+        try:
+            now = self.clock()
+            tat = self.cache.get(self.key)
+            if tat is None:
+                return
+            tat -= self.interval
+            if tat > now:
+                self.cache.set(self.key, tat, max(int(tat - now) + 1, 1))
+            else:
+                self.cache.delete(self.key)
+        finally:
+            self.cache.delete(lock_key)
+
+
+class EmailRateLimiter:
+    """
+    계정 버킷 + 수신자 버킷
+
+    acquire(email) 는 수신자 버킷을 먼저 확인하고(부족하면 거부), 그다음 계정 버킷에서
+    MAX_WAIT 안에 토큰이 생기면 기다릴 시간과 함께 허용, 아니면 retry_after 와 함께 미룹니다.
+    """
+    KEY_PREFIX = 'email_rate'
+
+    def __init__(self, account=None, alias=None, clock=time.time, **overrides):
+        config = _get_config()
+        config.update(overrides)
+        self.enabled = config['ENABLED']
+        self.account = account if account is not None else settings.EMAIL_HOST_USER
+        self.alias = alias or config['ALIAS']
+        self.clock = clock
+        self.max_wait = config['MAX_WAIT']
+        self.global_bucket = TokenBucket(
+            f'{self.KEY_PREFIX}:global:{self.account}', config['GLOBAL_RATE'], config['GLOBAL_BURST'],
+            self.alias, clock,
+        )
+        self.recipient_rate = config['RECIPIENT_RATE']
+        self.recipient_burst = config['RECIPIENT_BURST']
+
+    def recipient_bucket(self, email):
+        return TokenBucket(
+            f'{self.KEY_PREFIX}:rcpt:{email.lower()}', self.recipient_rate, self.recipient_burst,
+            self.alias, self.clock,
+        )
+
+    def acquire(self, email):
+        if not self.enabled:
+            return RateDecision(True)
+
+        recipient = self.recipient_bucket(email)
+        ok, value = recipient.reserve()
+        if not ok:
+            return RateDecision(False, reason=LIMIT_RECIPIENT, retry_after=value)
+
+        ok, value = self.global_bucket.reserve(self.max_wait)
+        if not ok:
+            # 나중에 다시 보낼 메일이므로 수신자 토큰은 돌려줍니다.
+            recipient.release()
+            return RateDecision(False, reason=LIMIT_GLOBAL, retry_after=value)
+        return RateDecision(True, delay=value)
+
+
+def get_rate_limiter():
+    return EmailRateLimiter()
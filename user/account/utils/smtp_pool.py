@@ -0,0 +1,162 @@
+# util/smtp_pool.py
+
+import os
+import smtplib
+import ssl
+import threading
+import time
+
+from django.conf import settings
+
+DEFAULT_EMAIL_CONNECTION_POOL = {
+    # 프로세스(Celery 워커)당 보관할 유휴 연결 수
+    'MAX_SIZE': 2,
+    # 이 시간(초) 이상 사용하지 않은 연결은 버리고 새로 연결합니다. (Gmail 은 유휴 연결을 수 분 내에 끊습니다.)
+    'MAX_IDLE': 60,
+    # 연결 최대 사용 시간(초). 오래된 연결은 반납 시 닫습니다.
+    'MAX_LIFETIME': 600,
+    # 이 시간(초) 이상 쉬었던 연결은 꺼낼 때 NOOP 으로 상태를 확인합니다.
+    'HEALTHCHECK_AFTER': 15,
+}
+
+
+def _get_config():
+    config = dict(DEFAULT_EMAIL_CONNECTION_POOL)
+    config.update(getattr(settings, 'EMAIL_CONNECTION_POOL', {}))
+    return config
+
+
+class PooledConnection:
+    """smtplib 연결과 생성 / 마지막 사용 시각"""
+
+    def __init__(self, smtp):
+        self.smtp = smtp
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+
+
+class SMTPConnectionPool:
+    """
+    워커 프로세스 단위 SMTP 연결 풀.
+    키(host, port, username, tls, ssl) 별로 인증까지 끝난 유휴 연결을 보관합니다.
+    """
+
+    def __init__(self, max_size, max_idle, max_lifetime, healthcheck_after):
+        self.max_size = max_size
+        self.max_idle = max_idle
+        self.max_lifetime = max_lifetime
+        self.healthcheck_after = healthcheck_after
+        self._idle = {}
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        # 벤치마크 / 테스트 확인용 카운터
+        self.stats = {'opened': 0, 'reused': 0, 'recycled': 0, 'unhealthy': 0, 'discarded': 0}
+
+    @classmethod
+    def from_settings(cls):
+        config = _get_config()
+        return cls(config['MAX_SIZE'], config['MAX_IDLE'], config['MAX_LIFETIME'], config['HEALTHCHECK_AFTER'])
+
+    def _check_pid(self):
+        # fork 된 자식 프로세스는 부모의 소켓을 공유하므로 사용하지 않고 버립니다. (닫지도 않음)
+        if self._pid != os.getpid():
+            self._idle = {}
+            self._pid = os.getpid()
+
+    def acquire(self, key):
+        """재사용 가능한 연결을 꺼냅니다. 없으면 None"""
+        while True:
+            with self._lock:
+                self._check_pid()
+                entries = self._idle.get(key)
+                if not entries:
+                    return None
+                entry = entries.pop()
+
+            now = time.monotonic()
+            if now - entry.last_used > self.max_idle or now - entry.created_at > self.max_lifetime:
+                self.stats['recycled'] += 1
+                self.quit(entry)
+                continue
+
+            if now - entry.last_used > self.healthcheck_after and not self.is_alive(entry):
+                self.stats['unhealthy'] += 1
+                self.quit(entry)
+                continue
+
+            self.stats['reused'] += 1
+            return entry
+
+    def register(self, smtp):
+        """새로 연결한 smtplib 객체를 풀 관리 대상으로 만듭니다."""
+        self.stats['opened'] += 1
+        return PooledConnection(smtp)
+
+    def release(self, key, entry):
+        """사용이 끝난 연결을 반납합니다. 풀이 가득 찼거나 수명이 지났으면 닫습니다."""
+        entry.last_used = time.monotonic()
+
+        if entry.last_used - entry.created_at > self.max_lifetime:
+            self.stats['recycled'] += 1
+            self.quit(entry)
+            return
+
+        with self._lock:
+            self._check_pid()
+            entries = self._idle.setdefault(key, [])
+            if len(entries) < self.max_size:
+                entries.append(entry)
+                return
+
+        self.quit(entry)
+
+    def discard(self, entry):
+        """오류가 난 연결을 풀에 돌려놓지 않고 닫습니다."""
+        self.stats['discarded'] += 1
+        self.quit(entry, graceful=False)
+
+    @staticmethod
+    def is_alive(entry):
+        try:
+            return entry.smtp.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    @staticmethod
+    def quit(entry, graceful=True):
+        try:
+            if graceful:
+                entry.smtp.quit()
+            else:
+                entry.smtp.close()
+        except (smtplib.SMTPException, ssl.SSLError, OSError):
+            entry.smtp.close()
+
+    def close_all(self):
+        with self._lock:
+            entries = [entry for group in self._idle.values() for entry in group]
+            self._idle = {}
+        for entry in entries:
+            self.quit(entry)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_smtp_pool():
+    """프로세스 단위 SMTPConnectionPool 싱글톤을 반환합니다."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = SMTPConnectionPool.from_settings()
+        return _pool
+
+
+def reset_smtp_pool():
+    """설정 변경(테스트 / 벤치마크) 시 풀을 닫고 다시 만들도록 합니다."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.close_all()
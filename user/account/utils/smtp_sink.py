@@ -0,0 +1,199 @@
+# util/smtp_sink.py
+#
+# 테스트 / 벤치마크용 로컬 SMTP 서버. 받은 메시지를 저장만 하고 실제로 전달하지 않습니다.
+# (TLS 는 지원하지 않으므로 EMAIL_USE_TLS=False 로 연결합니다. AUTH 는 확인 없이 235 로 응답합니다.)
+#
+# 실제 공급자처럼 느리거나 불안정한 서버를 흉내 내도록 지연 / 실패를 넣을 수 있습니다.
+#   connect_latency : 연결 후 220 인사까지 (TLS 협상 / 서버 부하 대신)
+#   command_latency : 명령 응답마다 (네트워크 왕복 시간 대신)
+#   data_latency    : 본문(DATA) 수신 후 250 응답까지 (서버의 메일 저장 / 검사 시간 대신)
+#   failure_rate    : DATA 에 451(일시적 오류)로 응답할 확률
+#   disconnect_rate : MAIL 명령에서 응답 없이 연결을 끊을 확률
+#   reject_auth     : AUTH 에 535(인증 실패)로 응답
+
+import random
+import socketserver
+import threading
+import time
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+
+    def reply(self, *lines):
+        latency = self.server.sink.command_latency
+        if latency:
+            time.sleep(latency)
+        # 여러 줄 응답은 한 번에 씁니다. (작은 write 가 나뉘면 Nagle / delayed ACK 로 수십 ms 씩 지연)
+        self.wfile.write(''.join(f'{line}\r\n' for line in lines).encode('ascii'))
+
+    def handle(self):
+        sink = self.server.sink
+        sink._connection_opened(self)
+        try:
+            if sink.connect_latency:
+                time.sleep(sink.connect_latency)
+            self.reply('220 localhost smtp-sink ready')
+            envelope = None
+            while True:
+                raw = self.rfile.readline()
+                if not raw or sink.closing:
+                    return
+                command, _, argument = raw.decode('utf-8', 'replace').strip().partition(' ')
+                command = command.upper()
+
+                if command == 'EHLO':
+                    self.reply('250-localhost', '250 8BITMIME')
+                elif command == 'HELO':
+                    self.reply('250 localhost')
+                elif command == 'MAIL':
+                    if sink._inject('disconnect_rate'):
+                        return
+                    envelope = {'from': argument, 'to': []}
+                    self.reply('250 OK')
+                elif command == 'RCPT':
+                    if envelope is None:
+                        self.reply('503 need MAIL command')
+                        continue
+                    if sink.is_rejected(argument):
+                        self.reply('550 mailbox unavailable')
+                        continue
+                    envelope['to'].append(argument)
+                    self.reply('250 OK')
+                elif command == 'DATA':
+                    if not envelope or not envelope['to']:
+                        self.reply('503 need RCPT command')
+                        continue
+                    self.reply('354 End data with <CR><LF>.<CR><LF>')
+                    lines = []
+                    while True:
+                        line = self.rfile.readline()
+                        if not line or line in (b'.\r\n', b'.\n'):
+                            break
+                        lines.append(line)
+                    envelope['data'] = b''.join(lines)
+                    if sink.data_latency:
+                        time.sleep(sink.data_latency)
+                    if sink._inject('failure_rate'):
+                        envelope = None
+                        self.reply('451 temporary local problem, try again')
+                        continue
+                    sink._message_received(envelope)
+                    envelope = None
+                    self.reply('250 OK queued')
+                elif command == 'RSET':
+                    envelope = None
+                    self.reply('250 OK')
+                elif command == 'AUTH':
+                    self.reply('535 authentication failed' if sink.reject_auth else '235 OK')
+                elif command == 'NOOP':
+                    self.reply('250 OK')
+                elif command == 'QUIT':
+                    self.reply('221 Bye')
+                    return
+                else:
+                    self.reply('502 Command not implemented')
+        except (ConnectionError, OSError):
+            return
+        finally:
+            sink._connection_closed(self)
+
+
+class _ThreadingSMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    # 동시 연결 벤치마크에서 SYN 이 버려지지 않도록 listen backlog 를 늘립니다. (기본 5)
+    request_queue_size = 128
+
+
+class SMTPSink:
+    """
+    with SMTPSink() as sink:
+        backend = get_connection(..., host=sink.host, port=sink.port, use_tls=False)
+        ...
+        sink.message_count, sink.connection_count
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, reject_recipients=(), connect_latency=0.0, command_latency=0.0,
+                 data_latency=0.0, failure_rate=0.0, disconnect_rate=0.0, reject_auth=False, seed=None):
+        self.server = _ThreadingSMTPServer((host, port), _SMTPHandler)
+        self.server.sink = self
+        self.host, self.port = self.server.server_address
+        self.messages = []
+        # RCPT 단계에서 550 으로 거부할 주소 (수신자별 실패 테스트용)
+        self.reject_recipients = set(reject_recipients)
+        self.connect_latency = connect_latency
+        self.command_latency = command_latency
+        self.data_latency = data_latency
+        self.failure_rate = failure_rate
+        self.disconnect_rate = disconnect_rate
+        self.reject_auth = reject_auth
+        self._random = random.Random(seed)
+        self.connection_count = 0
+        # 주입한 실패 수 (451 응답 / 연결 끊기)
+        self.injected_failures = 0
+        self.injected_disconnects = 0
+        self.closing = False
+        self._handlers = set()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def message_count(self):
+        with self._lock:
+            return len(self.messages)
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.closing = True
+        self.drop_connections()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def is_rejected(self, argument):
+        return any(f'<{address}>' in argument for address in self.reject_recipients)
+
+    def drop_connections(self):
+        """열려 있는 모든 클라이언트 연결을 서버 쪽에서 끊습니다. (재연결 테스트용)"""
+        with self._lock:
+            handlers = list(self._handlers)
+        for handler in handlers:
+            try:
+                handler.connection.shutdown(2)
+            except OSError:
+                pass
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+    def _connection_opened(self, handler):
+        with self._lock:
+            self.connection_count += 1
+            self._handlers.add(handler)
+
+    def _connection_closed(self, handler):
+        with self._lock:
+            self._handlers.discard(handler)
+
+    def _inject(self, name):
+        rate = getattr(self, name)
+        if not rate:
+            return False
+        with self._lock:
+            hit = self._random.random() < rate
+            if hit and name == 'failure_rate':
+                self.injected_failures += 1
+            elif hit:
+                self.injected_disconnects += 1
+        return hit
+
+    def _message_received(self, envelope):
+        with self._lock:
+            self.messages.append(envelope)
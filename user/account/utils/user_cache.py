@@ -0,0 +1,177 @@
+# util/user_cache.py
+
+import copy
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from .user_loader import UserLoader
+
+DEFAULT_USER_AUTH_CACHE = {
+    # 공유 캐시(settings.CACHES) alias
+    'ALIAS': 'default',
+    # 공유 캐시 보관 시간 (초)
+    'SHARED_TTL': 300,
+    # 워커(프로세스)별 LRU 최대 개수
+    'LOCAL_MAXSIZE': 1024,
+    # 워커별 LRU 보관 시간 (초)
+    # 다른 워커에서 발생한 무효화는 최대 이 시간만큼 늦게 반영됩니다.
+    'LOCAL_TTL': 5,
+}
+
+
+def _get_config():
+    config = dict(DEFAULT_USER_AUTH_CACHE)
+    config.update(getattr(settings, 'USER_AUTH_CACHE', {}))
+    return config
+
+
+class LocalLRU:
+    """프로세스 내부 LRU. 값은 (만료 시각, 데이터) 로 보관합니다."""
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class UserAuthCache:
+    """
+    JWT 인증 시 사용하는 사용자 캐시 (워커별 LRU -> 공유 캐시 -> DB 순서로 조회).
+
+    - 캐시에는 UserInfo 와 연결된 UserEmail(email_info) 을 함께 pickle 로 보관합니다.
+    - password 해시는 공유 캐시에 남지 않도록 빼고 보관합니다. 캐시에서 꺼낸 user 의 password 는
+      지연 로딩 필드가 되어, 읽으면(check_password 등) DB 에서 다시 조회하고 save() 로 덮어쓰지 않습니다.
+    - 요청마다 pickle 을 새로 풀어서 반환하므로, View 에서 user 를 수정해도 다른 요청에 영향이 없습니다.
+    - UserInfo / UserEmail 저장/삭제 시 signals.py 에서 invalidate() 가 호출됩니다.
+    """
+    KEY_PREFIX = 'user_auth'
+
+    _local = None
+
+    @classmethod
+    def key(cls, user_id):
+        return f'{cls.KEY_PREFIX}:{user_id}'
+
+    @classmethod
+    def local(cls):
+        if cls._local is None:
+            config = _get_config()
+            cls._local = LocalLRU(config['LOCAL_MAXSIZE'], config['LOCAL_TTL'])
+        return cls._local
+
+    @classmethod
+    def shared(cls):
+        return caches[_get_config()['ALIAS']]
+
+    @classmethod
+    def get(cls, user_id):
+        """
+        사용자를 반환합니다. 캐시에 없으면 DB 에서 email_info 와 함께 조회합니다.
+
+        Raises:
+            UserInfo.DoesNotExist: 사용자가 없을 경우
+        """
+        key = cls.key(user_id)
+
+        # 1. 워커별 LRU
+        payload = cls.local().get(key)
+
+        # 2. 공유 캐시 (장애 시에는 DB 조회로 넘어갑니다)
+        if payload is None:
+            try:
+                payload = cls.shared().get(key)
+            except Exception as e:
+                print(f"사용자 공유 캐시 조회 실패: {e}")
+                payload = None
+
+            if payload is not None:
+                cls.local().set(key, payload)
+
+        if payload is not None:
+            return pickle.loads(payload)
+
+        # 3. DB
+        user = UserLoader.get(pk=user_id)
+        cls.set(user)
+        return user
+
+    @staticmethod
+    def _without_password(user):
+        """password 해시를 뺀 사본 (email_info.user 도 같은 사본을 가리키도록 함께 복사)"""
+        cached = copy.copy(user)
+        vars(cached).pop('password', None)
+        if 'email_info' in cached._state.fields_cache:
+            email_info = copy.copy(cached._state.fields_cache['email_info'])
+            if email_info is not None:
+                email_info._state.fields_cache['user'] = cached
+            cached._state.fields_cache['email_info'] = email_info
+        return cached
+
+    @classmethod
+    def set(cls, user):
+        key = cls.key(user.pk)
+        payload = pickle.dumps(cls._without_password(user), pickle.HIGHEST_PROTOCOL)
+
+        cls.local().set(key, payload)
+        try:
+            cls.shared().set(key, payload, _get_config()['SHARED_TTL'])
+        except Exception as e:
+            print(f"사용자 공유 캐시 저장 실패: {e}")
+
+    @classmethod
+    def invalidate(cls, user_id):
+        """
+        즉시 삭제하고, 트랜잭션 안이라면 커밋 후에 한 번 더 삭제합니다.
+        (커밋 전에 다른 요청이 이전 행으로 캐시를 다시 채운 경우 SHARED_TTL 동안 남지 않도록 정리)
+        """
+        cls.delete(user_id)
+        transaction.on_commit(lambda: cls.delete(user_id))
+
+    @classmethod
+    def delete(cls, user_id):
+        key = cls.key(user_id)
+
+        cls.local().delete(key)
+        try:
+            cls.shared().delete(key)
+        except Exception as e:
+            print(f"사용자 공유 캐시 삭제 실패: {e}")
+
+    @classmethod
+    def clear_local(cls):
+        """설정 변경(테스트 등) 시 워커별 LRU 를 초기화합니다."""
+        cls._local = None
@@ -0,0 +1,66 @@
+# util/user_loader.py
+
+from ..models import UserEmail, UserInfo
+
+
+class UserLoader:
+    """
+    UserInfo 를 연관 1:1 모델(email_info, 필요 시 usergroup)과 함께 한 번의 쿼리로 가져옵니다.
+    로그인, 환경제어기 인증, 이메일 인증/변경 흐름이 모두 이 로더를 사용합니다.
+    """
+    # UserInfo -> UserEmail (related_name='email_info')
+    EMAIL_INFO = 'email_info'
+    # UserInfo -> UserGroup (related_name 미지정, 기본 이름)
+    USER_GROUP = 'usergroup'
+
+    @classmethod
+    def related_fields(cls, with_group=False):
+        return (cls.EMAIL_INFO, cls.USER_GROUP) if with_group else (cls.EMAIL_INFO,)
+
+    @classmethod
+    def queryset(cls, with_group=False):
+        return UserInfo.objects.select_related(*cls.related_fields(with_group))
+
+    @classmethod
+    def get(cls, with_group=False, **lookup):
+        """
+        Raises:
+            UserInfo.DoesNotExist: 조건에 맞는 사용자가 없을 경우
+        """
+        return cls.queryset(with_group).get(**lookup)
+
+    @classmethod
+    def is_loaded(cls, user, with_group=False):
+        """연관 모델이 이미 조회(캐시)되어 있어 추가 쿼리가 필요 없는지 확인합니다."""
+        return all(
+            getattr(UserInfo, name).related.is_cached(user)
+            for name in cls.related_fields(with_group)
+        )
+
+    @classmethod
+    def for_request(cls, request, with_group=False):
+        """
+        request.user 를 연관 모델이 로드된 상태로 반환합니다.
+        (CachedJWTAuthentication 을 거친 사용자는 이미 로드되어 있으므로 쿼리가 없습니다.)
+        """
+        user = request.user
+        if not user.is_authenticated or cls.is_loaded(user, with_group):
+            return user
+
+        user = cls.get(with_group=with_group, pk=user.pk)
+        # 같은 요청 안에서 다시 조회하지 않도록 request.user 를 교체합니다.
+        request.user = user
+        return user
+
+    @staticmethod
+    def email_info(user):
+        """
+        user.email_info 를 반환합니다.
+        레코드가 없는 사용자(회원가입 경로 밖에서 만든 기존 사용자)는 여기서 처음 접근할 때 만듭니다.
+        """
+        try:
+            return user.email_info
+        except UserInfo.email_info.RelatedObjectDoesNotExist:
+            email_info, _ = UserEmail.objects.get_or_create(user=user)
+            user.email_info = email_info
+            return email_info
@@ -0,0 +1,252 @@
+# util/verification_store.py
+#
+# 이메일 인증 코드 / 재전송 횟수 / 잠금 상태를 UserEmail 행 대신 TTL 키-값 저장소에 보관합니다.
+# 요청마다 user_email 행을 트랜잭션 안에서 다시 쓰지 않고, 인증에 성공했을 때만 DB 에 기록합니다.
+#
+#   - CacheVerificationStore : 공유 캐시(settings.CACHES, 운영은 Redis) - 여러 워커가 같은 상태를 봅니다.
+#   - MemoryVerificationStore: 프로세스 메모리 - 단일 프로세스 개발 / 테스트용
+
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+
+DEFAULT_VERIFICATION_STORE = {
+    # 'cache' 또는 'memory'
+    'BACKEND': 'cache',
+    # BACKEND 가 'cache' 일 때 사용할 캐시 alias
+    'ALIAS': 'default',
+    # 인증 코드 유효 시간 (초)
+    'CODE_TTL': 5 * 60,
+    # 잠금 시간 (초)
+    'LOCK_TTL': 5 * 60,
+    # 요청 / 실패 횟수 보관 시간 (초). 잠금 없이 이 시간이 지나면 횟수가 0 부터 다시 시작됩니다.
+    'COUNTER_TTL': 60 * 60,
+    # 허용 횟수. 이 횟수를 넘는 순간 잠급니다. (4번째 요청에서 잠금)
+    'MAX_ATTEMPTS': 3,
+}
+
+
+def _get_config():
+    config = dict(DEFAULT_VERIFICATION_STORE)
+    config.update(getattr(settings, 'VERIFICATION_STORE', {}))
+    return config
+
+
+class VerificationStore:
+    """TTL 키-값 저장소 인터페이스 (ttl 단위: 초)"""
+
+    def get(self, key):
+        raise NotImplementedError
+
+    def set(self, key, value, ttl):
+        raise NotImplementedError
+
+    def incr(self, key, ttl):
+        """1 증가시킨 값을 반환합니다. 키가 없으면 ttl 과 함께 1 로 만듭니다. (만료 시각은 처음 만든 시점 기준)"""
+        raise NotImplementedError
+
+    def delete(self, *keys):
+        raise NotImplementedError
+
+    def compare_and_delete(self, key, expected):
+        """값이 expected 와 같을 때만 삭제하고 True 를 반환합니다. (같은 코드로 두 번 인증되지 않음)"""
+        raise NotImplementedError
+
+
+class CacheVerificationStore(VerificationStore):
+    """
+    Django 캐시 기반 구현. incr 은 캐시의 원자적 incr, compare_and_delete 는
+    cache.add() (Redis SET NX) 로 "소비 표시"를 먼저 선점한 요청만 삭제하도록 해서 원자성을 보장합니다.
+    """
+
+    def __init__(self, alias):
+        self.alias = alias
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def get(self, key):
+        return self.cache.get(key)
+
+    def set(self, key, value, ttl):
+        self.cache.set(key, value, ttl)
+
+    def incr(self, key, ttl):
+        self.cache.add(key, 0, ttl)
+        try:
+            return self.cache.incr(key)
+        except ValueError:
+            # add() 와 incr() 사이에 만료된 경우
+            self.cache.add(key, 0, ttl)
+            return self.cache.incr(key)
+
+    def delete(self, *keys):
+        self.cache.delete_many(keys)
+
+    def compare_and_delete(self, key, expected):
+        if self.cache.get(key) != expected:
+            return False
+        if not self.cache.add(f'{key}:consumed:{expected}', 1, 60):
+            return False
+        self.cache.delete(key)
+        return True
+
+
+class MemoryVerificationStore(VerificationStore):
+    """프로세스 메모리 구현 (모든 연산을 하나의 잠금으로 원자적으로 처리)"""
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def _live(self, key, now):
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        if entry[1] <= now:
+            del self._data[key]
+            return None
+        return entry
+
+    def get(self, key):
+        with self._lock:
+            entry = self._live(key, time.monotonic())
+            return entry[0] if entry else None
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + ttl)
+
+    def incr(self, key, ttl):
+        with self._lock:
+            now = time.monotonic()
+            entry = self._live(key, now)
+            value, expires = (entry[0] + 1, entry[1]) if entry else (1, now + ttl)
+            self._data[key] = (value, expires)
+            return value
+
+    def delete(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def compare_and_delete(self, key, expected):
+        with self._lock:
+            entry = self._live(key, time.monotonic())
+            if entry is None or entry[0] != expected:
+                return False
+            del self._data[key]
+            return True
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_verification_store():
+    """설정(VERIFICATION_STORE['BACKEND'])에 맞는 저장소 싱글톤"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            config = _get_config()
+            if config['BACKEND'] == 'memory':
+                _store = MemoryVerificationStore()
+            else:
+                _store = CacheVerificationStore(config['ALIAS'])
+        return _store
+
+
+def reset_verification_store():
+    """설정 변경(테스트) 시 저장소를 다시 만들도록 합니다."""
+    global _store
+    with _store_lock:
+        _store = None
+
+
+# ----------------------------------------------------------------------
+# 사용자별 인증 상태
+# ----------------------------------------------------------------------
+PURPOSE_AUTH = 'auth'      # 회원가입 이메일 인증 (email-auth-send / email-auth-confirm)
+PURPOSE_CHANGE = 'change'  # 이메일 변경 (email_change_request / email_change_verify)
+
+CODE_OK = 'ok'
+CODE_MISSING = 'missing'    # 발급되지 않았거나 만료됨
+CODE_MISMATCH = 'mismatch'
+
+
+class EmailVerification:
+    """
+    사용자 1명, 용도 1개의 인증 상태
+
+    키 구성 (verify:<purpose>:<user_id>:...)
+        code     : 인증 코드 (CODE_TTL 후 만료)
+        attempts : 요청 / 실패 횟수 (COUNTER_TTL 후 만료)
+        lock     : 잠금 시각 (LOCK_TTL 후 만료 = 잠금 해제)
+    """
+    KEY_PREFIX = 'verify'
+
+    def __init__(self, user_id, purpose, store=None):
+        config = _get_config()
+        self.user_id = user_id
+        self.purpose = purpose
+        self.store = store or get_verification_store()
+        self.code_ttl = config['CODE_TTL']
+        self.lock_ttl = config['LOCK_TTL']
+        self.counter_ttl = config['COUNTER_TTL']
+        self.max_attempts = config['MAX_ATTEMPTS']
+
+    def key(self, name):
+        return f'{self.KEY_PREFIX}:{self.purpose}:{self.user_id}:{name}'
+
+    # --- 잠금 ---
+    def locked_at(self):
+        """잠겨 있으면 잠금 시각, 아니면 None"""
+        return self.store.get(self.key('lock'))
+
+    def unlock_time(self, locked_at):
+        return locked_at + timedelta(seconds=self.lock_ttl)
+
+    def lock(self):
+        """잠그고 횟수를 초기화합니다. (잠금이 풀린 뒤에는 1회부터 다시 셉니다.)"""
+        locked_at = timezone.now()
+        self.store.set(self.key('lock'), locked_at, self.lock_ttl)
+        self.store.delete(self.key('attempts'))
+        return locked_at
+
+    # --- 횟수 ---
+    def register_attempt(self):
+        """
+        요청 / 실패 1회를 기록합니다.
+        Returns:
+            (횟수, 이번 기록으로 잠겼는지)
+        """
+        count = self.store.incr(self.key('attempts'), self.counter_ttl)
+        tripped = count > self.max_attempts
+        if tripped:
+            self.lock()
+        return count, tripped
+
+    # --- 코드 ---
+    def issue_code(self, code):
+        self.store.set(self.key('code'), code, self.code_ttl)
+
+    def peek_code(self):
+        return self.store.get(self.key('code'))
+
+    def consume_code(self, code):
+        """코드가 맞으면 삭제(1회용)하고 CODE_OK, 아니면 CODE_MISSING / CODE_MISMATCH"""
+        if self.store.compare_and_delete(self.key('code'), code):
+            return CODE_OK
+        return CODE_MISSING if self.peek_code() is None else CODE_MISMATCH
+
+    def reset(self):
+        self.store.delete(self.key('code'), self.key('attempts'), self.key('lock'))
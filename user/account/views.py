@@ -1,5 +1,12 @@
+import json
 import random
 
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+
 from rest_framework import generics, permissions
 from rest_framework.views import APIView
 from rest_framework.response import Response
@@ -8,18 +15,19 @@ from rest_framework import status
 from django.contrib.auth import login
 from django.db import transaction
 from django.utils import timezone
-from datetime import timedelta
-
-# mail 처리 부분
-from django.core.mail import send_mail
-from django.conf import settings
 
-from rest_framework_simplejwt.views import TokenObtainPairView
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from rest_framework.permissions import IsAuthenticated
-from rest_framework_simplejwt.authentication import JWTAuthentication # settings.py에 설정된 인증 클래스와 일치해야 합니다.
+from .models import UserEmail
+from .authentication import CachedJWTAuthentication # settings.py에 설정된 인증 클래스와 일치해야 합니다.
 #from .serializers import CustomTokenObtainPairSerializer
 
-from .tasks import send_auth_email_task # Celery Task import
+from rest_framework.exceptions import APIException
+
+from .utils.email_delivery import send_email
+from .utils.email_templates import KIND_VERIFY
+from .utils.hashing_pool import get_hashing_pool
+from .utils.verification_store import PURPOSE_AUTH, EmailVerification
 
 # **하나의 import 문으로 필요한 모든 Serializer를 가져옵니다.**
 from .serializers import (
@@ -29,6 +37,7 @@ from .serializers import (
     EmailChangeVerifySerializer,
     EmailChangeRequestSerializer,
     CustomTokenObtainPairSerializer,
+    CachedTokenRefreshSerializer,
     UserLoginSerializer
 )
 
@@ -83,61 +92,102 @@ class CustomTokenObtainPairView(TokenObtainPairView):
     permission_classes = [permissions.AllowAny]
 
 
+# api/token/refresh : 캐시된 클레임 스냅샷으로 최신 클레임을 담아 재발급
+class CachedTokenRefreshView(TokenRefreshView):
+    serializer_class = CachedTokenRefreshSerializer
+    permission_classes = [permissions.AllowAny]
+
+
 # ----------------------------------------------------------------------
-# 5. email 인증 코드 보내기
+# 4. 비동기 로그인 / 회원가입 (ASGI - UvicornWorker 용)
+#
+# 비밀번호 해시 비교/생성(PBKDF2)만 프로세스 풀(utils/hashing_pool.py)에서 실행하고,
+# DB 작업은 sync_to_async 로 처리합니다. 풀이 가득 차면 503 을 반환합니다.
+# 응답 형식은 동기 View(CustomTokenObtainPairView, UserRegistrationView)와 동일합니다.
 # ----------------------------------------------------------------------
-# 임시 이메일 전송 함수 (실제로는 SMTP 설정이 필요합니다)
-def send_auth_email(email, code):
-    """실제 이메일 전송 로직이 들어갈 자리입니다."""
-    print(f"📧 이메일 전송 시뮬레이션: {email}에게 인증 코드 {code} 전송됨.")
-
-    subject = "회원가입 이메일 인증 코드"
-    message = f"인증 코드는 {code} 입니다. 5분 내에 입력해 주세요."
-    html_message_template = """
-    <html>
-    <body>
-        <h3 >이메일 인증</h3>
-
-        <p>
-            ℹ️ 인증번호 6자리 <strong>{code}</strong>
-        <br>
-        <p>
-            위 6자리 번호를 입력하여 인증을 완료하세요.<br>
-            <br>
-            <strong>인증번호는 5분간 유효합니다.</strong>
-        </p>
-    </body>
-    </html>
-    """
-    html_message = html_message_template.format(code=code)
-    from_email = settings.DEFAULT_FROM_EMAIL
-    recipient_list = [email]
+def _json_response(data, status_code):
+    return JsonResponse(data, status=status_code, safe=False, json_dumps_params={'ensure_ascii': False})
 
 
+def _parse_json_body(request):
     try:
-        send_mail(
-            subject,
-            message,
-            from_email,
-            recipient_list,
-            fail_silently=False, # 전송 실패 시 예외 발생
-            html_message=html_message,
-        )
-        return "이메일 전송 성공"
-    except Exception as e:
-        # 전송 실패 시 처리
-        print(f"이메일 전송 실패: {e}")
-        return "이메일 전송 실패"
+        return json.loads(request.body or b'{}')
+    except ValueError:
+        return None
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class AsyncTokenObtainPairView(View):
+    """CustomTokenObtainPairSerializer 의 각 단계를 비동기로 실행하는 로그인 View"""
+
+    async def post(self, request):
+        data = _parse_json_body(request)
+        if not isinstance(data, dict):
+            return _json_response({"detail": "JSON 형식의 요청이 필요합니다."}, status.HTTP_400_BAD_REQUEST)
+
+        serializer = CustomTokenObtainPairSerializer(data=data, context={'request': request})
+        pool = get_hashing_pool()
+
+        try:
+            # 1. 필드 검증 (DB 사용 없음)
+            attrs = serializer.to_internal_value(data)
+            # 2. 사용자 조회 및 잠금 확인
+            user = await sync_to_async(serializer.load_login_user)(attrs)
+            # 3. 비밀번호 비교 (프로세스 풀)
+            password_ok, must_update = await pool.check_password(attrs['password'], user.password)
+            if password_ok and must_update:
+                # 해시 설정이 바뀐 경우에만 새 해시로 교체
+                user.password = await pool.make_password(attrs['password'])
+                await sync_to_async(user.save)(update_fields=['password'])
+            await sync_to_async(serializer.accept_password)(user, password_ok)
+            # 4. 토큰 발급
+            response_data = await sync_to_async(serializer.build_response)(user)
+        except APIException as e:
+            # ValidationError(400), HashingPoolSaturated(503) 등
+            return _json_response(e.detail, e.status_code)
 
+        return _json_response(response_data, status.HTTP_200_OK)
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class AsyncUserRegistrationView(View):
+    """비밀번호 해시 생성을 프로세스 풀에서 실행하는 회원가입 View"""
+
+    async def post(self, request):
+        data = _parse_json_body(request)
+        if not isinstance(data, dict):
+            return _json_response({"detail": "JSON 형식의 요청이 필요합니다."}, status.HTTP_400_BAD_REQUEST)
+
+        serializer = UserRegistrationSerializer(data=data, context={'request': request})
+
+        # 1. 유효성 검사 (이메일 중복 확인 등 DB 사용)
+        if not await sync_to_async(serializer.is_valid)():
+            return _json_response(serializer.errors, status.HTTP_400_BAD_REQUEST)
+
+        try:
+            # 2. 비밀번호 해시 생성 (프로세스 풀)
+            password_hash = await get_hashing_pool().make_password(serializer.validated_data['password1'])
+        except APIException as e:
+            return _json_response(e.detail, e.status_code)
+
+        # 3. 저장
+        await sync_to_async(serializer.save)(password_hash=password_hash)
+        response_data = await sync_to_async(lambda: serializer.data)()
+
+        return _json_response(response_data, status.HTTP_201_CREATED)
+
+
+# ----------------------------------------------------------------------
+# 5. email 인증 코드 보내기
+# ----------------------------------------------------------------------
 class EmailAuthSendView(APIView):
     """
-    이메일로 인증 코드를 전송하고, UserEmail 모델의 상태를 업데이트합니다.
-    (잠금 해제, 카운트 증가, 신규 잠금 등)
+    이메일로 인증 코드를 전송하고, 인증 상태 저장소의 재전송 횟수 / 잠금을 갱신합니다.
+    (코드 / 횟수 / 잠금은 utils/verification_store.py 에 보관하므로 user_email 행은 수정하지 않습니다.)
     """
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [CachedJWTAuthentication]
     permission_classes = [permissions.IsAuthenticated] # IsAuthenticated로 수정 권장
 
-    @transaction.atomic # DB 업데이트와 이메일 전송 요청을 원자적으로 처리
     def post(self, request):
         user = request.user
         # Serializer에 요청 객체를 context로 전달하여 Serializer 내부에서 user 정보를 사용하도록 합니다.
@@ -164,58 +214,25 @@ class EmailAuthSendView(APIView):
 
 
         auth_code = ''.join(random.choices('0123456789', k=6))
+        verification = serializer.context['verification']
 
         response_message = "인증 코드가 이메일로 전송되었습니다. 코드를 확인해 주세요."
         response_code = "RE000"
 
-        # 3. 비즈니스 로직 처리 (DB 상태 변경)
-        if email_info.email_refresh_count > 3 and email_info.email_auth_lock is True and email_info.email_lock_time is None :
-            print("이슈 email_refresh_count > 3, email_auth_lock is True,email_lock_time is None ")
-            email_info.email_auth_lock = False
-            email_info.email_lock_time = None
-            email_info.email_refresh_count = 1 # 1로 초기화
-
-
-        if email_info.email_refresh_count > 3 and email_info.email_auth_lock is False and email_info.email_lock_time is not None :
-            print("이슈 email_refresh_count > 3, email_auth_lock is False,email_lock_time is not None ")
-            email_info.email_lock_time = None
-            email_info.email_refresh_count = 1 # 1로 초기화
-
-        if email_info.email_refresh_count > 3 and  email_info.email_auth_lock is False and email_info.email_lock_time is None :
-            print("이슈 email_refresh_count > 3, email_auth_lock is False,email_lock_time is None ")
-            email_info.email_lock_time = None
-            email_info.email_refresh_count = 1 # 1로 초기화
-
-
-        # [A] 잠금 상태였으나 5분이 경과하여 잠금을 해제하고 카운트를 리셋하는 경우
-        if email_info.email_auth_lock:
-            # Serializer가 5분 미만은 걸러냈으므로, 이 로직은 5분이 지났다는 의미
-            print("5분이 경과하여 잠금을 해제하고 카운트를 1로 초기화합니다.")
-            email_info.email_auth_lock = False
-            email_info.email_lock_time = None
-            email_info.email_refresh_count = 1 # 1로 초기화
-
-        # [B] 잠금 상태가 아니었으며, 카운트를 증가시키는 경우
-        else:
-            email_info.email_refresh_count += 1
-            print(f"카운트를 1 증가시킵니다. 현재: {email_info.email_refresh_count}")
-
-            # [C] 카운트 증가 결과, 4회 이상이 되어 잠금이 *새로* 설정되는 경우
-            if email_info.email_refresh_count > 3:
-                print("카운트가 4회가 되어 계정을 잠급니다.")
-                email_info.email_auth_lock = True
-                email_info.email_lock_time = timezone.now()
-                print("timezone.now() : ", timezone.now())
-                response_message = "코드가 전송되었습니다. 하지만 4회 이상 요청으로 5분간 계정이 잠깁니다."
-                response_code = "RE003" # 잠금 알림 코드
-
-        # [D] 공통 작업: 인증 코드 및 시간 업데이트
-        email_info.email_auth_code = auth_code
-        email_info.email_code_date = timezone.now()
-        email_info.save()
+        # 3. 재전송 횟수 증가 (utils/verification_store.py, DB 쓰기 없음)
+        #    4회째 요청이면 5분간 잠금. 이번 요청의 코드는 전송합니다.
+        count, locked = verification.register_attempt()
+        print(f"재전송 횟수: {count}")
+        if locked:
+            print("카운트가 4회가 되어 계정을 잠급니다.")
+            response_message = "코드가 전송되었습니다. 하지만 4회 이상 요청으로 5분간 계정이 잠깁니다."
+            response_code = "RE003" # 잠금 알림 코드
+
+        # 인증 코드 저장 (5분 후 자동 만료)
+        verification.issue_code(auth_code)
 
         # 4. 이메일 전송 (비동기)
-        send_auth_email_task.delay(email, auth_code) # 실제 운영 시 주석 해제
+        send_email(email, auth_code, KIND_VERIFY, call_site='email-auth-send') # 아웃박스에 저장 -> 커밋 후 워커가 전송 (utils/email_delivery.py)
         print(f"비동기 이메일 전송 요청: {email}로 {auth_code} 전송") # 테스트용 로그
 
         # 5. 응답 반환
@@ -242,11 +259,10 @@ class EmailAuthConfirmView(APIView):
     """
 
     # 1. 인증 클래스 지정: JWT 토큰을 사용하여 사용자를 인증합니다.
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [CachedJWTAuthentication]
     # 2. 권한 클래스 지정: 인증된 사용자만 접근을 허용합니다.
     permission_classes = [IsAuthenticated]
 
-    @transaction.atomic # DB 업데이트를 원자적으로 처리
     def post(self, request):
         # request.user는 JWT 토큰을 통해 인증된 UserInfo 인스턴스입니다.
         user = request.user
@@ -255,20 +271,19 @@ class EmailAuthConfirmView(APIView):
         serializer = EmailAuthConfirmSerializer(data=request.data, context={'request': request})
         serializer.is_valid(raise_exception=True)
 
-        email_info = serializer.context['email_info'] # Serializer에서 가져옴
+        email_info = serializer.context['email_info'] # Serializer에서 가져옴 (캐시된 값일 수 있음)
 
+        # 1. UserEmail 객체의 상태 업데이트 (인증 성공 시에만 DB 기록, 코드는 Serializer 에서 이미 삭제됨)
+        #    email_auth_count 를 캐시된 값에 더하면 동시 요청의 증가분을 잃으므로 행을 잠그고 다시 읽어서 저장합니다.
+        with transaction.atomic():
+            email_info = UserEmail.objects.select_for_update().get(pk=email_info.pk)
+            email_info.email_auth = True
+            email_info.email_auth_date = timezone.now().date()
+            email_info.email_auth_count += 1
+            email_info.save(update_fields=['email_auth', 'email_auth_date', 'email_auth_count'])
 
-        # 1. UserEmail 객체의 상태 업데이트
-        email_info.email_auth = True
-        email_info.email_auth_code = None # 인증 완료 후 코드 제거 (재사용 방지)
-        email_info.email_code_date = None # 인증 완료 후 코드 제거 (재사용 방지)
-        email_info.email_auth_date = timezone.now().date()
-        # 기타 인증 관련 카운트/락 필드 초기화 (선택 사항)
-        email_info.email_auth_count += 1
-        email_info.email_refreash_count = 0
-        email_info.email_auth_lock = False
-        email_info.email_lock_time = None
-        email_info.save()
+        # 2. 재전송 횟수 / 잠금 초기화
+        EmailVerification(user.pk, PURPOSE_AUTH).reset()
 
         return Response({
             "detail": ("이메일 인증이 성공적으로 완료되었습니다."),
@@ -283,8 +298,8 @@ class EmailAuthConfirmView(APIView):
 class EmailChangeRequestView(APIView):
     """새 이메일 주소를 제출하고 인증 코드를 요청합니다."""
 
-    # JWTAuthentication을 사용하신다면 그대로 두시면 됩니다.
-    authentication_classes = [JWTAuthentication]
+    # CachedJWTAuthentication을 사용하신다면 그대로 두시면 됩니다.
+    authentication_classes = [CachedJWTAuthentication]
     permission_classes = [permissions.IsAuthenticated]
 
     def post(self, request): # @transaction.atomic은 Serializer.save()로 이동 권장
@@ -306,7 +321,7 @@ class EmailChangeVerifyView(APIView):
     """
     인증 코드를 제출하여 이메일 주소 변경을 완료합니다.
     """
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [CachedJWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
@@ -3,21 +3,30 @@ from django.utils.translation import gettext_lazy as _
 from .models import ApprovalRequest, ApprovalStatus, CancelCooldown
 from django.utils import timezone # 처리 시각 저장을 위해 필요
 from datetime import timedelta
+from account.utils.claim_snapshot import ClaimSnapshotCache
 # -----------------------------------------------------
 # Custom Admin Actions (일괄 승인/거부)
 # -----------------------------------------------------
 
+def invalidate_approver_snapshots(approver_ids):
+    """QuerySet.update() 는 시그널을 보내지 않으므로 승인자 클레임 스냅샷을 직접 무효화합니다."""
+    for approver_id in approver_ids:
+        ClaimSnapshotCache.invalidate(approver_id)
+
+
 @admin.action(description=_('선택된 요청을 승인으로 변경'))
 def approve_requests(modeladmin, request, queryset):
     """선택된 요청들을 'APPROVED' 상태로 변경하고 처리 시각을 기록합니다."""
     # 이미 처리된 요청(APPROVED, REJECTED, CANCELED)을 제외하고 PENDING인 요청만 처리
     pending_requests = queryset.filter(status=ApprovalStatus.PENDING)
+    approver_ids = set(pending_requests.values_list('approver_id', flat=True))
 
     # 업데이트
     updated_count = pending_requests.update(
         status=ApprovalStatus.APPROVED,
         approved_or_rejected_at=timezone.now()
     )
+    invalidate_approver_snapshots(approver_ids)
 
     modeladmin.message_user(
         request,
@@ -28,12 +37,14 @@ def approve_requests(modeladmin, request, queryset):
 def reject_requests(modeladmin, request, queryset):
     """선택된 요청들을 'REJECTED' 상태로 변경하고 처리 시각을 기록합니다."""
     pending_requests = queryset.filter(status=ApprovalStatus.PENDING)
+    approver_ids = set(pending_requests.values_list('approver_id', flat=True))
 
     updated_count = pending_requests.update(
         status=ApprovalStatus.REJECTED,
         approved_or_rejected_at=timezone.now(),
         reason=_('관리자에 의한 일괄 거부') # 일괄 거부 사유 기본값 설정
     )
+    invalidate_approver_snapshots(approver_ids)
 
     modeladmin.message_user(
         request,
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class ApprovalConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'approval'
+
+    # 앱이 로드될 때 signals.py를 가져와 시그널을 등록합니다.
+    def ready(self):
+        import approval.signals
@@ -0,0 +1,18 @@
+# approval/signals.py
+#
+# 승인 요청(ApprovalRequest)이 생성/변경/삭제되면 승인자(approver)의 토큰 클레임
+# (approval_status, approval_count, claims_version, approval_list)이 바뀌므로
+# account 의 클레임 스냅샷 캐시를 무효화합니다.
+
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from account.utils.claim_snapshot import ClaimSnapshotCache
+from .models import ApprovalRequest
+
+
+@receiver(post_save, sender=ApprovalRequest)
+@receiver(post_delete, sender=ApprovalRequest)
+def invalidate_approver_claim_snapshot(sender, instance, **kwargs):
+    if instance.approver_id:
+        ClaimSnapshotCache.invalidate(instance.approver_id)
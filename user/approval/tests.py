@@ -1,3 +1,54 @@
 from django.test import TestCase
+from django.urls import reverse
 
-# Create your tests here.
+from rest_framework.test import APIClient
+
+from account.models import UserInfo
+from account.utils.claims import approval_version
+from .models import ApprovalRequest, ApprovalStatus, RequestType
+
+
+# ----------------------------------------------------------------------
+# 1. PENDING 목록 delta API
+# ----------------------------------------------------------------------
+class PendingApprovalDeltaTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.master = UserInfo.objects.create(
+            email='master@oasiss.co.kr', nick_name='master', family_level='master'
+        )
+        cls.requests = [
+            ApprovalRequest.objects.create(
+                requestee=UserInfo.objects.create(email=f'member{i}@oasiss.co.kr', nick_name=f'member{i}'),
+                approver=cls.master,
+                request_type=RequestType.GROUP_JOIN
+            )
+            for i in range(2)
+        ]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.master)
+        self.url = reverse('check-pending-approvals-delta')
+
+    def test_unchanged_version_returns_no_list(self):
+        version = approval_version(r.id for r in self.requests)
+
+        response = self.client.get(self.url, {'version': version})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.data['changed'])
+        self.assertNotIn('list', response.data)
+
+    def test_changed_version_returns_list(self):
+        version = approval_version(r.id for r in self.requests)
+        self.requests[0].status = ApprovalStatus.APPROVED
+        self.requests[0].save()
+
+        response = self.client.get(self.url, {'version': version})
+
+        self.assertTrue(response.data['changed'])
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(response.data['version'], approval_version([self.requests[1].id]))
+        self.assertEqual(response.data['list'][0]['id'], self.requests[1].id)
@@ -1,6 +1,6 @@
 # app/urls.py
 from django.urls import path
-from .views import ApprovalRequestAPIView, PendingApprovalCheckAPIView, ApprovalRequestUpdateAPIView
+from .views import ApprovalRequestAPIView, PendingApprovalCheckAPIView, ApprovalRequestUpdateAPIView, PendingApprovalDeltaAPIView
 
 urlpatterns = [
     # POST , DELETE
@@ -15,6 +15,9 @@ urlpatterns = [
     # 나에게 들어온 승인 요청 확인 (GET)
     # 예시: GET /api/v1/approvals/check-pending/
     path('check-pending/', PendingApprovalCheckAPIView.as_view(), name='check-pending-approvals'),
+    # 토큰의 claims_version 과 비교하여 바뀐 경우에만 목록 반환 (GET ?version=...)
+    # 예시: GET /api/v1/approvals/check-pending/delta/?version=3f2a9c0d1b7e
+    path('check-pending/delta/', PendingApprovalDeltaAPIView.as_view(), name='check-pending-approvals-delta'),
 
 
 ]
\ No newline at end of file
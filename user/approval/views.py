@@ -12,6 +12,8 @@ from .utils.cooldown import RequestCooldownManager
 from django.conf import settings
 
 from account.models import UserInfo as User
+from account.utils.claims import approval_version
+from log_events.metrics import measure_phase
 
 UserModel = settings.AUTH_USER_MODEL # settings.AUTH_USER_MODEL을 참조하는 것이 권장됩니다.
 
@@ -185,12 +187,14 @@ class PendingApprovalCheckAPIView(APIView):
         # list에 필요한 필드만 포함하도록 ApprovalRequestSerializer를 사용하거나,
         # 목록 전용의 경량 Serializer를 사용하는 것이 더 효율적입니다.
         # (여기서는 전체 Serializer를 사용한다고 가정합니다.)
-        serializer = ApprovalRequestSerializer(pending_requests, many=True)
+        with measure_phase('serializer'):
+            serializer = ApprovalRequestSerializer(pending_requests, many=True)
+            serialized_list = serializer.data
 
         # 4. 응답 구성
         response_data = {
             'status': has_pending_requests, # 요청 존재 여부
-            'list': serializer.data        # 요청 목록 (없으면 빈 리스트)
+            'list': serialized_list        # 요청 목록 (없으면 빈 리스트)
         }
 
         # 5. 결과 응답
@@ -198,6 +202,53 @@ class PendingApprovalCheckAPIView(APIView):
             response_data,
             status=status.HTTP_200_OK
         )
+class PendingApprovalDeltaAPIView(APIView):
+    """
+    GET: 토큰의 claims_version 과 현재 PENDING 목록의 버전을 비교합니다.
+    - 같으면 목록 없이 version 만 응답합니다. (id 목록 조회 1회)
+    - 다르면 새 version 과 함께 전체 목록을 응답합니다.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        client_version = request.query_params.get('version')
+
+        pending_requests = ApprovalRequest.objects.filter(
+            approver=request.user,
+            status=ApprovalStatus.PENDING
+        ).order_by('requested_at')
+
+        # 1. 가벼운 id 목록만으로 현재 버전 계산
+        pending_ids = list(pending_requests.values_list('id', flat=True))
+        current_version = approval_version(pending_ids)
+
+        # 2. 변경 없음: 목록을 직렬화하지 않고 바로 응답
+        if client_version == current_version:
+            return Response(
+                {
+                    'version': current_version,
+                    'changed': False,
+                },
+                status=status.HTTP_200_OK
+            )
+
+        # 3. 변경됨: 전체 목록 응답
+        # (두 조회 사이에 목록이 바뀌었을 수 있으므로 실제 응답 목록으로 버전을 다시 계산)
+        pending_list = list(pending_requests)
+        with measure_phase('serializer'):
+            serializer = ApprovalRequestSerializer(pending_list, many=True)
+            serialized_list = serializer.data
+
+        return Response(
+            {
+                'version': approval_version(r.id for r in pending_list),
+                'changed': True,
+                'status': len(pending_list) > 0,
+                'count': len(pending_list),
+                'list': serialized_list
+            },
+            status=status.HTTP_200_OK
+        )
 # {
 #     "status": "approved",
 #     "reason": "요청 사항이 규정에 부합함"
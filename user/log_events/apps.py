@@ -4,3 +4,14 @@ from django.apps import AppConfig
 class LogEventsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'log_events'
+
+    def ready(self):
+        from django.db import connections
+        from django.db.backends.signals import connection_created
+
+        from .metrics import install_query_hook
+
+        # 요청별 SQL 수 / DB 시간 측정 (metrics.measure_queries). 이미 열린 연결에도 등록합니다.
+        connection_created.connect(install_query_hook, dispatch_uid='log_events_query_hook')
+        for connection in connections.all(initialized_only=True):
+            install_query_hook(connection)
@@ -0,0 +1,275 @@
+# log_events/metrics.py
+#
+# 엔드포인트(URL name)별 SQL 쿼리 수 / DB 시간 / Serializer 시간 / 전체 시간을
+# 프로세스 내부 히스토그램에 기록합니다. (워커 프로세스마다 따로 집계됩니다.)
+#
+#   - 요청 단위 측정은 middleware.EndpointMetricsMiddleware 가 measure_request() 로 처리합니다.
+#   - 요청 안의 특정 구간은 measure_phase('serializer') 로 감싸서 측정합니다. (데코레이터로도 사용 가능)
+#   - 요청과 별개인 호출 지점별 시간은 timings.observe(그룹, 이름, ms) 로 기록합니다.
+
+import math
+import threading
+import time
+from bisect import bisect_left
+from contextlib import ContextDecorator, contextmanager
+from contextvars import ContextVar
+
+# 지연 시간(ms) 버킷 상한
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, math.inf)
+# 쿼리 수 버킷 상한
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, math.inf)
+
+METRIC_QUERIES = 'queries'
+METRIC_DB_MS = 'db_ms'
+METRIC_SERIALIZER_MS = 'serializer_ms'
+METRIC_TOTAL_MS = 'total_ms'
+
+PHASE_SERIALIZER = 'serializer'
+
+UNRESOLVED_ENDPOINT = '<unresolved>'
+
+
+class Histogram:
+    """고정 버킷 히스토그램. 백분위수는 해당 버킷의 상한(마지막 버킷은 최대값)으로 근사합니다."""
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total += value
+            self.min = value if self.min is None else min(self.min, value)
+            self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, pct):
+        if not self.count:
+            return 0
+        rank = max(1, math.ceil(pct / 100 * self.count))
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return self.max if bound == math.inf else min(bound, self.max)
+        return self.max
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'count': self.count,
+                'mean': round(self.total / self.count, 3) if self.count else 0,
+                'min': round(self.min, 3) if self.min is not None else 0,
+                'max': round(self.max, 3) if self.max is not None else 0,
+                'p50': round(self.percentile(50), 3),
+                'p95': round(self.percentile(95), 3),
+                'p99': round(self.percentile(99), 3),
+                'buckets': {
+                    ('+Inf' if bound == math.inf else str(bound)): count
+                    for bound, count in zip(self.buckets, self.counts)
+                },
+            }
+
+
+class EndpointMetrics:
+    """엔드포인트 하나의 히스토그램 묶음"""
+
+    def __init__(self):
+        self.histograms = {
+            METRIC_QUERIES: Histogram(QUERY_COUNT_BUCKETS),
+            METRIC_DB_MS: Histogram(LATENCY_BUCKETS_MS),
+            METRIC_SERIALIZER_MS: Histogram(LATENCY_BUCKETS_MS),
+            METRIC_TOTAL_MS: Histogram(LATENCY_BUCKETS_MS),
+        }
+
+    def record(self, measurement):
+        self.histograms[METRIC_QUERIES].observe(measurement.queries)
+        self.histograms[METRIC_DB_MS].observe(measurement.db_ms)
+        self.histograms[METRIC_SERIALIZER_MS].observe(measurement.phase_ms(PHASE_SERIALIZER))
+        self.histograms[METRIC_TOTAL_MS].observe(measurement.total_ms)
+
+    def snapshot(self):
+        return {name: histogram.snapshot() for name, histogram in self.histograms.items()}
+
+
+class MetricsRegistry:
+    """엔드포인트 이름 -> EndpointMetrics (프로세스 단위)"""
+
+    def __init__(self):
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+    def endpoint(self, name):
+        with self._lock:
+            metrics = self._endpoints.get(name)
+            if metrics is None:
+                metrics = self._endpoints[name] = EndpointMetrics()
+            return metrics
+
+    def record(self, measurement):
+        self.endpoint(measurement.endpoint or UNRESOLVED_ENDPOINT).record(measurement)
+
+    def snapshot(self):
+        with self._lock:
+            endpoints = dict(self._endpoints)
+        return {name: metrics.snapshot() for name, metrics in sorted(endpoints.items())}
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+
+registry = MetricsRegistry()
+
+
+class TimingRegistry:
+    """
+    (그룹, 이름) -> 지연 시간 히스토그램 (프로세스 단위)
+    요청 단위가 아닌 호출 지점별 시간을 모읍니다. 예: ('email_enqueue', 'email-auth-send')
+    """
+
+    def __init__(self):
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, group, name):
+        key = (group, name)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(LATENCY_BUCKETS_MS)
+            return histogram
+
+    def observe(self, group, name, value_ms):
+        self.histogram(group, name).observe(value_ms)
+
+    def snapshot(self):
+        with self._lock:
+            histograms = dict(self._histograms)
+        result = {}
+        for (group, name), histogram in sorted(histograms.items()):
+            result.setdefault(group, {})[name] = histogram.snapshot()
+        return result
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+
+timings = TimingRegistry()
+
+
+# ----------------------------------------------------------------------
+# 요청 단위 측정
+# ----------------------------------------------------------------------
+class RequestMeasurement:
+    """요청 1회의 측정 값 (measure_request() 안에서만 유효)"""
+
+    def __init__(self, endpoint=None, parent=None):
+        self.endpoint = endpoint
+        # 바깥 측정 (벤치마크가 요청 전체를 measure_request 로 감싼 경우 미들웨어의 측정이 안쪽)
+        self.parent = parent
+        self.queries = 0
+        self.db_ms = 0.0
+        self.total_ms = 0.0
+        self.phases = {}
+
+    def phase_ms(self, name):
+        return self.phases.get(name, 0.0)
+
+    def add_phase(self, name, elapsed_ms):
+        self.phases[name] = self.phases.get(name, 0.0) + elapsed_ms
+
+    # measure_queries() 가 측정 중인 요청의 SQL 실행마다 호출합니다. 바깥 측정에도 함께 더합니다.
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            measurement = self
+            while measurement is not None:
+                measurement.queries += 1
+                measurement.db_ms += elapsed_ms
+                measurement = measurement.parent
+
+
+_current = ContextVar('endpoint_measurement', default=None)
+
+
+def current_measurement():
+    return _current.get()
+
+
+def measure_queries(execute, sql, params, many, context):
+    """
+    모든 DB 연결에 한 번씩 등록해 두는 execute wrapper. 측정 중인 요청이 있으면 그 측정에 더합니다.
+    DB 연결은 스레드마다 따로이므로, 요청마다 현재 스레드의 연결에만 등록하면 비동기 View 의
+    sync_to_async 스레드에서 실행된 SQL 을 놓칩니다. 측정은 ContextVar 로 찾으므로 그 스레드로도 전달됩니다.
+    """
+    measurement = _current.get()
+    if measurement is None:
+        return execute(sql, params, many, context)
+    return measurement(execute, sql, params, many, context)
+
+
+def install_query_hook(connection, **kwargs):
+    """connection_created 시그널 수신자 (apps.LogEventsConfig.ready 에서 연결)"""
+    if measure_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, measure_queries)
+
+
+@contextmanager
+def measure_request(endpoint=None, record=True):
+    """
+    블록 안에서 실행된 SQL 수 / DB 시간 / 전체 시간을 측정합니다.
+    endpoint 는 블록 안에서 measurement.endpoint 로 나중에 정해도 됩니다. (미들웨어는 URL 해석 후 설정)
+    """
+    measurement = RequestMeasurement(endpoint, parent=_current.get())
+    token = _current.set(measurement)
+    started = time.perf_counter()
+    try:
+        yield measurement
+    finally:
+        measurement.total_ms = (time.perf_counter() - started) * 1000
+        _current.reset(token)
+        if record:
+            registry.record(measurement)
+
+
+class measure_phase(ContextDecorator):
+    """
+    요청 안의 특정 구간 시간을 현재 측정에 더합니다. 측정 중이 아니면 아무것도 하지 않습니다.
+
+        with measure_phase('serializer'):
+            serializer.is_valid(raise_exception=True)
+
+        @measure_phase('serializer')
+        def validate(self, attrs): ...
+    """
+
+    def __init__(self, name=PHASE_SERIALIZER):
+        self.name = name
+        self._started = None
+
+    def _recreate_cm(self):
+        # 데코레이터로 사용할 때 호출마다(스레드마다) 새 인스턴스를 사용합니다.
+        return type(self)(self.name)
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed_ms = (time.perf_counter() - self._started) * 1000
+        measurement = _current.get()
+        if measurement is not None:
+            measurement.add_phase(self.name, elapsed_ms)
+        return False
@@ -0,0 +1,46 @@
+# log_events/middleware.py
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from .metrics import UNRESOLVED_ENDPOINT, measure_request
+
+
+class EndpointMetricsMiddleware:
+    """
+    요청마다 SQL 쿼리 수 / DB 시간 / Serializer 시간 / 전체 시간을 측정해
+    URL name(resolver_match.view_name) 별 히스토그램(log_events/metrics.py)에 기록합니다.
+
+    전체 시간에 다른 미들웨어 처리 시간도 포함되도록 MIDDLEWARE 의 맨 앞에 둡니다.
+
+    ASGI 에서는 비동기로 동작해 비동기 View(로그인 / 회원가입)가 요청마다 스레드를 차지하지 않게 합니다.
+    (측정 상태는 ContextVar 이므로 View 안의 sync_to_async 호출에도 그대로 전달됩니다.)
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        with measure_request() as measurement:
+            response = self.get_response(request)
+            measurement.endpoint = self.endpoint_name(request)
+        return response
+
+    async def __acall__(self, request):
+        with measure_request() as measurement:
+            response = await self.get_response(request)
+            measurement.endpoint = self.endpoint_name(request)
+        return response
+
+    @staticmethod
+    def endpoint_name(request):
+        match = getattr(request, 'resolver_match', None)
+        if match is None:
+            return UNRESOLVED_ENDPOINT
+        return match.view_name or match.route or UNRESOLVED_ENDPOINT
@@ -0,0 +1,44 @@
+# log_events/testing.py
+#
+# 테스트에서 엔드포인트별 쿼리 예산(query budget)을 검증하는 도구입니다.
+
+from contextlib import contextmanager
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import CaptureQueriesContext
+
+
+class QueryBudgetMixin:
+    """
+    TestCase 에 섞어서 사용합니다.
+
+        class MyTests(QueryBudgetMixin, TestCase):
+            query_budgets = {'token_obtain_pair': 2}
+
+            def test_login(self):
+                with self.assertQueryBudget('token_obtain_pair'):
+                    self.client.post(...)
+
+    실행된 쿼리 수가 선언한 예산을 넘으면 실패하며, 실행된 SQL 목록을 함께 보여줍니다.
+    (assertNumQueries 와 달리 예산 이하이면 통과합니다.)
+    """
+    query_budgets = {}
+
+    @contextmanager
+    def assertQueryBudget(self, endpoint, budget=None, using=DEFAULT_DB_ALIAS):
+        if budget is None:
+            if endpoint not in self.query_budgets:
+                self.fail(f"'{endpoint}' 의 쿼리 예산이 선언되지 않았습니다. (query_budgets)")
+            budget = self.query_budgets[endpoint]
+
+        with CaptureQueriesContext(connections[using]) as context:
+            yield context
+
+        executed = len(context.captured_queries)
+        if executed > budget:
+            queries = '\n'.join(
+                f"{i}. {query['sql']}" for i, query in enumerate(context.captured_queries, start=1)
+            )
+            self.fail(
+                f"'{endpoint}' 쿼리 예산 초과: {executed}회 실행 (예산 {budget}회)\n{queries}"
+            )
@@ -1,3 +1,145 @@
-from django.test import TestCase
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.core.handlers.base import BaseHandler
+from django.test import TestCase, override_settings
+from django.urls import reverse
 
-# Create your tests here.
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from account.models import UserInfo
+from account.utils.user_cache import UserAuthCache
+from .metrics import Histogram, measure_phase, measure_request, registry
+from .testing import QueryBudgetMixin
+
+FAST_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+
+# ----------------------------------------------------------------------
+# 1. 엔드포인트 계측 미들웨어 / 관리자 조회 API
+# ----------------------------------------------------------------------
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class EndpointMetricsTests(QueryBudgetMixin, TestCase):
+    PASSWORD = 'oasis-test-pw!1'
+    query_budgets = {
+        'token_obtain_pair': 2,
+        'check-pending-approvals': 3,
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserInfo.objects.create_user(
+            email='metrics@oasiss.co.kr', nick_name='metrics', password=cls.PASSWORD
+        )
+        cls.admin = UserInfo.objects.create_user(
+            email='admin@oasiss.co.kr', nick_name='admin', password=cls.PASSWORD, is_staff=True
+        )
+
+    def setUp(self):
+        cache.clear()
+        UserAuthCache.clear_local()
+        registry.reset()
+
+    def login(self):
+        return self.client.post(
+            reverse('token_obtain_pair'),
+            {'email': self.user.email, 'password': self.PASSWORD},
+            content_type='application/json'
+        )
+
+    def test_login_is_recorded_by_url_name(self):
+        with self.assertQueryBudget('token_obtain_pair'):
+            self.assertEqual(self.login().status_code, 200)
+
+        metrics = registry.snapshot()['token_obtain_pair']
+        self.assertEqual(metrics['queries']['count'], 1)
+        self.assertEqual(metrics['queries']['max'], 2)
+        self.assertGreater(metrics['serializer_ms']['max'], 0)
+        self.assertGreaterEqual(metrics['total_ms']['max'], metrics['db_ms']['max'])
+
+    def test_check_pending_within_budget(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+
+        with self.assertQueryBudget('check-pending-approvals'):
+            self.assertEqual(client.get(reverse('check-pending-approvals')).status_code, 200)
+
+        self.assertIn('check-pending-approvals', registry.snapshot())
+
+    def test_async_handler_chain_is_not_adapted(self):
+        # ASGI 에서 미들웨어 체인 전체가 비동기로 유지됩니다. (어댑트되면 django.request 에 DEBUG 로그가 남음)
+        with self.assertNoLogs('django.request', 'DEBUG'):
+            BaseHandler().load_middleware(is_async=True)
+
+    async def test_async_request_is_recorded(self):
+        token = await sync_to_async(lambda: str(RefreshToken.for_user(self.user).access_token))()
+
+        response = await self.async_client.get(
+            reverse('check-pending-approvals'), headers={'Authorization': f'Bearer {token}'}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        metrics = registry.snapshot()['check-pending-approvals']
+        self.assertEqual(metrics['queries']['max'], self.query_budgets['check-pending-approvals'])
+
+    def test_budget_overrun_fails(self):
+        with self.assertRaises(AssertionError) as ctx:
+            with self.assertQueryBudget('token_obtain_pair', budget=1):
+                self.login()
+
+        self.assertIn('쿼리 예산 초과', str(ctx.exception))
+
+    def test_metrics_endpoint_is_admin_only(self):
+        self.login()
+        client = APIClient()
+
+        client.force_authenticate(self.user)
+        self.assertEqual(client.get(reverse('endpoint-metrics')).status_code, 403)
+
+        client.force_authenticate(self.admin)
+        response = client.get(reverse('endpoint-metrics'))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('token_obtain_pair', response.data['endpoints'])
+
+        self.assertEqual(client.delete(reverse('endpoint-metrics')).status_code, 204)
+        self.assertNotIn('token_obtain_pair', registry.snapshot())
+
+
+# ----------------------------------------------------------------------
+# 2. 히스토그램 / 구간 측정
+# ----------------------------------------------------------------------
+class MetricsPrimitiveTests(TestCase):
+
+    def test_histogram_percentiles_use_bucket_bounds(self):
+        histogram = Histogram((1, 5, 10, float('inf')))
+        for value in (0.5, 3, 3, 7, 50):
+            histogram.observe(value)
+
+        snapshot = histogram.snapshot()
+        self.assertEqual(snapshot['count'], 5)
+        self.assertEqual(snapshot['p50'], 5)
+        self.assertEqual(snapshot['p99'], 50)
+        self.assertEqual(snapshot['buckets'], {'1': 1, '5': 2, '10': 1, '+Inf': 1})
+
+    def test_measure_phase_outside_request_is_noop(self):
+        with measure_phase('serializer'):
+            pass
+
+    def test_measure_request_counts_queries(self):
+        with measure_request('manual', record=False) as measurement:
+            with measure_phase('serializer'):
+                list(UserInfo.objects.all())
+            UserInfo.objects.exists()
+
+        self.assertEqual(measurement.queries, 2)
+        self.assertGreater(measurement.phase_ms('serializer'), 0)
+        self.assertNotIn('manual', registry.snapshot())
+
+    def test_nested_measurement_counts_in_both(self):
+        # 벤치마크의 측정 안에서 미들웨어가 다시 측정하는 경우
+        with measure_request('outer', record=False) as outer:
+            UserInfo.objects.exists()
+            with measure_request('inner', record=False) as inner:
+                UserInfo.objects.exists()
+
+        self.assertEqual((outer.queries, inner.queries), (2, 1))
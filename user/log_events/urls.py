@@ -0,0 +1,9 @@
+# log_events/urls.py
+from django.urls import path
+from .views import EndpointMetricsAPIView
+
+urlpatterns = [
+    # 엔드포인트별 쿼리 수 / 지연 시간 히스토그램 (관리자 전용, GET / DELETE)
+    # 예시: GET /api/v1/metrics/endpoints/
+    path('endpoints/', EndpointMetricsAPIView.as_view(), name='endpoint-metrics'),
+]
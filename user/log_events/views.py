@@ -1,3 +1,32 @@
-from django.shortcuts import render
+# log_events/views.py
 
-# Create your views here.
+from rest_framework import status
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .metrics import registry, timings
+
+
+# ----------------------------------------------------------------------
+# 1. 엔드포인트별 쿼리 / 지연 시간 히스토그램 조회 (관리자 전용)
+# ----------------------------------------------------------------------
+class EndpointMetricsAPIView(APIView):
+    """
+    GET    : URL name 별 queries / db_ms / serializer_ms / total_ms 히스토그램과
+             호출 지점별 시간 히스토그램(timings, 예: email_enqueue)을 응답합니다.
+    DELETE : 집계 값을 초기화합니다.
+
+    값은 요청을 처리한 워커 프로세스의 집계입니다. (워커 간 합산되지 않음)
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        return Response(
+            {'endpoints': registry.snapshot(), 'timings': timings.snapshot()}, status=status.HTTP_200_OK
+        )
+
+    def delete(self, request, *args, **kwargs):
+        registry.reset()
+        timings.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
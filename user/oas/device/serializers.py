@@ -1,18 +1,18 @@
 # oas/auth/device/serializers.py
 
-import json
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 from .models import OasGroup, OasInfo # 같은 디렉토리의 models.py에서 모델 import
 from account.models import UserInfo, UserEmail
 
-from log_events.models import ProjectLogEntry # ⭐️ 통합 모델 임포트
 # datetime 모듈 대신 Django의 timezone을 사용하는 것이 더 안전하고 일반적입니다.
 from django.utils import timezone
 from django.db import IntegrityError, DatabaseError
 from typing import Optional # 반환 타입 힌트를 위해 Optional 임포트
 
 from account.utils.usergroup_manager import UserGroupManager
+from account.utils.user_loader import UserLoader
+from log_events.metrics import measure_phase
 
 from .utils.oas_manager import OasInfoSearchDeviceIdLock, OasInfoNewObject, OasGroupCreateObject, OasInfoDelete
 from .utils.oas_setup_service import OasSetupService
@@ -79,24 +79,15 @@ class AuthRequestSerializer(serializers.Serializer):
     # )
 
     # 현재 검증 중인 'id' 필드의 값은 'data' 변수에 있습니다.
+    @measure_phase('serializer')
     def validate_id(self, data):
 
-        user = self.context['request'].user
+        user = UserLoader.for_request(self.context['request'])
+        email_info = UserLoader.email_info(user)
         oas_group_id = None
 
-        # ✅ 체크. UserEmail 의 내용이 없는 경우 (무조건 있어야 하는 곳인데 없으면 문제가 생기기 때문에 처리 함.)
-        if user.email_info is None :
-            ProjectLogEntry.objects.create(
-                app_name='oas.device',
-                user=user,
-                level='WARNING',
-                event_type='AuthRequestSerializer',
-                message=f"사용자의 UserEmail 정보가 없습니다. 사용자 점검 및 수정이 필요 합니다.",
-                request_data=json.dumps(self.initial_data, ensure_ascii=False)
-            )
-            raise ValidationError({"detail": "사용자 이메일 인증 정보가 누락되었습니다."})
         # ✅ 체크. 이메일 인증 미사용자 처리
-        if user.email_info.email_auth is False :
+        if email_info.email_auth is False :
             raise ValidationError({"detail": "이메일 인증을 하지 않은 상태 입니다. 인증 후 다시 해주세요."})
 
 
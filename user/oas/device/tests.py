@@ -1,3 +1,89 @@
+from unittest import mock
+
+from django.core.cache import cache
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from account.models import UserInfo
+from account.utils.user_cache import UserAuthCache
+
+
+# ----------------------------------------------------------------------
+# 1. 환경 제어기 인증 (복호화 실패 잠금)
+# ----------------------------------------------------------------------
+class AuthAPIViewLockoutTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserInfo.objects.create_user(email='device@oasiss.co.kr', nick_name='device')
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = reverse('device-auth')
+
+    def post_invalid(self):
+        return self.client.post(self.url, {'data': 'not-encrypted'}, format='json')
+
+    def test_account_locks_on_fourth_failure(self):
+        for _ in range(3):
+            # 실패 기록(ProjectLogEntry) INSERT 1회만 발생, user_info 갱신 없음
+            with self.assertNumQueries(1):
+                self.assertEqual(self.post_invalid().status_code, 400)
+
+        response = self.post_invalid()
+
+        self.assertEqual(response.status_code, 401)
+        self.user.refresh_from_db()
+        self.assertFalse(self.user.is_active)
+        self.assertEqual(self.user.decryption_fail_count, 4)
+
+
+# ----------------------------------------------------------------------
+# 2. 환경 제어기 인증 (사용자 로더 쿼리 수)
+# ----------------------------------------------------------------------
+@mock.patch('oas.device.views.Bootup.check_request', return_value={'status': True, 'site_name': 'site'})
+@mock.patch('oas.device.views.decrypt_qr_data_cryptography')
+class AuthAPIViewQueryBudgetTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserInfo.objects.create_user(email='loader@oasiss.co.kr', nick_name='loader')
+
+    def setUp(self):
+        cache.clear()
+        UserAuthCache.clear_local()
+        self.url = reverse('device-auth')
+
+    def qr_data(self):
+        return {
+            'site': '0001', 'dong': '0101', 'ho': '0101', 'id': '01', 'deviceId': 'dev-1',
+            'time': timezone.now().strftime('%Y.%m.%d.%H.%M'),
+        }
+
+    def test_jwt_user_is_reused_by_serializer(self, decrypt, check_request):
+        decrypt.return_value = self.qr_data()
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+
+        # 인증 시 사용자(+email_info) 1회, AuthRequestSerializer 는 추가 조회 없음
+        with self.assertNumQueries(1):
+            response = client.post(self.url, {'data': 'encrypted'}, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('이메일 인증', str(response.data))
+
+    def test_force_authenticated_user_is_loaded_once(self, decrypt, check_request):
+        decrypt.return_value = self.qr_data()
+        client = APIClient()
+        client.force_authenticate(UserInfo.objects.get(pk=self.user.pk))
+
+        with self.assertNumQueries(1):
+            response = client.post(self.url, {'data': 'encrypted'}, format='json')
 
-# Create your tests here.
+        self.assertEqual(response.status_code, 400)
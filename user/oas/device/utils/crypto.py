@@ -9,6 +9,24 @@ from log_events.models import ProjectLogEntry # ⭐️ 통합 모델 임포트
 
 # --- C++ 코드와 정확히 동일한 KEY와 IV를 사용해야 합니다! ---
 # (C++ 코드의 예시: 32바이트 KEY, 16바이트 IV)
+KEY = b'keyoasa1b2c3d4e5f6g7h8i9j0k1l2m3'  # 32 bytes
+IV = b'ivoas1q2w3eqqqvs'    # 16 bytes
+
+
+def encrypt_qr_data_cryptography(json_object):
+    """
+    decrypt_qr_data_cryptography() 의 역함수입니다.
+    환경 제어기(C++)와 같은 방식으로 JSON 을 AES-256-CBC 암호화 후 Base64 로 인코딩합니다.
+    (테스트 / 벤치마크에서 QR 데이터를 만들 때 사용)
+    """
+    padder = padding.PKCS7(algorithms.AES.block_size).padder()
+    padded_bytes = padder.update(json.dumps(json_object).encode('utf-8')) + padder.finalize()
+
+    encryptor = Cipher(algorithms.AES(KEY), modes.CBC(IV), backend=default_backend()).encryptor()
+    encrypted_bytes = encryptor.update(padded_bytes) + encryptor.finalize()
+
+    return base64.b64encode(encrypted_bytes).decode('ascii')
+
 
 def decrypt_qr_data_cryptography(base64_data, user):
     """
@@ -16,9 +34,6 @@ def decrypt_qr_data_cryptography(base64_data, user):
     (cryptography 라이브러리 사용)
     """
 
-    KEY = b'keyoasa1b2c3d4e5f6g7h8i9j0k1l2m3'  # 32 bytes
-    IV = b'ivoas1q2w3eqqqvs'    # 16 bytes
-
     try:
         # 1. Base64 디코딩
         encrypted_bytes = base64.b64decode(base64_data)
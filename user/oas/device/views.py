@@ -12,6 +12,7 @@ from rest_framework.permissions import IsAuthenticated
 
 from .utils.crypto import decrypt_qr_data_cryptography
 from .utils.remote_manager import Bootup
+from account.utils.lockout import decryption_lockout
 
 # 시간 비교를 위한 import
 from datetime import datetime, timedelta
@@ -56,7 +57,7 @@ class OasInfoViewSet(viewsets.ModelViewSet):
 # ----------------------------------------------------------------------
 # 3. Auth API View (환경 제어기 인증 요청 처리)
 # ----------------------------------------------------------------------
-MAX_FAIL_ATTEMPTS = 4 # 최대 연속 실패 횟수
+# 최대 연속 실패 횟수는 settings.ACCOUNT_LOCKOUT['MAX_ATTEMPTS'] (account/utils/lockout.py)
 class AuthAPIView(APIView):
     """
     환경 제어기 인증 요청을 처리하는 API입니다.
@@ -78,40 +79,34 @@ class AuthAPIView(APIView):
         # 2. 복호화
         decrypted_json = decrypt_qr_data_cryptography(encrypted_data, request.user)
 
+        lockout = decryption_lockout()
+
         if decrypted_json is None:
 
             # --- ⭐️ 계정 잠금 로직 시작 ⭐️ ---
-            # 2.1. 실패 횟수 증가
-            user.decryption_fail_count += 1
-            user.last_fail_time = timezone.now()
+            # 2.1. 실패 횟수 증가 (공유 캐시 카운터, DB 쓰기 없음)
+            result = lockout.register_failure(user)
 
             # 2.2. 4회 이상 실패 시 계정 비활성화
-            if user.decryption_fail_count >= MAX_FAIL_ATTEMPTS:
-                user.is_active = False # is_active 필드를 False로 설정 (계정 잠금)
-                user.save(update_fields=['decryption_fail_count', 'last_fail_time', 'is_active'])
-
+            #      (잠금이 처음 걸리는 요청에서만 is_active=False 가 DB 에 기록됩니다.)
+            if result.locked:
                 # 계정 잠금 오류 응답
                 return Response(
                     {"detail": "데이터 위변조가 감지 되었습니다. 15분 뒤에 다시 로그인 해주세요."},
                     status=status.HTTP_401_UNAUTHORIZED
                 )
 
-            # 2.3. 모델 저장 및 실패 응답
-            user.save(update_fields=['decryption_fail_count', 'last_fail_time'])
-
+            # 2.3. 실패 응답
             return Response(
-                #{"detail": f"데이터가 유효하지 않습니다. (연속 실패 횟수: {user.decryption_fail_count}/{MAX_FAIL_ATTEMPTS})"},
+                #{"detail": f"데이터가 유효하지 않습니다. (연속 실패 횟수: {result.count}/{result.max_attempts})"},
                 {"detail": f"데이터가 유효하지 않습니다."},
                 status=status.HTTP_400_BAD_REQUEST
             )
             # --- ⭐️ 계정 잠금 로직 종료 ⭐️ ---
 
 
-        # 3. 복호화에 성공했다면, 연속 실패 카운트를 0으로 초기화
-        if user.decryption_fail_count > 0:
-            user.decryption_fail_count = 0
-            user.last_fail_time = None
-            user.save(update_fields=['decryption_fail_count', 'last_fail_time'])
+        # 3. 복호화에 성공했다면, 연속 실패 카운트를 초기화
+        lockout.reset(user)
 
         # 4. QRCODE 시간 유효성 검사 로직
         time_str = decrypted_json.get('time')
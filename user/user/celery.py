@@ -2,6 +2,7 @@
 
 import os
 from celery import Celery
+from celery.signals import worker_init
 
 # 1. Django 설정 모듈을 Celery에 알려줍니다.
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'user.settings')
@@ -18,7 +19,30 @@ app.config_from_object('django.conf:settings', namespace='CELERY')
 # (task를 정의한 앱 이름 리스트를 명시적으로 설정하지 않아도 됨)
 app.autodiscover_tasks()
 
-# 5. 디버깅을 위한 기본 태스크 정의 (선택 사항)
+# 5. 큐별 워커 설정 (settings.WORKER_QUEUE_PROFILES)
+# -Q 로 큐 하나만 받는 워커이면, 명령줄에서 바꾸지 않은 동시 실행 수 / prefetch 를 그 큐의 값으로 바꿉니다.
+# (worker_init 은 -Q 가 적용된 뒤, 프로세스 풀을 만들기 전에 호출됩니다.)
+@worker_init.connect
+def apply_queue_profile(sender=None, **kwargs):
+    from django.conf import settings
+
+    consume_from = sender.app.amqp.queues.consume_from or {}
+    if len(consume_from) != 1:
+        return
+    queue = next(iter(consume_from))
+    profile = getattr(settings, 'WORKER_QUEUE_PROFILES', {}).get(queue)
+    if not profile:
+        return
+
+    conf = sender.app.conf
+    if 'concurrency' in profile and sender.concurrency in (conf.worker_concurrency, os.cpu_count()):
+        sender.concurrency = profile['concurrency']
+    if 'prefetch_multiplier' in profile and sender.prefetch_multiplier == conf.worker_prefetch_multiplier:
+        sender.prefetch_multiplier = profile['prefetch_multiplier']
+    print(f"큐 '{queue}' 워커: concurrency={sender.concurrency}, prefetch_multiplier={sender.prefetch_multiplier}")
+
+
+# 6. 디버깅을 위한 기본 태스크 정의 (선택 사항)
 @app.task(bind=True)
 def debug_task(self):
     print(f'Request: {self.request!r}')
\ No newline at end of file
@@ -11,10 +11,12 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 import os
+import sys
 from dotenv import load_dotenv
 from pathlib import Path
 from datetime import timedelta # jwt token life time...
 import pymysql  # 추가
+from kombu import Queue
 
 # .env 파일을 사용하는 경우 이 줄을 추가합니다.
 load_dotenv()
@@ -71,6 +73,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # 엔드포인트별 쿼리 수 / DB 시간 / 전체 시간 계측 (전체 시간 측정을 위해 맨 앞에 둡니다.)
+    'log_events.middleware.EndpointMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -114,6 +118,83 @@ DATABASES = {
     }
 }
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# 워커 간 공유 캐시 (JWT 사용자 캐시 등). Celery 브로커와 다른 DB 번호를 사용합니다.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': 'redis://127.0.0.1:6379/1',
+    }
+}
+# 테스트 실행 시에는 로컬 메모리 캐시를 사용합니다.
+if 'test' in sys.argv:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# 이메일 인증 코드 / 재전송 횟수 / 잠금 저장소 (account/utils/verification_store.py)
+VERIFICATION_STORE = {
+    'BACKEND': 'cache',      # 'cache' (공유 캐시) 또는 'memory' (단일 프로세스 개발용)
+    'ALIAS': 'default',
+    'CODE_TTL': 5 * 60,      # 인증 코드 유효 시간 (초)
+    'LOCK_TTL': 5 * 60,      # 잠금 시간 (초)
+    'COUNTER_TTL': 60 * 60,  # 요청 / 실패 횟수 보관 시간 (초)
+    'MAX_ATTEMPTS': 3,       # 4회째 요청 / 실패에서 잠금
+}
+
+# JWT 인증 사용자 캐시 (account/utils/user_cache.py)
+USER_AUTH_CACHE = {
+    'ALIAS': 'default',
+    'SHARED_TTL': 300,     # 공유 캐시 보관 시간 (초)
+    'LOCAL_MAXSIZE': 1024, # 워커별 LRU 최대 개수
+    'LOCAL_TTL': 5,        # 워커별 LRU 보관 시간 (초)
+}
+
+# 토큰 재발급용 사용자별 클레임 스냅샷 캐시 (account/utils/claim_snapshot.py)
+CLAIM_SNAPSHOT_CACHE = {
+    'ALIAS': 'default',
+    'TTL': 300,            # 보관 시간 (초)
+}
+
+# Password hashing
+# https://docs.djangoproject.com/en/5.2/topics/auth/passwords/
+# 첫 번째 해셔로 새 비밀번호를 만들고, 나머지는 기존 해시 검증용입니다.
+PASSWORD_HASHERS = [
+    'account.hashers.ProfiledPBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+# PBKDF2 비용 프로필: 'low' | 'medium' | 'high' (account/hashers.py)
+# 변경 시 기존 사용자는 다음 로그인 성공 때 새 비용으로 재해싱됩니다.
+# 값 선택은 `python manage.py bench_password_hashers` 결과의 p99 를 참고하세요.
+PASSWORD_HASH_PROFILE = 'high'
+# 프로필 대신 반복 횟수를 직접 지정하려면 사용 (None 이면 프로필 사용)
+PASSWORD_HASH_ITERATIONS = None
+
+# 계정 잠금 (환경제어기 QR 복호화 연속 실패, account/utils/lockout.py)
+# 실패 카운터는 캐시에만 기록하고, 잠금이 걸릴 때만 user_info 를 갱신합니다.
+ACCOUNT_LOCKOUT = {
+    'ALIAS': 'default',
+    'MAX_ATTEMPTS': 4,   # 연속 실패 허용 횟수
+    'WINDOW': 15 * 60,   # 실패 카운터 유지 시간 (초)
+}
+
+# 비밀번호 해시 프로세스 풀 (비동기 로그인/회원가입, account/utils/hashing_pool.py)
+PASSWORD_HASHING_POOL = {
+    'MAX_WORKERS': 2,  # 해시 전용 프로세스 수
+    'MAX_QUEUE': 32,   # 대기 가능한 작업 수 (초과 시 503 응답)
+}
+# 사용자 일괄 생성 (account/utils/provisioning.py, manage.py provision_users)
+USER_PROVISIONING = {
+    'CHUNK_SIZE': 500,     # 트랜잭션 1개에 저장할 행 수
+    'HASH_WORKERS': None,  # 비밀번호 해시 프로세스 수 (None: CPU 수)
+}
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -156,7 +237,8 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # REST JWT
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        # JWTAuthentication + 사용자 캐시 (account/authentication.py)
+        'account.authentication.CachedJWTAuthentication',
     )
 }
 # JWT SETTINGS
@@ -171,6 +253,11 @@ SIMPLE_JWT = {
     # True일 때, 이전의 리프레시 토큰을 블랙리스트에 추가할지 여부를 설정합니다.
     'BLACKLIST_AFTER_ROTATION': False
 }
+# JWT 커스텀 클레임 프로필 (account/utils/claims.py 참고)
+# 'compact' : approval_status, approval_count, claims_version 만 토큰에 포함 (고정 크기)
+#             목록은 claims_version 이 바뀌었을 때 /api/v1/approvals/check-pending/delta/ 로 조회
+# 'full'    : approval_list 전체를 토큰에 포함 (이전 방식)
+JWT_CLAIMS_PROFILE = 'compact'
 
 # 사용자 인증
 AUTH_USER_MODEL = 'account.UserInfo'
@@ -179,8 +266,73 @@ AUTH_USER_MODEL = 'account.UserInfo'
 # Email Configuration (이메일 전송에 필요)
 # ==========================================================
 # 이메일 백엔드 설정 (SMTP 사용)
-EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+#EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
 #EMAIL_BACKEND = 'account.email_backend.CustomEmailBackend'
+# 워커 프로세스별로 SMTP 연결을 재사용 (account/email_backend.py, account/utils/smtp_pool.py)
+EMAIL_BACKEND = 'account.email_backend.PooledEmailBackend'
+EMAIL_CONNECTION_POOL = {
+    'MAX_SIZE': 2,            # 프로세스당 유휴 연결 수
+    'MAX_IDLE': 60,           # 유휴 연결 재사용 한도 (초)
+    'MAX_LIFETIME': 600,      # 연결 최대 사용 시간 (초)
+    'HEALTHCHECK_AFTER': 15,  # 이 시간 이상 쉬었으면 NOOP 확인 (초)
+}
+# 인증 메일 일괄 전송 (account/utils/email_dispatcher.py)
+EMAIL_BATCH = {
+    'ENABLED': True,
+    'ALIAS': 'default',
+    'WINDOW': 2,        # 모으는 시간 (초)
+    'MAX_SIZE': 50,     # 한 번에 보낼 최대 메일 수
+    'MAX_ATTEMPTS': 3,  # 수신자별 최대 시도 횟수
+    'ENGINE': 'smtp',   # 'async' 면 아래 ASYNC_SMTP 로 동시에 전송
+    'LOCK_TIMEOUT': 300,  # flush 잠금 (초). 워커가 죽으면 이 시간 뒤 다시 전송
+    'MISSING_GRACE': 30,  # 저장되지 않은 메일 번호를 건너뛰기까지 기다리는 시간 (초)
+}
+# asyncio SMTP 전송 엔진 (account/utils/async_smtp.py)
+ASYNC_SMTP = {
+    'CONCURRENCY': 10,               # 동시 SMTP 연결 수 (Gmail 은 계정당 동시 연결 수를 제한하므로 낮게 유지)
+    'TIMEOUT': 10,                   # 연결 / 응답 대기 (초)
+    'MESSAGES_PER_CONNECTION': 100,  # 연결당 최대 전송 수
+}
+# 인증 메일 트랜잭션 아웃박스 (account/utils/email_outbox.py)
+EMAIL_OUTBOX = {
+    'ALIAS': 'default',
+    'RELAY_BATCH': 500,         # relay 1회에 옮길 최대 행 수
+    'KICK_INTERVAL': 1,         # 커밋 후 relay 를 깨우는 최소 간격 (초)
+    'RETENTION': 24 * 60 * 60,  # 전달 완료 행 보관 시간 (초)
+}
+# 이메일 재시도 백오프 / SMTP 서킷 브레이커 (account/utils/circuit_breaker.py)
+EMAIL_CIRCUIT_BREAKER = {
+    'ALIAS': 'default',
+    'FAILURE_THRESHOLD': 5,   # 연속 SMTP 서버 장애 횟수 (도달 시 차단)
+    'FAILURE_WINDOW': 60,     # 연속 실패로 보는 시간 (초)
+    'OPEN_SECONDS': 60,       # 차단 유지 시간 (초), 이후 1건 시험 전송
+    'BACKOFF_BASE': 30,       # 재시도 간격 30초, 60초, 120초 ... (지터 포함)
+    'BACKOFF_MAX': 15 * 60,   # 재시도 간격 상한 (초)
+}
+# 발송 메일 토큰 버킷 (account/utils/rate_limiter.py)
+EMAIL_RATE_LIMIT = {
+    'ENABLED': True,
+    'ALIAS': 'default',
+    'GLOBAL_RATE': 2000 / (24 * 60 * 60),  # EMAIL_HOST_USER 계정 한도 (Google Workspace 일 2,000통)
+    'GLOBAL_BURST': 100,                   # 계정 최대 연속 발송 수
+    'RECIPIENT_RATE': 10 / (60 * 60),      # 수신자별 시간당 10통
+    'RECIPIENT_BURST': 6,                  # 수신자별 최대 연속 발송 수
+    'MAX_WAIT': 5,                         # 워커 안에서 기다릴 최대 시간 (초), 넘으면 대기열로 미룸
+}
+# 이메일 로그 일괄 저장 / 보관 기간 정리 (account/utils/email_log.py)
+EMAIL_LOG = {
+    'BUFFER_SIZE': 200,        # 모아서 한 번에 저장할 최대 행 수
+    'FLUSH_INTERVAL': 5,       # 첫 행 이후 저장까지 최대 대기 (초)
+    'IMMEDIATE_TYPES': ('FINAL_FAILURE',),  # 모으지 않고 바로 저장할 log_type
+    'RETENTION_DAYS': 30,      # 보관 기간 (일)
+    'PURGE_CHUNK_SIZE': 1000,  # 정리 시 한 번에 삭제할 행 수
+    'PURGE_PAUSE': 0.05,       # 청크 사이 쉬는 시간 (초)
+    'PURGE_MAX_CHUNKS': 100,   # 정리 작업 1회당 최대 청크 수 (남으면 이어서 실행)
+}
+# 메일 전송 요청 단일 진입점 / 요청 안 동기 SMTP 방지 (account/utils/email_delivery.py)
+EMAIL_DELIVERY = {
+    'SYNC_SMTP_IN_REQUEST': None,  # 'raise' / 'log' / None (None: DEBUG 면 raise, 아니면 log)
+}
 # 메일 호스트 (SMTP 서버 주소)
 # 예: Gmail의 경우 'smtp.gmail.com'
 EMAIL_HOST = 'smtp.gmail.com'
@@ -212,3 +364,51 @@ CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = 'Asia/Seoul' # 프로젝트의 시간대와 일치시킵니다.
+
+# 큐 구성: 인증 메일(email) / 정리 작업(maintenance) / 그 외(default)
+#   워커는 큐별로 따로 실행합니다. (동시 실행 수 / prefetch 는 아래 WORKER_QUEUE_PROFILES)
+#     celery -A user worker -Q email -n email@%h
+#     celery -A user worker -Q maintenance -n maintenance@%h
+#     celery -A user worker -Q default -n default@%h
+CELERY_TASK_DEFAULT_QUEUE = 'default'
+CELERY_TASK_QUEUES = (
+    Queue('default', routing_key='default'),
+    Queue('email', routing_key='email'),
+    Queue('maintenance', routing_key='maintenance'),
+)
+CELERY_TASK_ROUTES = {
+    'account.tasks.send_auth_email_task': {'queue': 'email'},
+    'account.tasks.flush_email_batch_task': {'queue': 'email'},
+    'account.tasks.requeue_email_task': {'queue': 'email'},
+    'account.tasks.relay_email_outbox_task': {'queue': 'email'},
+    'account.tasks.purge_email_logs_task': {'queue': 'maintenance'},
+}
+# 결과를 읽는 곳이 없는 작업은 작업마다 ignore_result=True 로 저장하지 않습니다. (account/tasks.py)
+# 나머지 작업의 결과도 하루(기본값) 대신 1시간 뒤 만료합니다.
+CELERY_RESULT_EXPIRES = 60 * 60
+# 짧은 작업: 끝난 뒤 ack 해서 워커가 죽으면 다른 워커가 다시 실행합니다. (메일은 최소 1회 전송)
+CELERY_TASK_ACKS_LATE = True
+CELERY_TASK_REJECT_ON_WORKER_LOST = True
+CELERY_WORKER_PREFETCH_MULTIPLIER = 4
+# acks_late 작업은 ack 전까지 visibility_timeout 이 지나면 다시 전달됩니다.
+# 재시도 countdown 상한(EMAIL_CIRCUIT_BREAKER['BACKOFF_MAX'] 15분)보다 길게 둡니다.
+CELERY_BROKER_TRANSPORT_OPTIONS = {'visibility_timeout': 60 * 60}
+# 큐별 워커 설정 (user/celery.py). -Q 로 큐 하나만 받는 워커에 -c / --prefetch-multiplier 를 주지 않으면 적용됩니다.
+WORKER_QUEUE_PROFILES = {
+    'email': {'concurrency': 8, 'prefetch_multiplier': 4},        # SMTP 대기 위주의 짧은 작업
+    'maintenance': {'concurrency': 1, 'prefetch_multiplier': 1},  # 긴 정리 작업, 한 번에 하나
+    'default': {'concurrency': 2, 'prefetch_multiplier': 4},
+}
+# 주기 작업 (celery -A user beat)
+CELERY_BEAT_SCHEDULE = {
+    # 커밋 직후 relay 예약이 생략되거나 실패한 아웃박스 행을 옮깁니다.
+    'relay-email-outbox': {
+        'task': 'account.tasks.relay_email_outbox_task',
+        'schedule': 2.0,
+    },
+    # 보관 기간이 지난 이메일 로그를 청크 단위로 삭제합니다.
+    'purge-email-logs': {
+        'task': 'account.tasks.purge_email_logs_task',
+        'schedule': 60 * 60.0,
+    },
+}
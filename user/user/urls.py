@@ -16,8 +16,8 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path, include
-from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
-from account.views import CustomTokenObtainPairView
+from rest_framework_simplejwt.views import TokenObtainPairView
+from account.views import CustomTokenObtainPairView, AsyncTokenObtainPairView, CachedTokenRefreshView
 
 urlpatterns = [
     # Django Admin Site URL
@@ -32,12 +32,17 @@ urlpatterns = [
     #path('api/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
     # 변경: 커스텀 뷰 사용
     path('api/token/', CustomTokenObtainPairView.as_view(), name='token_obtain_pair'),
+    # 비동기 로그인: 비밀번호 해시 비교를 프로세스 풀에서 처리 (풀 포화 시 503)
+    path('api/token/async/', AsyncTokenObtainPairView.as_view(), name='token_obtain_pair_async'),
     # Access 토큰을 갱신하는 엔드포인트
-    path('api/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    # 캐시된 클레임 스냅샷으로 email_auth / 승인 요청 등 최신 클레임을 담아 재발급
+    path('api/token/refresh/', CachedTokenRefreshView.as_view(), name='token_refresh'),
 
     # ⭐️ 새로 추가된 oas.auth.device 앱의 URL을 연결
     path('oas/v1/device/', include('oas.device.urls')),
     # Approval 앱의 URL을 /api/v1/approvals/ 경로로 연결
     path('api/v1/approvals/', include('approval.urls')),
+    # 엔드포인트별 쿼리 / 지연 시간 계측 결과 (관리자 전용)
+    path('api/v1/metrics/', include('log_events.urls')),
 
 ]